@@ -0,0 +1,47 @@
+-- Binary-quantized search over the document embeddings (requires pgvector >= 0.7.0).
+-- The HNSW index stores 1 bit per dimension (128 bytes per row instead of 2 KB for
+-- HALFVEC(1024)), candidates are found by Hamming distance on those codes and then
+-- re-ranked by exact cosine similarity against the stored embeddings.
+-- Enable by setting VECTOR_MATCH_FUNCTION=match_documents_binary.
+CREATE INDEX IF NOT EXISTS documents_embedding_bq_hnsw_idx
+    ON documents
+    USING hnsw ((binary_quantize(embedding)::BIT(1024)) bit_hamming_ops);
+
+CREATE OR REPLACE FUNCTION match_documents_binary (
+    query_embedding VECTOR(1024),
+    similarity_threshold FLOAT DEFAULT 0.5,
+    match_count INT DEFAULT 5,
+    filter JSONB DEFAULT NULL,
+    rerank_factor INT DEFAULT 8
+)
+RETURNS TABLE (
+    id BIGINT,
+    content TEXT,
+    metadata JSONB,
+    similarity FLOAT
+)
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    PERFORM set_config('hnsw.ef_search', GREATEST(40, match_count * rerank_factor)::TEXT, true);
+
+    RETURN QUERY
+    WITH candidates AS (
+        SELECT documents.id, documents.content, documents.metadata, documents.embedding
+        FROM documents
+        WHERE filter IS NULL OR documents.metadata @> filter
+        ORDER BY binary_quantize(documents.embedding)::BIT(1024)
+            <~> binary_quantize(query_embedding::HALFVEC(1024))::BIT(1024)
+        LIMIT match_count * rerank_factor
+    )
+    SELECT
+        candidates.id::BIGINT,
+        candidates.content,
+        candidates.metadata,
+        1 - (candidates.embedding <=> query_embedding::HALFVEC(1024)) AS similarity
+    FROM candidates
+    WHERE 1 - (candidates.embedding <=> query_embedding::HALFVEC(1024)) > similarity_threshold
+    ORDER BY candidates.embedding <=> query_embedding::HALFVEC(1024)
+    LIMIT match_count;
+END;
+$$;
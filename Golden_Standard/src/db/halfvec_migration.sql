@@ -0,0 +1,5 @@
+-- Store document embeddings as half-precision vectors (requires pgvector >= 0.7.0).
+-- Halves the size of the table and of any index built on the embedding column.
+ALTER TABLE documents
+    ALTER COLUMN embedding TYPE HALFVEC(1024)
+    USING embedding::HALFVEC(1024);
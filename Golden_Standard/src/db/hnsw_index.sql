@@ -0,0 +1,11 @@
+-- Approximate nearest-neighbour index on the document embeddings.
+-- match_documents orders by cosine distance so the planner can use this index
+-- instead of scanning every row on each query.
+-- The IVFFlat index from ivfflat_match.sql is dropped so the planner can't pick it for
+-- match_documents, which only tunes the HNSW scan.
+DROP INDEX IF EXISTS documents_embedding_ivfflat_idx;
+
+CREATE INDEX IF NOT EXISTS documents_embedding_hnsw_idx
+    ON documents
+    USING hnsw (embedding halfvec_cosine_ops)
+    WITH (m = 32, ef_construction = 200);
@@ -0,0 +1,48 @@
+-- Inverted-file search over the document embeddings.
+-- The IVFFlat index clusters the HALFVEC(1024) embeddings into `lists` cells at build
+-- time; a query only scans the `probes` cells whose centroids are closest to it.
+-- It builds much faster and uses less memory than HNSW, at some cost in recall.
+-- Build it after the table is loaded (centroids are taken from existing rows) and
+-- enable it by setting VECTOR_MATCH_FUNCTION=match_documents_ivfflat.
+-- The HNSW index on the same column is dropped: with both in place the planner may pick
+-- either for any query, and the one it picks isn't tuned by the other's setting
+-- (probes here, ef_search in match_documents). Run hnsw_index.sql to switch back.
+DROP INDEX IF EXISTS documents_embedding_hnsw_idx;
+
+CREATE INDEX IF NOT EXISTS documents_embedding_ivfflat_idx
+    ON documents
+    USING ivfflat (embedding halfvec_cosine_ops)
+    WITH (lists = 64);
+
+CREATE OR REPLACE FUNCTION match_documents_ivfflat (
+    query_embedding VECTOR(1024),
+    similarity_threshold FLOAT DEFAULT 0.5,
+    match_count INT DEFAULT 5,
+    filter JSONB DEFAULT NULL,
+    probes INT DEFAULT 8
+)
+RETURNS TABLE (
+    id BIGINT,
+    content TEXT,
+    metadata JSONB,
+    similarity FLOAT
+)
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    -- Number of inverted lists scanned, scoped to this call
+    PERFORM set_config('ivfflat.probes', probes::TEXT, true);
+
+    RETURN QUERY
+    SELECT
+        documents.id::BIGINT,
+        documents.content,
+        documents.metadata,
+        1 - (documents.embedding <=> query_embedding::HALFVEC(1024)) AS similarity
+    FROM documents
+    WHERE 1 - (documents.embedding <=> query_embedding::HALFVEC(1024)) > similarity_threshold
+    AND (filter IS NULL OR documents.metadata @> filter)
+    ORDER BY documents.embedding <=> query_embedding::HALFVEC(1024)
+    LIMIT match_count;
+END;
+$$;
@@ -1,13 +1,15 @@
 -- Drop the existing functions
 DROP FUNCTION IF EXISTS public.match_documents(query_embedding vector, similarity_threshold double precision, match_count integer);
 DROP FUNCTION IF EXISTS public.match_documents(query_embedding vector, similarity_threshold double precision, match_count integer, filter jsonb);
+DROP FUNCTION IF EXISTS public.match_documents(query_embedding vector, similarity_threshold double precision, match_count integer, filter jsonb, ef_search integer);
 
 -- Create a single function that handles both cases with a default parameter
 CREATE OR REPLACE FUNCTION match_documents (
-    query_embedding VECTOR(1536),
+    query_embedding VECTOR(1024),
     similarity_threshold FLOAT DEFAULT 0.5,
     match_count INT DEFAULT 5,
-    filter JSONB DEFAULT NULL
+    filter JSONB DEFAULT NULL,
+    ef_search INT DEFAULT 64
 )
 RETURNS TABLE (
     id BIGINT,
@@ -18,16 +20,20 @@ RETURNS TABLE (
 LANGUAGE plpgsql
 AS $$
 BEGIN
+    -- Candidate list size for the HNSW index scan, scoped to this call; larger values
+    -- trade latency for recall
+    PERFORM set_config('hnsw.ef_search', ef_search::TEXT, true);
+
     IF filter IS NULL THEN
         RETURN QUERY
         SELECT
             documents.id::BIGINT,
             documents.content,
             documents.metadata,
-            1 - (documents.embedding <=> query_embedding) AS similarity
+            1 - (documents.embedding <=> query_embedding::HALFVEC(1024)) AS similarity
         FROM documents
-        WHERE 1 - (documents.embedding <=> query_embedding) > similarity_threshold
-        ORDER BY similarity DESC
+        WHERE 1 - (documents.embedding <=> query_embedding::HALFVEC(1024)) > similarity_threshold
+        ORDER BY documents.embedding <=> query_embedding::HALFVEC(1024)
         LIMIT match_count;
     ELSE
         RETURN QUERY
@@ -35,11 +41,11 @@ BEGIN
             documents.id::BIGINT,
             documents.content,
             documents.metadata,
-            1 - (documents.embedding <=> query_embedding) AS similarity
+            1 - (documents.embedding <=> query_embedding::HALFVEC(1024)) AS similarity
         FROM documents
-        WHERE 1 - (documents.embedding <=> query_embedding) > similarity_threshold
+        WHERE 1 - (documents.embedding <=> query_embedding::HALFVEC(1024)) > similarity_threshold
         AND documents.metadata @> filter
-        ORDER BY similarity DESC
+        ORDER BY documents.embedding <=> query_embedding::HALFVEC(1024)
         LIMIT match_count;
     END IF;
 END;
@@ -5,6 +5,7 @@ from telegram import Update, CallbackQuery, InlineKeyboardButton, InlineKeyboard
 from telegram.constants import ParseMode
 from telegram.ext import ContextTypes
 from uni_ai_chatbot.bot.location_handlers import show_location_details, handle_location_with_ai
+from uni_ai_chatbot.data.campus_map_data import find_location_by_name_fragment
 from uni_ai_chatbot.services.handbook_service import handle_handbook_query
 
 logging.basicConfig(
@@ -20,64 +21,73 @@ async def handle_location_callback(update: Update, context: ContextTypes.DEFAULT
     query: CallbackQuery = update.callback_query
     await query.answer()
 
-    # Handle location callbacks
-    if query.data.startswith("location:"):
-        location_id: str = query.data.split(':')[1]
-        campus_map: List[Dict[str, Any]] = context.bot_data["campus_map"]
+    # Route on the callback data prefix with a single dictionary lookup; the handler is awaited
+    # so its replies are sent before the chat's next update is handled
+    handler = _CALLBACK_HANDLERS.get(query.data.split(':', 1)[0])
+    if handler:
+        await handler(update, context)
 
-        # Find the location by ID
-        location: Optional[Dict[str, Any]] = next((loc for loc in campus_map if str(loc['id']) == location_id), None)
 
-        if location:
-            await show_location_details(update, location, is_callback=True)
-        else:
-            await query.edit_message_text("Sorry, I couldn't find that location anymore.")
-
-    # Handle handbook callbacks
-    elif query.data.startswith("hb:"):
-        try:
-            # Extract the handbook index
-            hb_idx = int(query.data.split(':')[1])
-            handbooks = context.bot_data["handbooks"]
-            # Ensure the index is valid
-            if 0 <= hb_idx < len(handbooks):
-                handbook = handbooks[hb_idx]
-                if handbook and handbook.get('url'):
-                    await query.edit_message_text(f"Fetching the handbook for {handbook['major']}...")
-                    await update.effective_chat.send_document(
-                        document=handbook['url'],
-                        filename=handbook['file_name'],
-                        caption=f"Handbook for {handbook['major']}"
-                    )
-                else:
-                    await query.edit_message_text(f"Sorry, I couldn't find that handbook.")
+async def _handle_location_selection(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Show the location selected from a location keyboard"""
+    query: CallbackQuery = update.callback_query
+    location_id: str = query.data.split(':')[1]
+    location_index: Dict[str, Any] = context.bot_data["location_index"]
+
+    # Find the location by ID
+    location: Optional[Dict[str, Any]] = location_index["by_id"].get(location_id)
+
+    if location:
+        await show_location_details(update, location, is_callback=True)
+    else:
+        await query.edit_message_text("Sorry, I couldn't find that location anymore.")
+
+
+async def _handle_handbook_selection(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Send the handbook selected from the handbook keyboard"""
+    query: CallbackQuery = update.callback_query
+    try:
+        # Extract the handbook index
+        hb_idx = int(query.data.split(':')[1])
+        handbooks = context.bot_data["handbooks"]
+        # Ensure the index is valid
+        if 0 <= hb_idx < len(handbooks):
+            handbook = handbooks[hb_idx]
+            if handbook and handbook.get('url'):
+                await query.edit_message_text(f"Fetching the handbook for {handbook['major']}...")
+                await update.effective_chat.send_document(
+                    document=handbook['url'],
+                    filename=handbook['file_name'],
+                    caption=f"Handbook for {handbook['major']}"
+                )
             else:
-                await query.edit_message_text("Sorry, I couldn't find that handbook.")
-        except Exception as e:
-            logger.error(f"Error handling handbook callback: {e}")
-            await query.edit_message_text("Sorry, I encountered an error retrieving the handbook.")
-
-    # Handle handbook pagination
-    elif query.data == "hb_page:prev" or query.data == "hb_page:next":
-        # Change page number
-        if query.data == "hb_page:prev":
-            context.user_data['handbook_page'] = max(0, context.user_data.get('handbook_page', 0) - 1)
-        else:  # next
-            handbooks = context.bot_data.get("handbooks", [])
-            total_pages = (len(handbooks) + 10 - 1) // 10  # 10 is PAGE_SIZE
-            context.user_data['handbook_page'] = min(
-                total_pages - 1,
-                context.user_data.get('handbook_page', 0) + 1
-            )
+                await query.edit_message_text(f"Sorry, I couldn't find that handbook.")
+        else:
+            await query.edit_message_text("Sorry, I couldn't find that handbook.")
+    except Exception as e:
+        logger.error(f"Error handling handbook callback: {e}")
+        await query.edit_message_text("Sorry, I encountered an error retrieving the handbook.")
+
+
+async def _handle_handbook_page(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Move the handbook list to the previous or next page"""
+    query: CallbackQuery = update.callback_query
 
-        # Re-display the handbook menu
-        await handle_handbook_query(update, context)
+    # Change page number
+    if query.data == "hb_page:prev":
+        context.user_data['handbook_page'] = max(0, context.user_data.get('handbook_page', 0) - 1)
+    elif query.data == "hb_page:next":
+        handbooks = context.bot_data.get("handbooks", [])
+        total_pages = (len(handbooks) + 10 - 1) // 10  # 10 is PAGE_SIZE
+        context.user_data['handbook_page'] = min(
+            total_pages - 1,
+            context.user_data.get('handbook_page', 0) + 1
+        )
+    else:
+        return
 
-    # Handle onboarding callbacks
-    elif query.data.startswith("onboard:") or query.data.startswith("location_example:") or \
-            query.data.startswith("dining_example:") or query.data.startswith("locker_example:") or \
-            query.data.startswith("handbook_example:") or query.data.startswith("faq_example:"):
-        await handle_onboarding_callback(update, context)
+    # Re-display the handbook menu
+    await handle_handbook_query(update, context)
 
 
 async def handle_onboarding_callback(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -186,8 +196,7 @@ async def handle_onboarding_callback(update: Update, context: ContextTypes.DEFAU
             )
 
             # Get location coordinates from database if possible
-            campus_map = context.bot_data.get("campus_map", [])
-            ocean_lab = next((loc for loc in campus_map if "ocean" in loc["name"].lower()), None)
+            ocean_lab = find_location_by_name_fragment(context.bot_data["location_index"], "ocean")
 
             if ocean_lab:
                 await context.bot.send_venue(
@@ -688,3 +697,17 @@ async def handle_onboarding_callback(update: Update, context: ContextTypes.DEFAU
             reply_markup=reply_markup,
             parse_mode=ParseMode.MARKDOWN
         )
+
+
+# Callback data prefix (the part before the first ':') to handler
+_CALLBACK_HANDLERS = {
+    "location": _handle_location_selection,
+    "hb": _handle_handbook_selection,
+    "hb_page": _handle_handbook_page,
+    "onboard": handle_onboarding_callback,
+    "location_example": handle_onboarding_callback,
+    "dining_example": handle_onboarding_callback,
+    "locker_example": handle_onboarding_callback,
+    "handbook_example": handle_onboarding_callback,
+    "faq_example": handle_onboarding_callback,
+}
@@ -107,7 +107,9 @@ async def where_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> N
     cleaned_query: str = extract_location_name(query)
 
     campus_map: List[Dict[str, Any]] = context.bot_data["campus_map"]
-    location: Optional[Dict[str, Any]] = find_location_by_name_or_alias(campus_map, cleaned_query)
+    location: Optional[Dict[str, Any]] = find_location_by_name_or_alias(
+        campus_map, cleaned_query, context.bot_data.get("location_index")
+    )
 
     if location:
         await show_location_details(update, location)
@@ -139,7 +141,8 @@ async def find_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
     if not keywords:
         keywords = [query.lower()]
 
-    locations: List[Dict[str, Any]] = find_locations_by_feature(campus_map, keywords)
+    locations: List[Dict[str, Any]] = find_locations_by_feature(
+        campus_map, keywords, context.bot_data.get("location_index"))
 
     if locations:
         if len(locations) == 1:
@@ -295,39 +298,37 @@ async def change_provider_command(update: Update, context: ContextTypes.DEFAULT_
 
 async def list_providers_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Command to list all available providers and their status"""
-    from uni_ai_chatbot.services.ai_provider_service import dynamic_import_provider
+    from uni_ai_chatbot.services.ai_provider_service import get_provider_availability
     from uni_ai_chatbot.configurations.config import SUPPORTED_PROVIDERS, AI_PROVIDER
 
-    user_id = update.effective_user.id
-
     # Get current provider for this user
     current_provider = context.user_data.get('user_provider', {}).get('name', AI_PROVIDER)
     current_model = context.user_data.get('user_provider', {}).get('model',
                                                                    SUPPORTED_PROVIDERS[current_provider][
                                                                        'default_model'])
 
-    message = "🤖 *Available AI Providers*\n\n"
+    # Provider availability is checked once per process
+    provider_availability = get_provider_availability()
 
-    for provider_name, provider_info in SUPPORTED_PROVIDERS.items():
-        # Check if provider can be imported
-        try:
-            embeddings_class, llm_class = dynamic_import_provider(provider_name)
+    parts = ["🤖 *Available AI Providers*\n\n"]
 
-            if provider_name == current_provider:
-                message += f"✅ *{provider_name}* (current)\n"
-                message += f"   Model: {current_model}\n"
-            else:
-                message += f"• {provider_name}\n"
-                message += f"   Default model: {provider_info['default_model']}\n"
+    for provider_name, provider_info in SUPPORTED_PROVIDERS.items():
+        if not provider_availability[provider_name]:
+            parts.append(f"• {provider_name} (not installed)\n")
+            continue
 
-            # Add note about embeddings for Anthropic
-            if provider_name == "anthropic":
-                message += "   Note: Requires another provider for embeddings\n"
+        if provider_name == current_provider:
+            parts.append(f"✅ *{provider_name}* (current)\n")
+            parts.append(f"   Model: {current_model}\n")
+        else:
+            parts.append(f"• {provider_name}\n")
+            parts.append(f"   Default model: {provider_info['default_model']}\n")
 
-        except Exception:
-            message += f"• {provider_name} (not installed)\n"
+        # Add note about embeddings for Anthropic
+        if provider_name == "anthropic":
+            parts.append("   Note: Requires another provider for embeddings\n")
 
-    message += "\nTo change provider:\n/provider [name] [api_key] [optional_model]\n"
-    message += "\nExample:\n/provider openai sk-abc123 gpt-4"
+    parts.append("\nTo change provider:\n/provider [name] [api_key] [optional_model]\n")
+    parts.append("\nExample:\n/provider openai sk-abc123 gpt-4")
 
-    await update.message.reply_text(message, parse_mode="Markdown")
\ No newline at end of file
+    await update.message.reply_text("".join(parts), parse_mode="Markdown")
\ No newline at end of file
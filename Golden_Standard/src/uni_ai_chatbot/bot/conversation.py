@@ -1,11 +1,14 @@
+import asyncio
 from typing import Optional, Dict, Any, List
 from telegram import Update, Message, User, Chat
 from telegram.ext import ContextTypes
 import logging
-from uni_ai_chatbot.utils.utils import handle_error
+from uni_ai_chatbot.utils.utils import handle_error, expire_stale_conversations
 from uni_ai_chatbot.tools.tool_classifier import get_appropriate_tool
 from uni_ai_chatbot.tools.tools_architecture import Tool
 from uni_ai_chatbot.utils.content_filter import is_university_related
+from uni_ai_chatbot.data.campus_map_data import extract_location_name
+from uni_ai_chatbot.bot.location_handlers import show_location_details
 
 
 logger = logging.getLogger(__name__)
@@ -24,6 +27,9 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     user: User = update.effective_user
     chat: Chat = update.effective_chat
 
+    # Forget follow-up questions the user left unanswered
+    expire_stale_conversations(context.user_data)
+
     # Check if query is university-related
     is_relevant, rejection_reason = is_university_related(query)
     if not is_relevant:
@@ -34,10 +40,18 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
         )
         return
 
-    # Show thinking message for longer queries
+    # Messages that are just a campus place name are answered straight from the location index
+    location: Optional[Dict[str, Any]] = _match_exact_location(context, query)
+    if location:
+        logger.info(f"Exact location match for user {user.id}: {location['name']}")
+        await show_location_details(update, location)
+        return
+
+    # Show thinking message for longer queries, sent concurrently with classification
+    thinking_task: Optional[asyncio.Task] = None
     thinking_message: Optional[Message] = None
     if len(query.split()) > 3:
-        thinking_message = await update.message.reply_text("Thinking...")
+        thinking_task = asyncio.create_task(update.message.reply_text("Thinking..."))
 
     try:
         # Use tool classification to route the query to the right handler
@@ -46,9 +60,43 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
         logger.info(f"Selected tool: {tool.name}")
 
         # Handle with the selected tool
-        if thinking_message:
+        if thinking_task:
+            thinking_message = await thinking_task
             await thinking_message.delete()
         await tool.handle(update, context, query)
 
     except Exception as e:
-        await handle_error(update, error=e, thinking_message=thinking_message)
\ No newline at end of file
+        if thinking_task and not thinking_message:
+            thinking_message = await _collect_thinking_message(thinking_task)
+        await handle_error(update, error=e, thinking_message=thinking_message)
+
+
+def _match_exact_location(context: ContextTypes.DEFAULT_TYPE, query: str) -> Optional[Dict[str, Any]]:
+    """
+    Look up a message that names a campus location exactly, skipping classification and the LLM
+
+    Args:
+        context: Telegram context holding the location index and user state
+        query: The user's message text
+
+    Returns:
+        The matching location, or None if the message isn't an exact name or alias
+    """
+    location_index: Optional[Dict[str, Any]] = context.bot_data.get("location_index")
+    if not location_index:
+        return None
+
+    # A bare college name may be the answer to a pending locker or servery question
+    if any(key.endswith("_conversation") for key in context.user_data):
+        return None
+
+    name: str = extract_location_name(query)
+    return location_index["by_name"].get(name) or location_index["by_alias"].get(name)
+
+
+async def _collect_thinking_message(thinking_task: asyncio.Task) -> Optional[Message]:
+    """Wait for the thinking message so it can be cleaned up, ignoring send failures"""
+    try:
+        return await thinking_task
+    except Exception:
+        return None
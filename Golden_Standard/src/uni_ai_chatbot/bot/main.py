@@ -1,20 +1,26 @@
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 from telegram.ext import Application, CommandHandler, MessageHandler, filters, CallbackQueryHandler
 from telegram import BotCommand
 
-from uni_ai_chatbot.configurations.config import TELEGRAM_TOKEN, MISTRAL_API_KEY, BOT_COMMANDS
+from uni_ai_chatbot.configurations.config import TELEGRAM_TOKEN, MISTRAL_API_KEY, BOT_COMMANDS, UPDATE_CONCURRENCY, \
+    BOT_CONNECTION_POOL_SIZE, BOT_POOL_TIMEOUT
 from uni_ai_chatbot.bot.commands import start, help_command, where_command, find_command, handbook_command, \
     change_provider_command, list_providers_command
 from uni_ai_chatbot.bot.conversation import handle_message
 from uni_ai_chatbot.bot.callbacks import handle_location_callback
 from uni_ai_chatbot.data.servery_hours_loader import load_servery_hours
-from uni_ai_chatbot.services.qa_service_supabase import initialize_qa_chain
-from uni_ai_chatbot.data.campus_map_data import load_campus_map
+from uni_ai_chatbot.services.qa_service_supabase import initialize_qa_chain, get_classifier_llm
+from uni_ai_chatbot.data.campus_map_data import load_campus_map, build_location_index
 from uni_ai_chatbot.data.locker_hours_loader import load_locker_hours
+from uni_ai_chatbot.data.resources import load_faq_answers
 from uni_ai_chatbot.services.locker_service import parse_locker_hours
-from uni_ai_chatbot.services.servery_service import parse_servery_hours
+from uni_ai_chatbot.services.servery_service import parse_servery_hours, precompute_servery_responses
+from uni_ai_chatbot.services.faq_service import store_faq_answers
 from uni_ai_chatbot.tools.tools_architecture import tool_registry
+from uni_ai_chatbot.tools.tool_classifier import init_classifier
+from uni_ai_chatbot.utils.update_processor import PerChatUpdateProcessor
 
 logging.basicConfig(
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
@@ -41,23 +47,51 @@ async def set_bot_commands(application: Application) -> None:
     ])
 
 
-def main() -> None:
-    """Main function to initialize and run the bot"""
-    # Check and initialize database if needed
+def _initialize_database() -> None:
+    """Check and initialize the documents table if needed, logging rather than raising on failure"""
     try:
         from uni_ai_chatbot.scripts.init_setup import check_and_initialize_database
         check_and_initialize_database()
     except Exception as e:
         logger.warning(f"Database initialization check failed: {e}. Continuing anyway...")
 
-    """Main function to initialize and run the bot"""
-    application: Application = Application.builder().token(TELEGRAM_TOKEN).build()
 
-    # Initialize QA chain components with Supabase vector store
-    vector_store, llm, general_qa_chain, location_qa_chain, locker_qa_chain, faq_qa_chain, handbook_qa_chain = initialize_qa_chain()
+def main() -> None:
+    """Main function to initialize and run the bot"""
+    # Handle updates from different chats concurrently, since handlers mostly wait on the LLM and
+    # Supabase, while each chat's own updates are handled in order
+    application: Application = (
+        Application.builder()
+        .token(TELEGRAM_TOKEN)
+        .concurrent_updates(PerChatUpdateProcessor(UPDATE_CONCURRENCY))
+        .connection_pool_size(BOT_CONNECTION_POOL_SIZE)
+        .pool_timeout(BOT_POOL_TIMEOUT)
+        .build()
+    )
+
+    # Load the Supabase tables concurrently with each other and with the database check;
+    # only the QA chains read the documents table, so they wait for the check to finish
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        servery_hours_future = executor.submit(load_servery_hours)
+        campus_map_future = executor.submit(load_campus_map)
+        locker_hours_future = executor.submit(load_locker_hours)
+        faq_answers_future = executor.submit(load_faq_answers)
+
+        _initialize_database()
+        qa_chain_future = executor.submit(initialize_qa_chain)
+
+        # Initialize QA chain components with Supabase vector store
+        vector_store, llm, general_qa_chain, location_qa_chain, locker_qa_chain, faq_qa_chain, handbook_qa_chain = qa_chain_future.result()
 
     # Store LLM instance for tool classifier
     application.bot_data["llm"] = llm
+    # Query embeddings, for the QA tool's semantic answer cache
+    application.bot_data["embeddings"] = vector_store.embeddings
+    try:
+        init_classifier(get_classifier_llm())
+    except Exception as e:
+        logger.warning(f"Could not create the classifier LLM: {e}, classifying with the main LLM")
+        init_classifier(llm)
 
     # Store all QA components in bot_data
     application.bot_data["general_qa_chain"] = general_qa_chain
@@ -65,12 +99,20 @@ def main() -> None:
     application.bot_data["locker_qa_chain"] = locker_qa_chain
     application.bot_data["faq_qa_chain"] = faq_qa_chain
     application.bot_data["handbook_qa_chain"] = handbook_qa_chain  # Backward compatibility
-    application.bot_data["servery_hours"] = parse_servery_hours(load_servery_hours())
+    application.bot_data["servery_hours"] = parse_servery_hours(servery_hours_future.result())
+    application.bot_data["servery_responses"] = precompute_servery_responses(application.bot_data["servery_hours"])
     application.bot_data["qa_chain"] = general_qa_chain  # Backward compatibility
 
     # Load data from Supabase
-    application.bot_data["campus_map"] = load_campus_map()
-    application.bot_data["locker_hours"] = parse_locker_hours(load_locker_hours())
+    application.bot_data["campus_map"] = campus_map_future.result()
+    application.bot_data["location_index"] = build_location_index(application.bot_data["campus_map"])
+    application.bot_data["locker_hours"] = parse_locker_hours(locker_hours_future.result())
+
+    # FAQ answers are also loaded on first use if they can't be loaded now
+    try:
+        store_faq_answers(application.bot_data, faq_answers_future.result())
+    except Exception as e:
+        logger.warning(f"Could not load FAQ answers at startup: {e}")
 
     # Validate that all necessary tools are registered
     logger.info(f"Registered tools: {[tool.name for tool in tool_registry.get_all_tools()]}")
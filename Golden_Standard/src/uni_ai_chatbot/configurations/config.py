@@ -14,6 +14,16 @@ SUPABASE_SERVICE_ROLE_KEY = os.environ.get("SUPABASE_SERVICE_ROLE_KEY")
 
 # Feature flags
 ENABLE_LLM_CLASSIFICATION = True  # Set to False to use rule-based classification only
+CLASSIFICATION_CACHE_SIZE = 1024  # Recent LLM tool classifications kept in memory, keyed by normalized query
+CLASSIFICATION_BATCH_WINDOW = 0.015  # Seconds to wait for more queries before classifying them in one LLM call
+CLASSIFICATION_MAX_BATCH_SIZE = 16  # Maximum number of queries classified in a single LLM call
+WARMUP_LLM = os.environ.get("WARMUP_LLM", "false").lower() == "true"  # Send a ping to the LLM at startup
+
+# Update processing: number of updates handled at once, and the HTTP pool used for Bot API
+# requests (replies, venues, chat actions) sent by those handlers
+UPDATE_CONCURRENCY = 64
+BOT_CONNECTION_POOL_SIZE = 256
+BOT_POOL_TIMEOUT = 10  # Seconds to wait for a free connection before failing a Bot API request
 
 # Bot menu commands
 BOT_COMMANDS = [
@@ -30,9 +40,84 @@ BOT_COMMANDS = [
 LLM_MODEL = "mistral-large-latest"
 LLM_TEMPERATURE = 0
 LLM_MAX_RETRIES = 2
+LLM_MAX_CONCURRENCY = 8  # Maximum number of LLM requests in flight at once
+# Smaller model for picking the tool that handles a query, a six-way choice that doesn't need the large model
+CLASSIFIER_LLM_MODEL = os.environ.get("CLASSIFIER_LLM_MODEL", "mistral-small-latest")
+CLASSIFICATION_MAX_TOKENS = 8  # Tokens the classifier may generate per classified query
+
+# HTTP connection pool shared by the Mistral clients
+MISTRAL_ENDPOINT = "https://api.mistral.ai/v1"
+HTTP_TIMEOUT = 30
+HTTP_MAX_CONNECTIONS = 50
+HTTP_MAX_KEEPALIVE_CONNECTIONS = 20
+
+# Embeddings backend for both stored documents and queries: "mistral" (Mistral API) or
+# "infinity" (a self-hosted Infinity server with dynamic batching). The documents table holds
+# 1024-dim vectors, so the Infinity model must output 1024 dimensions, and switching backends
+# requires re-running preprocessing.
+EMBEDDING_BACKEND = os.environ.get("EMBEDDING_BACKEND", "mistral").lower()
+INFINITY_API_URL = os.environ.get("INFINITY_API_URL", "http://localhost:7997")
+INFINITY_EMBEDDING_MODEL = os.environ.get("INFINITY_EMBEDDING_MODEL", "BAAI/bge-large-en-v1.5")
+
+# On-disk cache of document embeddings, keyed by model and chunk content
+EMBEDDING_CACHE_DIR = os.environ.get("EMBEDDING_CACHE_DIR", ".cache/embeddings")
+
+# On-disk cache of split document chunks, keyed by a hash of the source documents
+SPLIT_CACHE_DIR = os.environ.get("SPLIT_CACHE_DIR", ".cache/splits")
+EMBEDDING_DOCUMENT_BATCH_SIZE = 64  # Chunks embedded per request when building the vector store
+EMBEDDING_DOCUMENT_CONCURRENCY = 4  # Embedding requests in flight at once when building the vector store
+
+# On-disk snapshot of in-memory retriever documents and embeddings, reused while the
+# tool's rows in Supabase are unchanged; set to an empty string to disable
+RETRIEVER_SNAPSHOT_DIR = os.environ.get("RETRIEVER_SNAPSHOT_DIR", ".cache/retriever")
+
+# Persistent cache of LLM responses keyed on the exact prompt; set to an empty string to disable
+LLM_CACHE_PATH = os.environ.get("LLM_CACHE_PATH", ".cache/llm_cache.db")
+
+# FAQ retrieval: FAQ_RETRIEVER_K answers go into the prompt, chosen by maximal marginal
+# relevance from the FAQ_RETRIEVER_FETCH_K most similar (1 = pure relevance, 0 = pure diversity)
+FAQ_RETRIEVER_K = 2
+FAQ_RETRIEVER_FETCH_K = 8
+FAQ_RETRIEVER_MMR_LAMBDA = 0.5
+
+# Cache of final QA answers keyed on the normalized question
+QA_CACHE_SIZE = 1024
+# Cache of QA answers found again by question embedding, for rephrased questions
+QA_SEMANTIC_CACHE_SIZE = 512
+# Minimum cosine similarity between two questions for one's answer to be reused for the other
+QA_SEMANTIC_CACHE_THRESHOLD = float(os.environ.get("QA_SEMANTIC_CACHE_THRESHOLD", "0.95"))
+
+# Feature keywords extracted from recent messages, keyed by exact text
+FEATURE_KEYWORD_CACHE_SIZE = 2048
+
+# Relevance checks of recent messages, keyed by exact text
+CONTENT_FILTER_CACHE_SIZE = 2048
+# Characters of a message the relevance check's open-ended patterns search; they take time
+# growing faster than linearly with the text, so they stop here while the rest of the check
+# still sees the whole message
+CONTENT_FILTER_MAX_QUERY_LENGTH = 1000
+
+# Query embedding micro-batching
+EMBEDDING_BATCH_WINDOW = 0.01  # Seconds to wait for more queries before sending a batch
+EMBEDDING_MAX_BATCH_SIZE = 16  # Maximum number of queries embedded in a single request
+QUERY_EMBEDDING_CACHE_SIZE = 2048  # Recent query embeddings kept in memory, keyed by exact text
+
+# Postgres function used for vector search; "match_documents_binary" searches
+# binary-quantized codes and re-ranks (see src/db/binary_quantize_match.sql),
+# "match_documents_ivfflat" probes an inverted-file index (see src/db/ivfflat_match.sql)
+VECTOR_MATCH_FUNCTION = os.environ.get("VECTOR_MATCH_FUNCTION", "match_documents")
+# Candidate list size for match_documents' HNSW index scan (hnsw.ef_search); higher values
+# trade latency for recall. 0 keeps the function's default of 64, which also works with
+# match_documents deployed before it took this argument (see src/db/match_documents_sql.sql)
+HNSW_EF_SEARCH = int(os.environ.get("HNSW_EF_SEARCH", "0"))
+
+# Seconds a pending follow-up question (e.g. "which college?") stays open before it is dropped
+CONVERSATION_TIMEOUT_SECONDS = 300
 
 # Search configuration
 MAX_LOCATIONS_TO_DISPLAY = 13  # Maximum number of locations to display in search results
+FUZZY_MATCH_MAX_DISTANCE = 2  # Maximum edit distance for typo-tolerant name lookups
+FAQ_MATCH_SCORE_CUTOFF = 90  # Minimum rapidfuzz token-sort score to answer an FAQ without the LLM
 
 # AI Provider configuration
 SUPPORTED_PROVIDERS = {
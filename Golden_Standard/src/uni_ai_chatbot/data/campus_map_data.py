@@ -1,14 +1,58 @@
 import re
-from typing import List, Dict, Any, Optional, Set
+from bisect import bisect_right
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Sequence, Set, Tuple
+from uni_ai_chatbot.configurations.config import FUZZY_MATCH_MAX_DISTANCE, FEATURE_KEYWORD_CACHE_SIZE
+from uni_ai_chatbot.utils.bk_tree import BKTree, build_bk_tree
 from uni_ai_chatbot.utils.database import get_supabase_client
 
+# Common feature-related words to look for
+FEATURE_PATTERNS: List[str] = [
+    r'\b(print(?:ing|er)?)\b',
+    r'\b(stud(?:y|ying))\b',
+    r'\b(food|eat(?:ing)?|dining|meal)\b',
+    r'\b(coffee)\b',
+    r'\b(ify)\b',  # ify-specific keyword
+    r'\b(quiet)\b'
+]
+
+# All feature patterns in one alternation, with one capture group per pattern
+FEATURE_PATTERN = re.compile("|".join(FEATURE_PATTERNS), re.IGNORECASE)
+
+# Common request terms and the tag they stand for
+FEATURE_TO_TAG_MAP: Dict[str, str] = {
+    "print": "printer",
+    "printing": "printer",
+    "eat": "food",
+    "food": "food",
+    "meal": "food",
+    "dining": "food",
+    "study": "study",
+    "studying": "study",
+    "quiet": "study",
+    "coffee": "coffee",
+    "cafeteria": "food",
+    "ify": "ify"  # For "ify" specific queries
+}
+
+# Question prefixes stripped from location queries, each optional and tried in this order
+LOCATION_QUERY_PREFIX_PATTERN = re.compile("^" + "".join(
+    rf"(?:(?:{prefix})\s*)?"
+    for prefix in [
+        r"where is", r"where's", r"where can i find",
+        r"how (?:do|can) i get to|how to reach",  # direction questions
+        r"find", r"where"
+    ]
+))
+
 
 def load_campus_map() -> List[Dict[str, Any]]:
     """
     Load campus map data from Supabase
 
     Returns:
-        List of dictionaries containing location information
+        List of dictionaries containing location information, with the tags and aliases
+        also split into 'tags_list', 'tag_set' (lowercase) and 'aliases_list'
 
     Raises:
         Exception: If there's an error fetching data
@@ -21,9 +65,113 @@ def load_campus_map() -> List[Dict[str, Any]]:
     if hasattr(response, 'error') and response.error:
         raise Exception(f"Error fetching campus map data: {response.error}")
 
+    # Split the comma-separated fields once here rather than on every request
+    for location in response.data:
+        location['tags_list'] = _split_comma_list(location.get('tags'))
+        location['tag_set'] = frozenset(tag.lower() for tag in location['tags_list'])
+        location['aliases_list'] = _split_comma_list(location.get('aliases'))
+
     return response.data
 
 
+def _split_comma_list(value: Optional[str]) -> List[str]:
+    """Split a comma-separated field into its stripped, non-empty entries"""
+    return [entry.strip() for entry in (value or '').split(',') if entry.strip()]
+
+
+def build_location_index(locations: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Build lookup structures over the campus map once so requests don't rescan it
+
+    Partial matching works on parallel arrays rather than the location dicts: the
+    lowercase names and alias strings are joined into single texts so a substring
+    search covers every location in one str.find call.
+
+    Args:
+        locations: List of location dictionaries
+
+    Returns:
+        Dictionary with locations keyed by id, lowercase name and lowercase alias,
+        the parallel arrays used for partial matching, all display names and aliases,
+        and a BK-tree over the lowercase names and aliases
+    """
+    by_id: Dict[str, Dict[str, Any]] = {}
+    by_name: Dict[str, Dict[str, Any]] = {}
+    by_alias: Dict[str, Dict[str, Any]] = {}
+    name_word_first: Dict[str, int] = {}
+    names_lower: List[str] = []
+    aliases_lower: List[str] = []
+    alias_names: List[str] = []
+    alias_owners: List[int] = []
+    all_names: List[str] = [location['name'] for location in locations]
+
+    for position, location in enumerate(locations):
+        name_lower: str = location['name'].lower()
+        by_id[str(location['id'])] = location
+        by_name.setdefault(name_lower, location)
+        names_lower.append(name_lower)
+        aliases_lower.append((location.get('aliases') or '').lower())
+        for word in name_lower.split():
+            name_word_first.setdefault(word, position)
+
+        if location.get('aliases'):
+            for alias in location['aliases'].split(','):
+                alias = alias.strip()
+                if alias:
+                    all_names.append(alias)
+                    alias_names.append(alias.lower())
+                    alias_owners.append(position)
+                    by_alias.setdefault(alias.lower(), location)
+
+    return {
+        "by_id": by_id,
+        "by_name": by_name,
+        "by_alias": by_alias,
+        "locations": tuple(locations),
+        # Position of the first location whose name contains each word
+        "name_word_first": name_word_first,
+        # Names and alias strings joined by newlines, which never occur in either,
+        # with the offset at which each location's entry starts
+        "names_text": "\n".join(names_lower),
+        "names_offsets": _entry_offsets(names_lower),
+        "aliases_text": "\n".join(aliases_lower),
+        "aliases_offsets": _entry_offsets(aliases_lower),
+        # Individual lowercase aliases and the position of the location each belongs to
+        "alias_names": tuple(alias_names),
+        "alias_owners": tuple(alias_owners),
+        "all_names": all_names,
+        "name_tree": build_bk_tree({**by_alias, **by_name}),
+        "by_tag": build_tag_index(locations),
+    }
+
+
+def build_tag_index(locations: List[Dict[str, Any]]) -> Dict[str, List[int]]:
+    """
+    Build an index from each lowercase tag to the locations that have it
+
+    Args:
+        locations: List of location dictionaries
+
+    Returns:
+        Positions in locations of the locations with each tag, in ascending order
+    """
+    by_tag: Dict[str, List[int]] = {}
+    for position, location in enumerate(locations):
+        for tag in location.get('tag_set', ()):
+            by_tag.setdefault(tag, []).append(position)
+    return by_tag
+
+
+def _entry_offsets(entries: List[str]) -> List[int]:
+    """Start offset of each entry in "\n".join(entries)"""
+    offsets: List[int] = []
+    offset: int = 0
+    for entry in entries:
+        offsets.append(offset)
+        offset += len(entry) + 1
+    return offsets
+
+
 def find_locations_by_tag(locations: List[Dict[str, Any]], tag: str) -> List[Dict[str, Any]]:
     """
     Find all locations that have a specific tag
@@ -35,15 +183,14 @@ def find_locations_by_tag(locations: List[Dict[str, Any]], tag: str) -> List[Dic
     Returns:
         List of locations that contain the specified tag
     """
-    results: List[Dict[str, Any]] = []
-    for loc in locations:
-        # Check if tags field exists and contains the tag
-        if loc.get('tags') and tag in [t.strip() for t in loc['tags'].split(',')]:
-            results.append(loc)
-    return results
+    return [loc for loc in locations if tag in loc['tags_list']]
 
 
-def find_location_by_name_or_alias(locations: List[Dict[str, Any]], query: str) -> Optional[Dict[str, Any]]:
+def find_location_by_name_or_alias(
+        locations: List[Dict[str, Any]],
+        query: str,
+        location_index: Optional[Dict[str, Any]] = None
+) -> Optional[Dict[str, Any]]:
     """
     Find a location by its name or alias (case-insensitive)
     Improved with more robust matching and better handling of partial matches
@@ -51,6 +198,7 @@ def find_location_by_name_or_alias(locations: List[Dict[str, Any]], query: str)
     Args:
         locations: List of location dictionaries
         query: The search term to look for
+        location_index: Optional index from build_location_index, built on the fly if omitted
 
     Returns:
         The matching location dictionary, or None if no match found
@@ -59,98 +207,144 @@ def find_location_by_name_or_alias(locations: List[Dict[str, Any]], query: str)
         return None
 
     query: str = query.lower().strip()
+    if location_index is None:
+        location_index = build_location_index(locations)
 
     # Strategy 1: Exact match on name
-    for location in locations:
-        if location['name'].lower() == query:
-            return location
+    if query in location_index["by_name"]:
+        return location_index["by_name"][query]
 
     # Strategy 2: Exact match on alias
-    for location in locations:
-        if location.get('aliases'):
-            aliases: List[str] = [alias.strip().lower() for alias in location['aliases'].split(',')]
-            if query in aliases:
-                return location
+    if query in location_index["by_alias"]:
+        return location_index["by_alias"][query]
+
+    indexed_locations: Tuple[Dict[str, Any], ...] = location_index["locations"]
+    query_words: List[str] = query.split()
 
     # Strategy 3: Partial match on name (whole word)
-    for location in locations:
-        loc_name_words: List[str] = location['name'].lower().split()
-        query_words: List[str] = query.split()
-        if any(word in loc_name_words for word in query_words):
-            return location
+    positions: List[int] = [location_index["name_word_first"][word]
+                            for word in query_words if word in location_index["name_word_first"]]
+    if positions:
+        return indexed_locations[min(positions)]
 
     # Strategy 4: Partial match anywhere
-    for location in locations:
-        if query in location['name'].lower():
-            return location
+    # Names never contain a newline, so a query with one can't match and can't span two names
+    if "\n" not in query:
+        found: int = location_index["names_text"].find(query)
+        if found != -1:
+            return indexed_locations[bisect_right(location_index["names_offsets"], found) - 1]
 
     # Strategy 5: Alias partial match
-    for location in locations:
-        if location.get('aliases'):
-            aliases: List[str] = [alias.strip().lower() for alias in location['aliases'].split(',')]
-            for alias in aliases:
-                if query in alias or alias in query:
-                    return location
+    for alias, owner in zip(location_index["alias_names"], location_index["alias_owners"]):
+        if query in alias or alias in query:
+            return indexed_locations[owner]
 
     # Strategy 6: Word-by-word matching for aliases
-    for location in locations:
-        if location.get('aliases'):
-            aliases: str = location['aliases'].lower()
-            query_words: List[str] = query.split()
-            if any(word in aliases for word in query_words if len(word) > 2):
-                return location
+    aliases_text: str = location_index["aliases_text"]
+    found_positions: List[int] = [position for position in
+                                  (aliases_text.find(word) for word in query_words if len(word) > 2)
+                                  if position != -1]
+    if found_positions:
+        return indexed_locations[bisect_right(location_index["aliases_offsets"], min(found_positions)) - 1]
+
+    # Strategy 7: Closest name or alias within a few typos
+    if len(query) > FUZZY_MATCH_MAX_DISTANCE * 2:
+        name_tree: BKTree = location_index["name_tree"]
+        closest = name_tree.closest(query, FUZZY_MATCH_MAX_DISTANCE)
+        if closest:
+            return closest[1]
+
+    return None
+
+
+def find_location_by_name_fragment(
+        location_index: Dict[str, Any],
+        fragment: str,
+        exclude: Sequence[Dict[str, Any]] = ()
+) -> Optional[Dict[str, Any]]:
+    """
+    Find the first location whose lowercase name contains a fragment
+
+    Args:
+        location_index: Index from build_location_index
+        fragment: Lowercase text to look for in the names
+        exclude: Locations to skip, e.g. ones already matched
+
+    Returns:
+        The first matching location dictionary not in exclude, or None if there is none
+    """
+    # Names never contain a newline, so a fragment with one can't match
+    if "\n" in fragment:
+        return None
+
+    names_text: str = location_index["names_text"]
+    offsets: List[int] = location_index["names_offsets"]
+    start: int = 0
+    while (found := names_text.find(fragment, start)) != -1:
+        position: int = bisect_right(offsets, found) - 1
+        location: Dict[str, Any] = location_index["locations"][position]
+        if location not in exclude:
+            return location
+        # Resume the search at the next name
+        if position + 1 == len(offsets):
+            return None
+        start = offsets[position + 1]
 
     return None
 
 
-def find_locations_by_feature(locations: List[Dict[str, Any]], feature_keywords: List[str]) -> List[Dict[str, Any]]:
+def fuzzy_match_location(location_index: Dict[str, Any], name: str) -> Optional[Dict[str, Any]]:
+    """
+    Find the location whose name or alias is within a few typos of a free-form name
+
+    Args:
+        location_index: Index from build_location_index
+        name: Location name, e.g. as written by the LLM
+
+    Returns:
+        The closest matching location dictionary, or None if the text doesn't look like
+        a name or no name or alias is close enough
+    """
+    name = name.strip().lower()
+    # A name is a single line, and at a few characters the allowed edits could turn
+    # any short word (e.g. "none") into an alias
+    if len(name) <= FUZZY_MATCH_MAX_DISTANCE * 2 or "\n" in name:
+        return None
+
+    name_tree: BKTree = location_index["name_tree"]
+    closest = name_tree.closest(name, FUZZY_MATCH_MAX_DISTANCE)
+    return closest[1] if closest else None
+
+
+def find_locations_by_feature(
+        locations: List[Dict[str, Any]],
+        feature_keywords: List[str],
+        location_index: Optional[Dict[str, Any]] = None
+) -> List[Dict[str, Any]]:
     """
     Find locations based on feature keywords that may match tags
 
     Args:
         locations: List of location dictionaries
         feature_keywords: List of keywords to match against tags
+        location_index: Optional index from build_location_index, whose tag index is
+            built on the fly if omitted
 
     Returns:
         List of locations that match any of the keywords
     """
-    feature_keywords: List[str] = [kw.lower() for kw in feature_keywords]
-    matches: List[Dict[str, Any]] = []
-
-    # Feature matching logic - map common request terms to tags
-    feature_to_tag_map: Dict[str, str] = {
-        "print": "printer",
-        "printing": "printer",
-        "eat": "food",
-        "food": "food",
-        "meal": "food",
-        "dining": "food",
-        "study": "study",
-        "studying": "study",
-        "quiet": "study",
-        "coffee": "coffee",
-        "cafeteria": "food",
-        "ify": "ify"  # For "ify" specific queries
-    }
+    # Convert feature keywords to relevant tags, keeping unmapped keywords as they are
+    search_tags: Set[str] = {FEATURE_TO_TAG_MAP.get(keyword, keyword)
+                             for keyword in (kw.lower() for kw in feature_keywords)}
 
-    # Convert feature keywords to relevant tags
-    search_tags: Set[str] = set()
-    for keyword in feature_keywords:
-        if keyword in feature_to_tag_map:
-            search_tags.add(feature_to_tag_map[keyword])
-        else:
-            search_tags.add(keyword)  # Keep original keyword as well
+    # Find locations with matching tags, in their original order
+    by_tag: Dict[str, List[int]] = (location_index["by_tag"] if location_index is not None
+                                    else build_tag_index(locations))
+    positions: Set[int] = set()
+    for tag in search_tags:
+        positions.update(by_tag.get(tag, ()))
 
-    # Find locations with matching tags
-    for location in locations:
-        if not location.get('tags'):
-            continue
-
-        location_tags: Set[str] = set([tag.strip().lower() for tag in location['tags'].split(',')])
-        if any(tag in location_tags for tag in search_tags):
-            matches.append(location)
-
-    return matches
+    return [locations[position] for position in sorted(positions)]
 
 
 def extract_feature_keywords(text: str) -> List[str]:
@@ -163,22 +357,20 @@ def extract_feature_keywords(text: str) -> List[str]:
     Returns:
         List of potential feature keywords
     """
-    # Common feature-related words to look for
-    feature_patterns: List[str] = [
-        r'\b(print(?:ing|er)?)\b',
-        r'\b(stud(?:y|ying))\b',
-        r'\b(food|eat(?:ing)?|dining|meal)\b',
-        r'\b(coffee)\b',
-        r'\b(ify)\b',  # ify-specific keyword
-        r'\b(quiet)\b'
-    ]
+    return list(_extract_feature_keywords_cached(text))
+
 
-    keywords: List[str] = []
-    for pattern in feature_patterns:
-        matches: List[str] = re.findall(pattern, text, re.IGNORECASE)
-        keywords.extend([m.lower() for m in matches if m])
+@lru_cache(maxsize=FEATURE_KEYWORD_CACHE_SIZE)
+def _extract_feature_keywords_cached(text: str) -> Tuple[str, ...]:
+    """Keywords of extract_feature_keywords as an immutable tuple, so repeated texts are scanned once"""
+    # Scan the text once, then list the keywords grouped by pattern as before
+    keywords_by_pattern: List[List[str]] = [[] for _ in FEATURE_PATTERNS]
+    for groups in FEATURE_PATTERN.findall(text):
+        for position, keyword in enumerate(groups):
+            if keyword:
+                keywords_by_pattern[position].append(keyword.lower())
 
-    return keywords
+    return tuple(keyword for keywords in keywords_by_pattern for keyword in keywords)
 
 
 def extract_location_name(query: str) -> str:
@@ -191,11 +383,11 @@ def extract_location_name(query: str) -> str:
     Returns:
         The cleaned location name
     """
-    # Remove common question words
+    # Remove common question words in a single anchored pass
     query = query.lower()
-    for prefix in ["where is", "where's", "where can i find", "how do i get to", "find", "where"]:
-        if query.startswith(prefix):
-            query = query[len(prefix):].strip()
+    prefix_end: int = LOCATION_QUERY_PREFIX_PATTERN.match(query).end()
+    if prefix_end:
+        query = query[prefix_end:].strip()
 
     # Remove question mark
     query = query.strip("?").strip()
@@ -8,6 +8,18 @@ from langchain_core.documents import Document
 
 logger = logging.getLogger(__name__)
 
+# Patterns for section headers
+SECTION_PATTERNS = [
+    # Match patterns like "1 Program Overview" or "1.1 Concept"
+    re.compile(r'\n(\d+(?:\.\d+)*)\s+([A-Z][A-Za-z\s\-]+)'),
+    # Match capitalized section headers
+    re.compile(r'\n([A-Z][A-Z\s]+(?:[A-Za-z\s\-]+))'),
+    # Match module headers
+    re.compile(r'\n(\d+\.\d+)\s+([A-Z][A-Za-z\s\&\-]+)')
+]
+PARAGRAPH_BREAK_PATTERN = re.compile(r'\n\s*\n')
+SENTENCE_BREAK_PATTERN = re.compile(r'(?<=[.!?])\s+')
+
 
 class CourseInfo:
     """Class to store structured course information"""
@@ -105,30 +117,21 @@ def extract_structured_content(pdf_reader) -> List[Dict[str, Any]]:
     sections = []
     current_section = {"title": "Overview", "level": 0, "content": "", "number": ""}
 
-    # Extract full text first
-    full_text = ""
+    # Extract full text first, joining pages once instead of growing a string per page
+    page_texts = []
     for page_num in range(len(pdf_reader.pages)):
         try:
             page_text = pdf_reader.pages[page_num].extract_text()
             if page_text:
-                full_text += page_text + "\n\n"
+                page_texts.append(page_text + "\n\n")
         except Exception as e:
             logger.warning(f"Error extracting text from page {page_num}: {e}")
-
-    # Define patterns for section headers
-    section_patterns = [
-        # Match patterns like "1 Program Overview" or "1.1 Concept"
-        r'\n(\d+(?:\.\d+)*)\s+([A-Z][A-Za-z\s\-]+)',
-        # Match capitalized section headers
-        r'\n([A-Z][A-Z\s]+(?:[A-Za-z\s\-]+))',
-        # Match module headers
-        r'\n(\d+\.\d+)\s+([A-Z][A-Za-z\s\&\-]+)'
-    ]
+    full_text = "".join(page_texts)
 
     # Find section boundaries
     all_matches = []
-    for pattern in section_patterns:
-        for match in re.finditer(pattern, full_text):
+    for pattern in SECTION_PATTERNS:
+        for match in pattern.finditer(full_text):
             # Determine if this is a section number + title or just title
             if len(match.groups()) == 2:
                 number, title = match.groups()
@@ -183,10 +186,17 @@ def create_contextual_chunks(text: str, section_title: str, max_size: int) -> Li
     section_header = f"SECTION: {section_title}\n\n"
 
     # Split text by paragraphs
-    paragraphs = re.split(r'\n\s*\n', text)
+    paragraphs = PARAGRAPH_BREAK_PATTERN.split(text)
 
+    # The chunk being built is kept as a list of parts plus its length, so growing it
+    # doesn't copy the whole chunk for every paragraph or sentence
     chunks = []
-    current_chunk = section_header
+    current_parts = []
+    current_length = len(section_header)
+
+    def flush() -> None:
+        if current_parts:
+            chunks.append((section_header + "".join(current_parts)).strip())
 
     for paragraph in paragraphs:
         paragraph = paragraph.strip()
@@ -194,31 +204,32 @@ def create_contextual_chunks(text: str, section_title: str, max_size: int) -> Li
             continue
 
         # Check if adding this paragraph would exceed max size
-        if len(current_chunk) + len(paragraph) + 2 <= max_size:
-            current_chunk += paragraph + "\n\n"
+        if current_length + len(paragraph) + 2 <= max_size:
+            current_parts.append(paragraph + "\n\n")
+            current_length += len(paragraph) + 2
         else:
             # Save current chunk and start a new one
-            if current_chunk != section_header:
-                chunks.append(current_chunk.strip())
+            flush()
 
             # If paragraph itself is too long, split it further
             if len(paragraph) > max_size - len(section_header):
                 # Split long paragraph by sentences
-                sentences = re.split(r'(?<=[.!?])\s+', paragraph)
-                current_chunk = section_header
+                current_parts = []
+                current_length = len(section_header)
 
-                for sentence in sentences:
-                    if len(current_chunk) + len(sentence) + 2 <= max_size:
-                        current_chunk += sentence + " "
+                for sentence in SENTENCE_BREAK_PATTERN.split(paragraph):
+                    if current_length + len(sentence) + 2 <= max_size:
+                        current_parts.append(sentence + " ")
+                        current_length += len(sentence) + 1
                     else:
-                        if current_chunk != section_header:
-                            chunks.append(current_chunk.strip())
-                        current_chunk = section_header + sentence + " "
+                        flush()
+                        current_parts = [sentence + " "]
+                        current_length = len(section_header) + len(sentence) + 1
             else:
-                current_chunk = section_header + paragraph + "\n\n"
+                current_parts = [paragraph + "\n\n"]
+                current_length = len(section_header) + len(paragraph) + 2
 
     # Add final chunk
-    if current_chunk != section_header:
-        chunks.append(current_chunk.strip())
+    flush()
 
-    return chunks
\ No newline at end of file
+    return chunks
@@ -1,3 +1,5 @@
+import sys
+
 from uni_ai_chatbot.utils.database import get_supabase_client
 
 
@@ -5,7 +7,9 @@ def load_faq_answers():
     """
     Load FAQ responses from Supabase.
     Returns a dictionary of questions and answers.
+    Questions are interned since they are kept for the bot's lifetime and
+    compared against classifier output on every FAQ query.
     """
     supabase = get_supabase_client()
     response = supabase.table("faq_responses").select("question, answer").execute()
-    return {item["question"]: item["answer"] for item in response.data}
+    return {sys.intern(item["question"]): item["answer"] for item in response.data}
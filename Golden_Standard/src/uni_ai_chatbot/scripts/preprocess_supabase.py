@@ -1,11 +1,25 @@
+import hashlib
 import logging
+import os
+import pickle
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+import orjson
 from langchain_core.documents import Document
 from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain_mistralai import MistralAIEmbeddings
-
-from uni_ai_chatbot.configurations.config import MISTRAL_API_KEY
+from langchain.embeddings import CacheBackedEmbeddings
+from langchain.storage import LocalFileStore
+
+from uni_ai_chatbot.configurations.config import (
+    MISTRAL_API_KEY,
+    EMBEDDING_CACHE_DIR,
+    SPLIT_CACHE_DIR,
+    EMBEDDING_DOCUMENT_BATCH_SIZE,
+    EMBEDDING_DOCUMENT_CONCURRENCY
+)
 from uni_ai_chatbot.utils.database import get_supabase_client
 from uni_ai_chatbot.utils.custom_supabase import FixedSupabaseVectorStore
+from uni_ai_chatbot.services.ai_provider_service import get_document_embeddings_model
 from uni_ai_chatbot.data.resources import load_faq_answers
 from uni_ai_chatbot.data.campus_map_data import load_campus_map
 from uni_ai_chatbot.data.locker_hours_loader import load_locker_hours
@@ -22,6 +36,16 @@ if not MISTRAL_API_KEY:
     raise ValueError("MISTRAL_API_KEY is not set in environment variables")
 
 
+def get_cached_embeddings():
+    """Document embeddings backed by an on-disk cache so unchanged chunks are not re-embedded on every run"""
+    underlying_embeddings = get_document_embeddings_model()
+    return CacheBackedEmbeddings.from_bytes_store(
+        underlying_embeddings,
+        LocalFileStore(EMBEDDING_CACHE_DIR),
+        namespace=underlying_embeddings.model
+    )
+
+
 def create_documents():
     """Create documents from FAQ, campus data, locker data, and handbooks with tool classifications"""
     documents = []
@@ -135,13 +159,13 @@ def process_and_save_to_supabase():
     text_splitter = RecursiveCharacterTextSplitter(
         chunk_size=500,
         chunk_overlap=50,
-        separators=["\n\n", "\n", ".", " ", ""]
+        separators=["\n\n", "\n", ". ", " ", ""]  # Sentence breaks, not every period (e.g. "3.5 ECTS")
     )
-    split_docs = text_splitter.split_documents(documents)
+    split_docs = split_documents_cached(documents, text_splitter)
     logger.info(f"Created {len(split_docs)} document chunks")
 
     logger.info("Creating embeddings...")
-    embeddings = MistralAIEmbeddings(api_key=MISTRAL_API_KEY)
+    embeddings = get_cached_embeddings()
 
     logger.info("Creating Supabase client...")
     supabase_client = get_supabase_client()
@@ -167,41 +191,130 @@ def process_and_save_to_supabase():
             return
 
     # Process in smaller batches to avoid API limitations
-    batch_size = 100  # Process 100 documents at a time
-    total_docs = len(split_docs)
+    store_documents_in_batches(split_docs, embeddings, supabase_client, batch_size=EMBEDDING_DOCUMENT_BATCH_SIZE)
+
+    logger.info("Embeddings stored successfully in Supabase")
+    return None  # Don't return the vector store since we're creating it in batches
 
-    logger.info(f"Adding {total_docs} documents to vector store in batches of {batch_size}...")
 
-    for i in range(0, total_docs, batch_size):
-        batch_end = min(i + batch_size, total_docs)
-        current_batch = split_docs[i:batch_end]
+def split_documents_cached(documents, text_splitter):
+    """
+    Split documents into chunks, reusing the chunks from a previous run when neither
+    the documents nor the splitter settings have changed. Documents that already fit in
+    one chunk are passed through without running the splitter.
 
+    Args:
+        documents: Documents to split
+        text_splitter: RecursiveCharacterTextSplitter to split them with
+
+    Returns:
+        List of document chunks
+    """
+    digest = hashlib.sha256()
+    digest.update(orjson.dumps([text_splitter._chunk_size, text_splitter._chunk_overlap, text_splitter._separators]))
+    for doc in documents:
+        digest.update(orjson.dumps([doc.page_content, doc.metadata], option=orjson.OPT_SORT_KEYS))
+    cache_path = os.path.join(SPLIT_CACHE_DIR, f"splits_{digest.hexdigest()}.pkl")
+
+    if os.path.exists(cache_path):
         try:
-            logger.info(
-                f"Processing batch {i // batch_size + 1}/{(total_docs + batch_size - 1) // batch_size}: documents {i} to {batch_end - 1}")
+            with open(cache_path, "rb") as f:
+                split_docs = pickle.load(f)
+            logger.info(f"Loaded document chunks from {cache_path}")
+            return split_docs
+        except Exception as e:
+            logger.warning(f"Could not read split cache {cache_path}: {e}")
+
+    # FAQ entries, locations and handbook chunks mostly fit in one chunk already, so only
+    # the longer documents go through the splitter; the rest are kept as they are, in order
+    split_docs = []
+    for doc in documents:
+        if len(doc.page_content) <= text_splitter._chunk_size:
+            split_docs.append(doc)
+        else:
+            split_docs.extend(text_splitter.split_documents([doc]))
 
-            # Create embeddings for this batch
-            batch_texts = [doc.page_content for doc in current_batch]
-            batch_metadatas = [doc.metadata for doc in current_batch]
+    try:
+        os.makedirs(SPLIT_CACHE_DIR, exist_ok=True)
+        with open(cache_path, "wb") as f:
+            pickle.dump(split_docs, f)
+    except Exception as e:
+        logger.warning(f"Could not write split cache {cache_path}: {e}")
+
+    return split_docs
+
+
+def embed_batch(documents, embeddings):
+    """
+    Embed a batch of documents in one request, sending repeated chunk texts only once
+
+    Args:
+        documents: Documents in the batch
+        embeddings: Embeddings model used for the document texts
+
+    Returns:
+        One vector per document, in order
+    """
+    batch_texts = [doc.page_content for doc in documents]
+    unique_texts = list(dict.fromkeys(batch_texts))
+    vectors_by_text = dict(zip(unique_texts, embeddings.embed_documents(unique_texts)))
+    return [vectors_by_text[text] for text in batch_texts]
+
+
+def store_documents_in_batches(documents, embeddings, supabase_client, batch_size,
+                               concurrency=EMBEDDING_DOCUMENT_CONCURRENCY):
+    """
+    Embed documents with one embed_documents call per batch and write them through a single vector store.
+    Up to `concurrency` batches are embedded at once while finished batches are inserted in order.
+
+    Args:
+        documents: Documents to embed and store
+        embeddings: Embeddings model used for the document texts
+        supabase_client: Supabase client for the documents table
+        batch_size: Number of documents embedded and inserted per request
+        concurrency: Number of embedding requests in flight at once
+
+    Raises:
+        Exception: If any batch could not be stored, after all batches have been tried
+    """
+    vector_store = FixedSupabaseVectorStore(
+        client=supabase_client,
+        embedding=embeddings,
+        table_name="documents",
+        query_name="match_documents"
+    )
 
-            # Add these documents to the vector store
-            FixedSupabaseVectorStore.from_texts(
-                texts=batch_texts,
-                embedding=embeddings,
-                metadatas=batch_metadatas,
-                client=supabase_client,
-                table_name="documents",
-                query_name="match_documents"
-            )
+    total_docs = len(documents)
+    total_batches = (total_docs + batch_size - 1) // batch_size
+    logger.info(f"Adding {total_docs} documents to vector store in batches of {batch_size}...")
 
-            logger.info(f"Successfully added batch {i // batch_size + 1}")
+    batches = [documents[i:i + batch_size] for i in range(0, total_docs, batch_size)]
+    failed_batches = []
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        # Submitted up front; the executor keeps at most `concurrency` requests running
+        futures = [executor.submit(embed_batch, batch, embeddings) for batch in batches]
 
-        except Exception as e:
-            logger.error(f"Error processing batch {i // batch_size + 1}: {e}")
-            # Continue with the next batch instead of failing everything
+        for batch_number, (current_batch, future) in enumerate(zip(batches, futures), start=1):
+            start = (batch_number - 1) * batch_size
+            try:
+                logger.info(
+                    f"Processing batch {batch_number}/{total_batches}: "
+                    f"documents {start} to {start + len(current_batch) - 1}")
 
-    logger.info("Embeddings stored successfully in Supabase")
-    return None  # Don't return the vector store since we're creating it in batches
+                # Add these documents to the vector store once their embeddings are ready, with new
+                # row ids as the table's UUID primary key expects
+                ids = [str(uuid.uuid4()) for _ in current_batch]
+                vector_store.add_vectors(future.result(), current_batch, ids)
+
+                logger.info(f"Successfully added batch {batch_number}")
+
+            except Exception as e:
+                logger.error(f"Error processing batch {batch_number}: {e}")
+                # Continue with the next batch, and report the failures once all have been tried
+                failed_batches.append(batch_number)
+
+    if failed_batches:
+        raise Exception(f"Failed to store {len(failed_batches)} of {total_batches} batches: {failed_batches}")
 
 
 def delete_all_documents(supabase_client):
@@ -231,7 +344,7 @@ def update_handbook_embeddings():
     """Updates only the handbook documents in the vector store with improved structure preservation"""
     try:
         logger.info("Creating embeddings...")
-        embeddings = MistralAIEmbeddings(api_key=MISTRAL_API_KEY)
+        embeddings = get_cached_embeddings()
 
         logger.info("Creating Supabase client...")
         supabase_client = get_supabase_client()
@@ -265,38 +378,7 @@ def update_handbook_embeddings():
         logger.info(f"Generated {len(handbook_documents)} handbook document chunks")
 
         # Process in batches to avoid API limitations
-        batch_size = 50  # Process 50 documents at a time
-        total_docs = len(handbook_documents)
-
-        logger.info(f"Adding {total_docs} handbook documents to vector store in batches of {batch_size}...")
-
-        for i in range(0, total_docs, batch_size):
-            batch_end = min(i + batch_size, total_docs)
-            current_batch = handbook_documents[i:batch_end]
-
-            try:
-                logger.info(
-                    f"Processing batch {i // batch_size + 1}/{(total_docs + batch_size - 1) // batch_size}: documents {i} to {batch_end - 1}")
-
-                # Create embeddings for this batch
-                batch_texts = [doc.page_content for doc in current_batch]
-                batch_metadatas = [doc.metadata for doc in current_batch]
-
-                # Add these documents to the vector store
-                FixedSupabaseVectorStore.from_texts(
-                    texts=batch_texts,
-                    embedding=embeddings,
-                    metadatas=batch_metadatas,
-                    client=supabase_client,
-                    table_name="documents",
-                    query_name="match_documents"
-                )
-
-                logger.info(f"Successfully added batch {i // batch_size + 1}")
-
-            except Exception as e:
-                logger.error(f"Error processing batch {i // batch_size + 1}: {e}")
-                # Continue with the next batch instead of failing everything
+        store_documents_in_batches(handbook_documents, embeddings, supabase_client, batch_size=EMBEDDING_DOCUMENT_BATCH_SIZE)
 
         logger.info("Handbook embeddings updated successfully in Supabase")
         return True
@@ -323,7 +405,8 @@ if __name__ == "__main__":
         if args.handbooks_only:
             # Only update handbook embeddings
             print("Updating only handbook embeddings...")
-            update_handbook_embeddings()
+            if update_handbook_embeddings() is False:
+                raise Exception("Failed to update handbook embeddings")
         else:
             # Process and save all documents
             vector_store = process_and_save_to_supabase()
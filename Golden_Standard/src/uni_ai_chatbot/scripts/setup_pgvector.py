@@ -41,8 +41,12 @@ def setup_pgvector():
             id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
             content TEXT NOT NULL,
             metadata JSONB,
-            embedding VECTOR(1024)
+            embedding HALFVEC(1024)
         );
+        CREATE INDEX IF NOT EXISTS documents_embedding_hnsw_idx
+            ON documents
+            USING hnsw (embedding halfvec_cosine_ops)
+            WITH (m = 32, ef_construction = 200);
         """
 
         # Execute the SQL query by running an RPC function that executes SQL
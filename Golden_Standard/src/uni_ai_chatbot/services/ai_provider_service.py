@@ -1,15 +1,23 @@
 import logging
 import importlib
-from typing import Optional, Tuple, Any
+from functools import lru_cache
+from typing import Optional, Tuple, Any, Dict
 from langchain_mistralai import MistralAIEmbeddings
 
-from uni_ai_chatbot.configurations.config import SUPPORTED_PROVIDERS, DEFAULT_PROVIDER, MISTRAL_API_KEY
+from uni_ai_chatbot.configurations.config import SUPPORTED_PROVIDERS, DEFAULT_PROVIDER, MISTRAL_API_KEY, \
+    EMBEDDING_BACKEND, INFINITY_API_URL, INFINITY_EMBEDDING_MODEL
+from uni_ai_chatbot.utils.http_client import get_mistral_http_client, get_mistral_async_http_client
 
 logger = logging.getLogger(__name__)
 
+# Successfully imported (embeddings class, LLM class) pairs; failed imports are retried
+_PROVIDER_CLASSES: Dict[str, Tuple[Any, Any]] = {}
+
 
 def dynamic_import_provider(provider_name):
     """Dynamically import provider modules when needed"""
+    if provider_name in _PROVIDER_CLASSES:
+        return _PROVIDER_CLASSES[provider_name]
     if provider_name not in SUPPORTED_PROVIDERS:
         logger.warning(f"Provider {provider_name} not supported")
         return None, None
@@ -23,12 +31,48 @@ def dynamic_import_provider(provider_name):
             embeddings_class = getattr(module, provider_info["embeddings"])
         # Get LLM class
         llm_class = getattr(module, provider_info["llm"])
+        _PROVIDER_CLASSES[provider_name] = (embeddings_class, llm_class)
         return embeddings_class, llm_class
     except (ImportError, AttributeError) as e:
         logger.error(f"Error importing {provider_name} provider: {e}")
         return None, None
 
 
+@lru_cache(maxsize=1)
+def get_provider_availability() -> Dict[str, bool]:
+    """
+    Check once which supported providers can be imported
+
+    Returns:
+        Dictionary mapping each supported provider name to whether its LLM class is importable
+    """
+    return {
+        provider_name: dynamic_import_provider(provider_name)[1] is not None
+        for provider_name in SUPPORTED_PROVIDERS
+    }
+
+
+def get_document_embeddings_model():
+    """
+    Get the embeddings model the documents table was built with, used both when
+    storing documents and when embedding queries against them
+
+    Returns:
+        Infinity embeddings when EMBEDDING_BACKEND is "infinity", otherwise Mistral
+        embeddings on the shared keep-alive connection pool
+    """
+    if EMBEDDING_BACKEND == "infinity":
+        from langchain_community.embeddings import InfinityEmbeddings
+        logger.info(f"Using Infinity embeddings ({INFINITY_EMBEDDING_MODEL}) at {INFINITY_API_URL}")
+        return InfinityEmbeddings(model=INFINITY_EMBEDDING_MODEL, infinity_api_url=INFINITY_API_URL)
+
+    return MistralAIEmbeddings(
+        api_key=MISTRAL_API_KEY,
+        client=get_mistral_http_client(),
+        async_client=get_mistral_async_http_client()
+    )
+
+
 def get_embeddings_model(provider=None, api_key=None):
     """Get the appropriate embeddings model based on the provider"""
     # Use system default if no provider specified
@@ -39,7 +83,11 @@ def get_embeddings_model(provider=None, api_key=None):
     if provider == "anthropic":
         # Fall back to Mistral embeddings if available
         if MISTRAL_API_KEY:
-            return MistralAIEmbeddings(api_key=MISTRAL_API_KEY)
+            return MistralAIEmbeddings(
+                api_key=MISTRAL_API_KEY,
+                client=get_mistral_http_client(),
+                async_client=get_mistral_async_http_client()
+            )
         # Or try OpenAI
         try:
             EmbeddingsClass, _ = dynamic_import_provider("openai")
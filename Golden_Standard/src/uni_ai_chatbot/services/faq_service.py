@@ -2,10 +2,30 @@ import logging
 from typing import Dict, List, Any
 from telegram import Update
 from telegram.ext import ContextTypes
+from rapidfuzz import fuzz, process
+
+from uni_ai_chatbot.configurations.config import FUZZY_MATCH_MAX_DISTANCE, FAQ_MATCH_SCORE_CUTOFF
+from uni_ai_chatbot.utils.bk_tree import build_bk_tree
+from uni_ai_chatbot.utils.concurrency import ainvoke_limited
 
 logger = logging.getLogger(__name__)
 
 
+def store_faq_answers(bot_data: Dict[str, Any], faq_answers: Dict[str, str]) -> None:
+    """
+    Store the FAQ answers in bot_data with the lookup structures built from their questions
+
+    Args:
+        bot_data: The application's bot_data
+        faq_answers: FAQ answers keyed by question
+    """
+    bot_data['faq_answers'] = faq_answers
+    bot_data['faq_questions'] = tuple(faq_answers)
+    bot_data['faq_questions_lower'] = tuple(question.lower() for question in bot_data['faq_questions'])
+    bot_data['faq_questions_text'] = ', '.join(bot_data['faq_questions'])
+    bot_data['faq_question_tree'] = build_bk_tree(dict(zip(bot_data['faq_questions_lower'], bot_data['faq_questions'])))
+
+
 async def handle_faq_query(update: Update, context: ContextTypes.DEFAULT_TYPE, query: str) -> None:
     """
     Handle FAQ queries using AI-driven matching instead of hard-coded rules.
@@ -27,15 +47,31 @@ async def handle_faq_query(update: Update, context: ContextTypes.DEFAULT_TYPE, q
         # First try using the LLM to classify the query
         llm = context.bot_data.get("llm")
         if llm:
-            # Get all FAQ questions for better matching
-            from uni_ai_chatbot.data.resources import load_faq_answers
-            faq_answers: Dict[str, str] = load_faq_answers()
+            # Get all FAQ questions for better matching; they are loaded at startup, or here
+            # on first use if that failed
+            if 'faq_answers' not in context.bot_data:
+                from uni_ai_chatbot.data.resources import load_faq_answers
+                store_faq_answers(context.bot_data, load_faq_answers())
+            faq_answers: Dict[str, str] = context.bot_data['faq_answers']
+
+            # Questions that are (nearly) word for word an FAQ are answered without asking the LLM
+            # (keys are lowercased once at load time, and the hit's index maps back to the original key)
+            direct_match = process.extractOne(
+                query.lower(),
+                context.bot_data['faq_questions_lower'],
+                scorer=fuzz.token_sort_ratio,
+                score_cutoff=FAQ_MATCH_SCORE_CUTOFF
+            )
+            if direct_match:
+                matched_question: str = context.bot_data['faq_questions'][direct_match[2]]
+                await update.message.reply_text(faq_answers[matched_question], parse_mode="Markdown")
+                return
 
             # Create a classification prompt
-            faq_questions: List[str] = list(faq_answers.keys())
+            faq_questions_text: str = context.bot_data['faq_questions_text']
             classification_prompt: str = f"""You are a university FAQ bot. Below are the FAQ questions you can answer:
 
-{', '.join(faq_questions)}
+{faq_questions_text}
 
 The user asked: "{query}"
 
@@ -44,9 +80,16 @@ Which of the above FAQ questions is this query most related to? If it's clearly
 
             try:
                 # Ask the LLM to classify the query
-                response = llm.invoke(classification_prompt)
+                response = await ainvoke_limited(llm, classification_prompt)
                 matched_faq: str = response.content.strip()
 
+                # Tolerate small differences in case or punctuation in the echoed question
+                if matched_faq not in faq_answers:
+                    closest = context.bot_data['faq_question_tree'].closest(
+                        matched_faq.lower(), FUZZY_MATCH_MAX_DISTANCE)
+                    if closest:
+                        matched_faq = closest[1]
+
                 # If the LLM found a match and it exists in our FAQs
                 if matched_faq.lower() != "none" and matched_faq in faq_answers:
                     await update.message.reply_text(faq_answers[matched_faq], parse_mode="Markdown")
@@ -55,7 +98,7 @@ Which of the above FAQ questions is this query most related to? If it's clearly
                 logger.warning(f"LLM classification failed: {e}, falling back to retrieval")
 
         # If no direct match or classification failed, use retrieval-based QA
-        response: Dict[str, Any] = faq_qa_chain.invoke(query)
+        response: Dict[str, Any] = await ainvoke_limited(faq_qa_chain, query)
 
         await update.message.reply_text(response['result'], parse_mode="Markdown")
 
@@ -3,12 +3,16 @@ import re
 from typing import List, Dict, Any, Optional, Union, Tuple
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import ContextTypes
-from difflib import SequenceMatcher
+from rapidfuzz import fuzz, process
 
 from uni_ai_chatbot.data.handbook_loader import load_handbooks
+from uni_ai_chatbot.utils.concurrency import ainvoke_limited
 
 logger = logging.getLogger(__name__)
 
+# Major named after "major", "program" or "degree" in a handbook query
+MAJOR_QUERY_PATTERN = re.compile(r'(?:major|program|degree)(?:\s+in)?\s+([a-z\s]+?)(?:$|\.|\?)')
+
 # Define common abbreviations for majors
 MAJOR_ABBREVIATIONS = {
     # Science & Math
@@ -97,7 +101,7 @@ def calculate_similarity(str1: str, str2: str) -> float:
     Returns:
         Similarity ratio between 0 and 1
     """
-    return SequenceMatcher(None, str1.lower(), str2.lower()).ratio()
+    return fuzz.ratio(str1.lower(), str2.lower()) / 100
 
 
 def extract_major_from_query(query: str) -> Optional[str]:
@@ -141,7 +145,7 @@ def extract_major_from_query(query: str) -> Optional[str]:
             return major
 
     # Try to find major using regex
-    major_match = re.search(r'(?:major|program|degree)(?:\s+in)?\s+([a-z\s]+?)(?:$|\.|\?)', cleaned_query)
+    major_match = MAJOR_QUERY_PATTERN.search(cleaned_query)
     if major_match:
         return major_match.group(1).strip()
 
@@ -188,21 +192,19 @@ def find_handbook_by_major(handbooks: List[Dict[str, Any]], major: str, similari
         if major_clean in handbook['major'].lower() or handbook['major'].lower() in major_clean:
             return handbook
 
-    # Similarity-based matching
-    best_match = None
-    best_score = 0
-
-    for handbook in handbooks:
-        # Calculate similarity with full major name
-        score = calculate_similarity(major_clean, handbook['major'].lower())
-
-        # Check if this is the best match so far and meets the threshold
-        if score > best_score and score >= similarity_threshold:
-            best_score = score
-            best_match = handbook
+    # Similarity-based matching against the full major names
+    match = process.extractOne(
+        major_clean,
+        [handbook['major'] for handbook in handbooks],
+        scorer=fuzz.ratio,
+        processor=str.lower,
+        score_cutoff=similarity_threshold * 100
+    )
+    if not match:
+        return None
 
-    if best_match:
-        logger.info(f"Found similarity match for '{major_clean}': '{best_match['major']}' with score {best_score:.2f}")
+    best_match = handbooks[match[2]]
+    logger.info(f"Found similarity match for '{major_clean}': '{best_match['major']}' with score {match[1] / 100:.2f}")
 
     return best_match
 
@@ -227,7 +229,7 @@ Respond with just the exact name of the matching program from the list of availa
 If there's no good match, respond with "No match found".
 """
 
-        response = llm.invoke(prompt)
+        response = await ainvoke_limited(llm, prompt)
         matched_major = response.content.strip()
         logger.info(f"AI suggestion for '{query}': '{matched_major}'")
 
@@ -265,7 +267,7 @@ async def handle_handbook_with_ai(update: Update, context: ContextTypes.DEFAULT_
     query = f"What information do you have about the {major} program or major at the university?"
 
     try:
-        response = general_qa_chain.invoke(query)
+        response = await ainvoke_limited(general_qa_chain, query)
         result = response['result']
 
         await update.message.reply_text(
@@ -325,7 +327,7 @@ async def handle_handbook_content_question(update: Update, context: ContextTypes
         try:
             # Invoke the chain
             logger.info(f"Invoking handbook QA chain...")
-            response = handbook_qa_chain.invoke(enhanced_query)
+            response = await ainvoke_limited(handbook_qa_chain, enhanced_query)
 
             logger.info("Successfully retrieved response from handbook QA chain")
 
@@ -531,47 +533,59 @@ async def handle_handbook_query(update: Update, context: ContextTypes.DEFAULT_TY
             await message_obj.reply_text(error_message)
 
 
+# Words that make a query a question, matched at the start of the text or as a whole word
+_QUESTION_WORDS = ("what", "how", "why", "when", "where", "who", "which", "is", "are", "can", "do", "does")
+_QUESTION_WORD_SET = frozenset(_QUESTION_WORDS)
+
+# Academic terms and phrases asking about handbook content, matched anywhere in the text
+_CONTENT_TERMS_RE = re.compile("|".join(re.escape(term) for term in [
+    "course", "credit", "requirement", "prerequisite", "module", "class",
+    "thesis", "grade", "graduation", "degree", "major", "minor", "semester",
+    "program", "study", "curriculum", "elective", "core", "mandatory",
+    "in the handbook", "from the handbook", "handbook say", "according to",
+    "tell me about", "find in", "find out", "look up"
+]))
+
+# Phrases that ask for the handbook file itself, matched anywhere in the text
+_HANDBOOK_REQUEST_RE = re.compile("|".join(re.escape(phrase) for phrase in [
+    "send me", "give me", "download", "get the handbook", "handbook for",
+    "handbook of", "pdf", "file"
+]))
+
+# Program abbreviations matched as whole words: one-word ones by set lookup on the
+# space-separated words of the text, the few multi-word ones by padded substring search
+SINGLE_WORD_MAJOR_ABBREVIATIONS = frozenset(abbr for abbr in MAJOR_ABBREVIATIONS if " " not in abbr)
+MULTI_WORD_MAJOR_ABBREVIATIONS = tuple(abbr for abbr in MAJOR_ABBREVIATIONS if " " in abbr)
+
+
 def is_content_question(text: str) -> bool:
     """
     Determine if query is asking about content within a handbook
     rather than requesting the handbook itself
     """
-    # Question indicators
-    question_words = ["what", "how", "why", "when", "where", "who", "which", "is", "are", "can", "do", "does"]
-    academic_terms = ["course", "credit", "requirement", "prerequisite", "module", "class",
-                      "thesis", "grade", "graduation", "degree", "major", "minor", "semester",
-                      "program", "study", "curriculum", "elective", "core", "mandatory"]
+    text_lower = text.lower()
+    # Words between single spaces, so "w in words" is the same test as f" {w} " in f" {text_lower} "
+    words = frozenset(text_lower.split(" "))
 
     # Check for question mark
     has_question_mark = "?" in text
 
     # Check for question words
-    has_question_word = any(text.lower().startswith(word) or f" {word} " in f" {text.lower()} "
-                            for word in question_words)
-
-    # Check for academic terms that suggest content questions
-    has_academic_term = any(term in text.lower() for term in academic_terms)
+    has_question_word = text_lower.startswith(_QUESTION_WORDS) or not _QUESTION_WORD_SET.isdisjoint(words)
 
-    # Check for explicit handbook content phrases
-    content_phrases = ["in the handbook", "from the handbook", "handbook say", "according to",
-                       "requirement", "tell me about", "find in", "find out", "look up"]
-    has_content_phrase = any(phrase in text.lower() for phrase in content_phrases)
+    # Check for academic terms and explicit handbook content phrases that suggest content questions
+    has_content_term = _CONTENT_TERMS_RE.search(text_lower) is not None
 
     # Check if explicitly requesting the handbook file
-    handbook_request_phrases = ["send me", "give me", "download", "get the handbook", "handbook for",
-                                "handbook of", "pdf", "file"]
-    is_handbook_request = any(phrase in text.lower() for phrase in handbook_request_phrases)
+    is_handbook_request = _HANDBOOK_REQUEST_RE.search(text_lower) is not None
 
     # Check for program abbreviations that might indicate a content question about a specific program
-    text_lower = text.lower()
-    has_program_abbr = any(f" {abbr} " in f" {text_lower} " or
-                           text_lower.startswith(f"{abbr} ") or
-                           text_lower.endswith(f" {abbr}")
-                           for abbr in MAJOR_ABBREVIATIONS.keys())
+    has_program_abbr = (not SINGLE_WORD_MAJOR_ABBREVIATIONS.isdisjoint(words)
+                        or any(f" {abbr} " in f" {text_lower} " for abbr in MULTI_WORD_MAJOR_ABBREVIATIONS))
 
     # Logic to determine if it's a content question
     if is_handbook_request and not has_question_mark and not has_question_word:
         return False  # Explicitly requesting the handbook itself
 
     # If it has question syntax and (academic terms or content phrases or a program abbreviation), it's likely a content question
-    return (has_question_mark or has_question_word) and (has_academic_term or has_content_phrase or has_program_abbr)
\ No newline at end of file
+    return (has_question_mark or has_question_word) and (has_content_term or has_program_abbr)
\ No newline at end of file
@@ -1,34 +1,23 @@
 import re
 import logging
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional
 from telegram import Update
 from telegram.ext import ContextTypes
 
+from uni_ai_chatbot.utils.college_aliases import COLLEGE_ALIASES, AliasMatcher
+from uni_ai_chatbot.utils.utils import start_conversation
+
 logger = logging.getLogger(__name__)
 
 # Define conversation states
 WAITING_FOR_COLLEGE = 1
 
-# College aliases dictionary for reuse
-COLLEGE_ALIASES = {
-    # Krupp
-    "krupp": "Krupp College",
-    "krupp college": "Krupp College",
-
-    # College III
-    "college iii": "College III",
-    "college 3": "College III",
-    "c3": "College III",
-
-    # Nordmetall
-    "nordmetall": "Nordmetall College",
-    "nordmetall college": "Nordmetall College",
-    "nord": "Nordmetall College",
+# Basement letter (optionally preceded by the word "basement") or a day with locker hours,
+# so both are picked up in a single pass over the query
+LOCKER_QUERY_PATTERN = re.compile(r'\b(?:basement\s*)?([abcdf])\b|(monday|thursday)', re.I)
 
-    # Mercator
-    "mercator": "Mercator College",
-    "mercator college": "Mercator College",
-}
+# Finds the college a message mentions
+_COLLEGE_MATCHER = AliasMatcher(COLLEGE_ALIASES)
 
 
 def parse_locker_hours(data):
@@ -61,15 +50,9 @@ async def handle_locker_hours(update: Update, context: ContextTypes.DEFAULT_TYPE
     text = query or update.message.text.lower()
     locker_data = context.bot_data["locker_hours"]
 
-    # Initialize user data dictionary if it doesn't exist
-    if 'locker_conversations' not in context.bot_data:
-        context.bot_data['locker_conversations'] = {}
-
-    user_id = update.effective_user.id
-
     # Check if we're in an active locker conversation
-    if user_id in context.bot_data['locker_conversations']:
-        await _handle_locker_conversation_follow_up(update, context, text, locker_data, user_id)
+    if 'locker_conversation' in context.user_data:
+        await _handle_locker_conversation_follow_up(update, context, text, locker_data)
         return
 
     # New locker query
@@ -78,7 +61,7 @@ async def handle_locker_hours(update: Update, context: ContextTypes.DEFAULT_TYPE
 
     if not matched_college:
         # Start a conversation to get the college
-        await _start_college_conversation(update, context, text, user_id)
+        await _start_college_conversation(update, context, text)
         return
 
     # Extract day and basement from query
@@ -93,8 +76,7 @@ async def _handle_locker_conversation_follow_up(
         context: ContextTypes.DEFAULT_TYPE,
 
         text: str,
-        locker_data: Dict[str, Any],
-        user_id: int
+        locker_data: Dict[str, Any]
 ) -> None:
     """
     Handle follow-up response in a locker conversation
@@ -104,19 +86,15 @@ async def _handle_locker_conversation_follow_up(
         context: Bot context
         text: User message text
         locker_data: Locker hours data
-        user_id: User ID
     """
-    college_response = text.lower()
-    matched_college = _find_college_in_text(college_response)
+    matched_college = _find_college_in_text(text)
 
     # If no match in current response, check original query too
-    original_query = context.bot_data['locker_conversations'].get(f"{user_id}_query", "")
+    # Clear conversation state, keeping the original query
+    original_query = context.user_data.pop('locker_conversation', {}).get("query", "")
     if not matched_college:
         matched_college = _find_college_in_text(original_query)
 
-    # Clear conversation state
-    del context.bot_data['locker_conversations'][user_id]
-
     if matched_college:
         # Extract day and basement using both the original and current message
         combined_text = original_query + " " + text
@@ -139,17 +117,7 @@ def _find_college_in_text(text: str) -> Optional[str]:
     Returns:
         College name or None
     """
-    # First try exact matches
-    for alias, real in COLLEGE_ALIASES.items():
-        if alias in text.lower():
-            return real
-
-    # Then try partial matches
-    for alias, real in COLLEGE_ALIASES.items():
-        if any(word in alias for word in text.lower().split()):
-            return real
-
-    return None
+    return _COLLEGE_MATCHER.find(text)
 
 
 def _extract_day_and_basement(text: str) -> tuple[Optional[str], Optional[str]]:
@@ -163,14 +131,20 @@ def _extract_day_and_basement(text: str) -> tuple[Optional[str], Optional[str]]:
         Tuple of (day, basement)
     """
     basement = None
-    m = re.search(r'\b(?:basement\s*)?([abcdf])\b', text, re.I)
-    if m:
-        basement = m.group(1).upper()
+    days = set()
+    for m in LOCKER_QUERY_PATTERN.finditer(text):
+        if m.group(1):
+            # The first basement mentioned wins
+            if basement is None:
+                basement = m.group(1).upper()
+        else:
+            days.add(m.group(2).lower())
 
+    # Monday takes precedence if both days are mentioned
     day = None
-    if "monday" in text.lower():
+    if "monday" in days:
         day = "monday"
-    elif "thursday" in text.lower():
+    elif "thursday" in days:
         day = "thursday"
 
     return day, basement
@@ -179,8 +153,7 @@ def _extract_day_and_basement(text: str) -> tuple[Optional[str], Optional[str]]:
 async def _start_college_conversation(
         update: Update,
         context: ContextTypes.DEFAULT_TYPE,
-        text: str,
-        user_id: int
+        text: str
 ) -> None:
     """
     Start a conversation to get college information
@@ -189,11 +162,9 @@ async def _start_college_conversation(
         update: Telegram update
         context: Bot context
         text: Original query text
-        user_id: User ID
     """
-    # Set the conversation state and store the original query
-    context.bot_data['locker_conversations'][user_id] = WAITING_FOR_COLLEGE
-    context.bot_data['locker_conversations'][f"{user_id}_query"] = text
+    # Set the conversation state and store the original query in the user's own data
+    start_conversation(context.user_data, 'locker_conversation', state=WAITING_FOR_COLLEGE, query=text)
 
     await update.message.reply_text(
         "❓ Please mention the college (Krupp, College III, Nordmetall, or Mercator).")
@@ -216,31 +187,31 @@ async def _respond_with_locker_hours(
         basement: Basement letter or None for all basements
         locker_data: Locker hours data
     """
-    message = f"🔓 Locker Hours for *{college}*:\n"
+    parts = [f"🔓 Locker Hours for *{college}*:\n"]
 
     if day:
         if day in locker_data[college]:
-            message += f"\n📅 {day.title()}:\n"
+            parts.append(f"\n📅 {day.title()}:\n")
             if basement:
                 time = locker_data[college][day].get(basement)
                 if time:
-                    message += f"- Basement {basement}: {time}\n"
+                    parts.append(f"- Basement {basement}: {time}\n")
                 else:
-                    message += f"- No info for Basement {basement}.\n"
+                    parts.append(f"- No info for Basement {basement}.\n")
             else:
                 for base, hours in locker_data[college][day].items():
-                    message += f"- Basement {base}: {hours}\n"
+                    parts.append(f"- Basement {base}: {hours}\n")
         else:
-            message += "- No info for that day.\n"
+            parts.append("- No info for that day.\n")
     else:
         for d, basements in locker_data[college].items():
-            message += f"\n📅 {d.title()}:\n"
+            parts.append(f"\n📅 {d.title()}:\n")
             if basement:
                 hours = basements.get(basement)
                 if hours:
-                    message += f"- Basement {basement}: {hours}\n"
+                    parts.append(f"- Basement {basement}: {hours}\n")
             else:
                 for base, time in basements.items():
-                    message += f"- Basement {base}: {time}\n"
+                    parts.append(f"- Basement {base}: {time}\n")
 
-    await update.message.reply_text(message, parse_mode="Markdown")
\ No newline at end of file
+    await update.message.reply_text("".join(parts), parse_mode="Markdown")
\ No newline at end of file
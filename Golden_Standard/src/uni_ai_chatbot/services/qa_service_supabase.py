@@ -1,17 +1,28 @@
+import hashlib
 import logging
-from typing import Tuple, Any, List, Dict
-from langchain.chains import RetrievalQA
+import os
+import numpy as np
+import orjson
+from typing import Tuple, Any, List, Dict, Optional
 from langchain_community.vectorstores import SupabaseVectorStore
 from langchain_core.prompts import PromptTemplate
-from langchain_mistralai import MistralAIEmbeddings
+from langchain_core.output_parsers import StrOutputParser
+from langchain_core.runnables import Runnable, RunnableParallel, RunnablePassthrough
 from langchain_mistralai import ChatMistralAI
 from langchain_core.documents import Document
 from langchain_core.retrievers import BaseRetriever
 from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.globals import set_llm_cache
+from langchain_community.cache import SQLiteCache
 
-from uni_ai_chatbot.configurations.config import MISTRAL_API_KEY, LLM_MODEL, LLM_TEMPERATURE, LLM_MAX_RETRIES
+from uni_ai_chatbot.configurations.config import MISTRAL_API_KEY, LLM_MODEL, LLM_TEMPERATURE, LLM_MAX_RETRIES, \
+    WARMUP_LLM, VECTOR_MATCH_FUNCTION, LLM_CACHE_PATH, RETRIEVER_SNAPSHOT_DIR, FAQ_RETRIEVER_K, \
+    FAQ_RETRIEVER_FETCH_K, FAQ_RETRIEVER_MMR_LAMBDA, CLASSIFIER_LLM_MODEL
 from uni_ai_chatbot.utils.database import get_supabase_client
+from uni_ai_chatbot.utils.http_client import get_mistral_http_client, get_mistral_async_http_client
 from uni_ai_chatbot.utils.custom_supabase import FixedSupabaseVectorStore
+from uni_ai_chatbot.utils.batched_embeddings import BatchedEmbeddings
+from uni_ai_chatbot.services.ai_provider_service import get_document_embeddings_model
 
 logger = logging.getLogger(__name__)
 
@@ -53,6 +64,178 @@ class FilteredRetriever(BaseRetriever):
         return filtered_docs[:self.k]
 
 
+def _document_ids_fingerprint(rows: List[Dict[str, Any]]) -> str:
+    """Hash the ids of a set of document rows, independent of their order"""
+    return hashlib.sha256(orjson.dumps(sorted(row["id"] for row in rows))).hexdigest()
+
+
+def _load_retriever_snapshot(tool: str, fingerprint: str) -> Optional[Tuple[List[Document], np.ndarray]]:
+    """
+    Load a saved retriever snapshot if it was taken from the same set of rows
+
+    Args:
+        tool: The tool type the snapshot belongs to
+        fingerprint: Hash of the tool's current document ids
+
+    Returns:
+        Tuple of (documents, normalized embedding matrix), or None if there is no usable snapshot
+    """
+    if not RETRIEVER_SNAPSHOT_DIR:
+        return None
+
+    documents_path = os.path.join(RETRIEVER_SNAPSHOT_DIR, f"{tool}_documents.json")
+    matrix_path = os.path.join(RETRIEVER_SNAPSHOT_DIR, f"{tool}_matrix.npy")
+    try:
+        with open(documents_path, "rb") as f:
+            snapshot = orjson.loads(f.read())
+        if snapshot.get("fingerprint") != fingerprint:
+            return None
+        matrix = np.load(matrix_path)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable '{tool}' retriever snapshot: {e}")
+        return None
+
+    documents = [Document(page_content=doc["page_content"], metadata=doc["metadata"]) for doc in snapshot["documents"]]
+    return documents, matrix
+
+
+def _save_retriever_snapshot(tool: str, fingerprint: str, documents: List[Document], matrix: np.ndarray) -> None:
+    """
+    Save retriever documents and embeddings so the next start can skip downloading them
+
+    Args:
+        tool: The tool type the snapshot belongs to
+        fingerprint: Hash of the tool's current document ids
+        documents: The loaded documents
+        matrix: Normalized embedding matrix, one row per document
+    """
+    if not RETRIEVER_SNAPSHOT_DIR:
+        return
+
+    try:
+        os.makedirs(RETRIEVER_SNAPSHOT_DIR, exist_ok=True)
+        np.save(os.path.join(RETRIEVER_SNAPSHOT_DIR, f"{tool}_matrix.npy"), matrix)
+        snapshot = {
+            "fingerprint": fingerprint,
+            "documents": [{"page_content": doc.page_content, "metadata": doc.metadata} for doc in documents]
+        }
+        # Written last so a snapshot is only used once both files are complete
+        with open(os.path.join(RETRIEVER_SNAPSHOT_DIR, f"{tool}_documents.json"), "wb") as f:
+            f.write(orjson.dumps(snapshot))
+    except Exception as e:
+        logger.warning(f"Could not save '{tool}' retriever snapshot: {e}")
+
+
+class InMemoryRetriever(BaseRetriever):
+    """A retriever that ranks a small preloaded document set by cosine similarity, without a database round trip"""
+
+    embeddings: Any
+    documents: List[Document]
+    matrix: Any  # Row-normalized float32 matrix of document embeddings
+    k: int = 4
+    fetch_k: int = 0  # Candidates re-ranked by maximal marginal relevance; 0 returns the plain top k
+    lambda_mult: float = 0.5  # MMR trade-off between relevance (1) and diversity (0)
+
+    class Config:
+        """Configuration for this pydantic object."""
+        arbitrary_types_allowed = True
+
+    @classmethod
+    def from_supabase(cls, supabase_client, embeddings, tool: str, k: int = 4, **kwargs: Any) -> "InMemoryRetriever":
+        """
+        Load all documents of one tool type with their stored embeddings, reusing the
+        on-disk snapshot when the tool's document ids have not changed since it was taken
+
+        Args:
+            supabase_client: Supabase client
+            embeddings: Embeddings model used to embed queries
+            tool: The tool type to load documents for
+            k: Number of documents to return per query
+            **kwargs: Further retriever settings, e.g. fetch_k and lambda_mult for MMR
+
+        Returns:
+            An in-memory retriever over the tool's documents
+        """
+        # Re-embedding or updating documents replaces their rows, so the ids identify the content
+        id_rows = supabase_client.table("documents").select("id").eq("metadata->>tool", tool).execute().data
+        if not id_rows:
+            raise ValueError(f"No documents found for tool '{tool}'")
+        fingerprint = _document_ids_fingerprint(id_rows)
+
+        snapshot = _load_retriever_snapshot(tool, fingerprint)
+        if snapshot:
+            documents, matrix = snapshot
+            logger.info(f"Loaded {len(documents)} '{tool}' documents from snapshot")
+            return cls(embeddings=embeddings, documents=documents, matrix=matrix, k=k, **kwargs)
+
+        rows = supabase_client.table("documents").select(
+            "id, content, metadata, embedding"
+        ).eq("metadata->>tool", tool).execute().data
+
+        if not rows:
+            raise ValueError(f"No documents found for tool '{tool}'")
+        fingerprint = _document_ids_fingerprint(rows)
+
+        # pgvector columns come back from PostgREST as '[x, y, ...]' strings; join them
+        # into one JSON array so they are decoded in a single orjson call
+        embeddings_json = ",".join(
+            row["embedding"] if isinstance(row["embedding"], str) else orjson.dumps(row["embedding"]).decode()
+            for row in rows
+        )
+        matrix = np.array(orjson.loads(f"[{embeddings_json}]"), dtype=np.float32)
+        matrix /= np.linalg.norm(matrix, axis=1, keepdims=True)
+
+        documents = [Document(page_content=row["content"], metadata=row.get("metadata") or {}) for row in rows]
+        logger.info(f"Loaded {len(documents)} '{tool}' documents into memory")
+        _save_retriever_snapshot(tool, fingerprint, documents, matrix)
+        return cls(embeddings=embeddings, documents=documents, matrix=matrix, k=k, **kwargs)
+
+    def _get_relevant_documents(
+        self,
+        query: str,
+        *,
+        run_manager: CallbackManagerForRetrieverRun = None
+    ) -> List[Document]:
+        """Return the k documents most similar to the query, diversified by MMR if fetch_k is set"""
+        query_vector = np.asarray(self.embeddings.embed_query(query), dtype=np.float32)
+        query_vector /= np.linalg.norm(query_vector) or 1.0
+
+        similarities = self.matrix @ query_vector
+        candidates = max(self.k, self.fetch_k)
+        if len(similarities) > candidates:
+            top = np.argpartition(-similarities, candidates)[:candidates]
+        else:
+            top = np.arange(len(similarities))
+        top = top[np.argsort(-similarities[top])]
+
+        if self.fetch_k:
+            top = self._maximal_marginal_relevance(similarities, top)
+
+        return [self.documents[i] for i in top[:self.k]]
+
+    def _maximal_marginal_relevance(self, similarities: np.ndarray, candidates: np.ndarray) -> List[int]:
+        """
+        Pick k candidates one at a time, trading similarity to the query against
+        similarity to the documents already picked
+
+        Args:
+            similarities: Cosine similarity of every document to the query
+            candidates: Candidate document indices, most similar first
+
+        Returns:
+            Selected document indices in selection order
+        """
+        selected: List[int] = [int(candidates[0])] if len(candidates) else []
+        remaining: List[int] = [int(i) for i in candidates[1:]]
+        while remaining and len(selected) < self.k:
+            redundancy = (self.matrix[remaining] @ self.matrix[selected].T).max(axis=1)
+            scores = self.lambda_mult * similarities[remaining] - (1 - self.lambda_mult) * redundancy
+            selected.append(remaining.pop(int(np.argmax(scores))))
+        return selected
+
+
 def get_qa_prompt_template() -> PromptTemplate:
     """Get the QA prompt template with university scope limitation instructions"""
     prompt_template = """You are a helpful university information bot for Constructor University Bremen. Your purpose is to assist students, faculty, and visitors with information about the university.
@@ -77,35 +260,9 @@ Answer:
     return PromptTemplate.from_template(prompt_template)
 
 
-def initialize_qa_chain():
-    """Initialize QA chain with Supabase vector store"""
-    try:
-        # Initialize embeddings
-        embeddings = MistralAIEmbeddings(api_key=MISTRAL_API_KEY)
-
-        # Initialize Supabase client
-        supabase_client = get_supabase_client()
-
-        # Create vector store
-        vector_store = FixedSupabaseVectorStore(
-            client=supabase_client,
-            embedding=embeddings,
-            table_name="documents",
-            query_name="match_documents"
-        )
-
-        # Initialize LLM
-        llm = ChatMistralAI(
-            model="mistral-large-latest",
-            temperature=0,
-            api_key=MISTRAL_API_KEY
-        )
-
-        # Create custom prompts
-        qa_prompt = get_qa_prompt_template()
-
-        # Create a handbook-specific prompt
-        handbook_prompt_template = """You are a knowledgeable assistant that specializes in Constructor University program handbooks.
+def get_handbook_prompt_template() -> PromptTemplate:
+    """Get the prompt template for answering questions from program handbook content"""
+    prompt_template = """You are a knowledgeable assistant that specializes in Constructor University program handbooks.
 
                 Use the following handbook content to answer the question. Be thorough and specific in your response.
 
@@ -130,75 +287,214 @@ def initialize_qa_chain():
 
                 Always format your response appropriately for the question's complexity.
                 """
+    return PromptTemplate.from_template(prompt_template)
 
-        handbook_prompt = PromptTemplate.from_template(handbook_prompt_template)
 
-        # Create base retriever that gets more documents
-        base_retriever = vector_store.as_retriever(
-            search_kwargs={"k": 20}  # Get more documents for filtering
-        )
+def _format_documents(documents: List[Document]) -> str:
+    """Join retrieved documents into the prompt context the way the "stuff" chain did"""
+    return "\n\n".join(document.page_content for document in documents)
 
-        # Create filtered retrievers using our custom FilteredRetriever
-        general_retriever = vector_store.as_retriever(
-            search_kwargs={"k": 6}
-        )
 
-        location_retriever = FilteredRetriever(
-            base_retriever=base_retriever,
-            filter_dict={"tool": "location"},
-            k=4
-        )
+def create_retrieval_qa_chain(llm, retriever: BaseRetriever, prompt: PromptTemplate) -> Runnable:
+    """
+    Compose retrieval and answering into one runnable without the RetrievalQA wrapper
 
-        locker_retriever = FilteredRetriever(
-            base_retriever=base_retriever,
-            filter_dict={"tool": "locker"},
-            k=4
-        )
+    The retriever and the LLM are awaited directly under ainvoke, and the output keeps
+    RetrievalQA's shape so callers read 'result' and 'source_documents' as before.
+
+    Args:
+        llm: The language model answering from the retrieved context
+        retriever: Retriever supplying the context documents
+        prompt: Prompt with {context} and {question} placeholders
+
+    Returns:
+        Runnable mapping a question to a dict with 'query', 'result' and 'source_documents'
+    """
+    answer = (
+        (lambda inputs: {"context": _format_documents(inputs["source_documents"]), "question": inputs["query"]})
+        | prompt
+        | llm
+        | StrOutputParser()
+    )
+    return (
+        RunnableParallel(query=RunnablePassthrough(), source_documents=retriever)
+        | RunnablePassthrough.assign(result=answer)
+    )
+
+
+def build_qa_chains(vector_store: SupabaseVectorStore, llm, faq_retriever: Optional[BaseRetriever] = None) -> Tuple:
+    """
+    Build the general QA chain and the tool-specific chains over one vector store
+
+    Args:
+        vector_store: Vector store holding all documents
+        llm: The language model answering from the retrieved context
+        faq_retriever: Retriever for FAQ documents; defaults to filtering the vector store results
+
+    Returns:
+        Tuple of (vector_store, llm, general_qa_chain, location_qa_chain,
+        locker_qa_chain, faq_qa_chain, handbook_qa_chain)
+    """
+    qa_prompt = get_qa_prompt_template()
+    handbook_prompt = get_handbook_prompt_template()
 
+    # Create base retriever that gets more documents
+    base_retriever = vector_store.as_retriever(
+        search_kwargs={"k": 20}  # Get more documents for filtering
+    )
+
+    # Create filtered retrievers using our custom FilteredRetriever
+    general_retriever = vector_store.as_retriever(
+        search_kwargs={"k": 6}
+    )
+
+    location_retriever = FilteredRetriever(
+        base_retriever=base_retriever,
+        filter_dict={"tool": "location"},
+        k=4
+    )
+
+    locker_retriever = FilteredRetriever(
+        base_retriever=base_retriever,
+        filter_dict={"tool": "locker"},
+        k=4
+    )
+
+    if faq_retriever is None:
         faq_retriever = FilteredRetriever(
             base_retriever=base_retriever,
             filter_dict={"tool": "qa"},
             k=4
         )
 
-        # Special handling for handbook retriever - get more docs
-        handbook_retriever = FilteredRetriever(
-            base_retriever=base_retriever,
-            filter_dict={"tool": "handbook"},
-            k=15  # Get more handbook chunks for better context
+    # Special handling for handbook retriever - get more docs
+    handbook_retriever = FilteredRetriever(
+        base_retriever=base_retriever,
+        filter_dict={"tool": "handbook"},
+        k=15  # Get more handbook chunks for better context
+    )
+
+    # Create QA chains with custom prompts
+    def create_chain(retriever, custom_prompt=None):
+        return create_retrieval_qa_chain(llm, retriever, custom_prompt or qa_prompt)
+
+    # Create specialized QA chains
+    general_qa_chain = create_chain(general_retriever)
+    location_qa_chain = create_chain(location_retriever)
+    locker_qa_chain = create_chain(locker_retriever)
+    faq_qa_chain = create_chain(faq_retriever)
+
+    # Special handbook chain with enhanced prompt
+    handbook_qa_chain = create_chain(handbook_retriever, handbook_prompt)
+
+    return (vector_store, llm, general_qa_chain, location_qa_chain,
+            locker_qa_chain, faq_qa_chain, handbook_qa_chain)
+
+
+def enable_llm_cache() -> None:
+    """
+    Cache LLM responses in SQLite so identical prompts (retrieval context plus question)
+    are answered without another API call, including across restarts
+    """
+    if not LLM_CACHE_PATH:
+        return
+
+    try:
+        os.makedirs(os.path.dirname(LLM_CACHE_PATH) or ".", exist_ok=True)
+        set_llm_cache(SQLiteCache(database_path=LLM_CACHE_PATH))
+        logger.info(f"LLM response cache enabled at {LLM_CACHE_PATH}")
+    except Exception as e:
+        logger.warning(f"Could not enable LLM response cache: {e}")
+
+
+def warm_up_models(embeddings, llm) -> None:
+    """
+    Run one embedding (and optionally one LLM call) at startup so the first user query
+    doesn't pay for tokenizer loading and connection setup. Failures are logged and ignored.
+    """
+    try:
+        embeddings.embed_query("warmup")
+        logger.info("Embeddings model warmed up")
+    except Exception as e:
+        logger.warning(f"Embeddings warm-up failed: {e}")
+
+    if WARMUP_LLM:
+        try:
+            llm.invoke("ping")
+            logger.info("LLM warmed up")
+        except Exception as e:
+            logger.warning(f"LLM warm-up failed: {e}")
+
+
+def initialize_qa_chain():
+    """Initialize QA chain with Supabase vector store"""
+    try:
+        # Initialize the configured embeddings backend,
+        # coalescing concurrent query embeddings into batched requests
+        embeddings = BatchedEmbeddings(get_document_embeddings_model())
+
+        # Initialize Supabase client
+        supabase_client = get_supabase_client()
+
+        # Create vector store
+        vector_store = FixedSupabaseVectorStore(
+            client=supabase_client,
+            embedding=embeddings,
+            table_name="documents",
+            query_name=VECTOR_MATCH_FUNCTION
+        )
+
+        # Initialize LLM, answering repeated prompts from the response cache
+        enable_llm_cache()
+        llm = ChatMistralAI(
+            model="mistral-large-latest",
+            temperature=0,
+            api_key=MISTRAL_API_KEY,
+            client=get_mistral_http_client(),
+            async_client=get_mistral_async_http_client()
         )
 
-        # Create QA chains with custom prompts
-        def create_chain(retriever, custom_prompt=None):
-            return RetrievalQA.from_chain_type(
-                llm=llm,
-                retriever=retriever,
-                return_source_documents=True,
-                chain_type="stuff",
-                chain_type_kwargs={"prompt": custom_prompt or qa_prompt}
+        warm_up_models(embeddings, llm)
+
+        # The FAQ set is small, so rank it in memory instead of querying Supabase
+        try:
+            faq_retriever = InMemoryRetriever.from_supabase(
+                supabase_client, embeddings, tool="qa", k=FAQ_RETRIEVER_K,
+                fetch_k=FAQ_RETRIEVER_FETCH_K, lambda_mult=FAQ_RETRIEVER_MMR_LAMBDA
             )
+        except Exception as e:
+            logger.warning(f"Could not load FAQ documents into memory: {e}, using filtered retriever")
+            faq_retriever = None
 
-        # Create specialized QA chains
-        general_qa_chain = create_chain(general_retriever)
-        location_qa_chain = create_chain(location_retriever)
-        locker_qa_chain = create_chain(locker_retriever)
-        faq_qa_chain = create_chain(faq_retriever)
-        
-        # Special handbook chain with enhanced prompt
-        handbook_qa_chain = create_chain(handbook_retriever, handbook_prompt)
+        qa_chains = build_qa_chains(vector_store, llm, faq_retriever)
 
         # Log initialization success
         logger.info("Successfully initialized all QA chains with filtered retrievers")
 
-        return (vector_store, llm, general_qa_chain, location_qa_chain,
-                locker_qa_chain, faq_qa_chain, handbook_qa_chain)
+        return qa_chains
 
     except Exception as e:
         logger.error(f"Error initializing QA chain: {e}")
         raise
 
 
-def get_scoped_qa_chain(vector_store: SupabaseVectorStore, llm: ChatMistralAI, tool_type: str) -> RetrievalQA:
+def get_classifier_llm() -> ChatMistralAI:
+    """
+    Create the LLM used to classify queries into tools, sharing the Mistral HTTP clients
+
+    Returns:
+        ChatMistralAI instance for CLASSIFIER_LLM_MODEL
+    """
+    return ChatMistralAI(
+        model=CLASSIFIER_LLM_MODEL,
+        temperature=0,
+        api_key=MISTRAL_API_KEY,
+        client=get_mistral_http_client(),
+        async_client=get_mistral_async_http_client()
+    )
+
+
+def get_scoped_qa_chain(vector_store: SupabaseVectorStore, llm: ChatMistralAI, tool_type: str) -> Runnable:
     """
     Get a QA chain that only retrieves documents relevant to a specific tool
 
@@ -223,21 +519,18 @@ def get_scoped_qa_chain(vector_store: SupabaseVectorStore, llm: ChatMistralAI, t
     )
 
     # Create a QA chain with the filtered retriever
-    return RetrievalQA.from_chain_type(
-        llm=llm,
-        retriever=filtered_retriever,
-        return_source_documents=True
-    )
+    return create_retrieval_qa_chain(llm, filtered_retriever, get_qa_prompt_template())
 
 
 def initialize_qa_chain_with_provider(provider=None, api_key=None, model=None):
     """Initialize QA chain with specific provider and API key if provided"""
-    from uni_ai_chatbot.services.ai_provider_service import get_embeddings_model, get_llm_model
+    from uni_ai_chatbot.services.ai_provider_service import get_llm_model
     from uni_ai_chatbot.configurations.config import DEFAULT_PROVIDER, MISTRAL_API_KEY
 
     try:
-        # Get the embeddings model for the specified provider
-        embeddings = get_embeddings_model(provider, api_key)
+        # Queries are embedded with the model the documents table was built with, whichever
+        # provider answers them; another provider's vectors wouldn't match the stored ones
+        embeddings = BatchedEmbeddings(get_document_embeddings_model())
 
         # Get Supabase client
         supabase_client = get_supabase_client()
@@ -247,110 +540,13 @@ def initialize_qa_chain_with_provider(provider=None, api_key=None, model=None):
             client=supabase_client,
             embedding=embeddings,
             table_name="documents",
-            query_name="match_documents"
+            query_name=VECTOR_MATCH_FUNCTION
         )
 
         # Get LLM model
         llm = get_llm_model(provider, api_key, model)
 
-        # Create custom prompts
-        qa_prompt = get_qa_prompt_template()
-        
-        handbook_prompt_template = """You are a knowledgeable assistant that specializes in Constructor University program handbooks.
-        
-        Use the following handbook content to answer the question. Be thorough and specific in your response.
-        
-        IMPORTANT: If the provided context doesn't contain enough information to fully answer the question, 
-        say what you can based on the available information and mention what specific information is missing.
-
-        Context from handbooks:
-        {context}
-
-        Question: {question}
-
-        Provide a detailed answer using the handbook information. Include:
-        - Specific requirements or criteria mentioned
-        - Credit hours or ECTS if mentioned
-        - Any important policies or procedures
-        - Relevant deadlines or timelines
-        
-        Format your response clearly with bullet points where appropriate.
-        """
-
-        handbook_prompt = PromptTemplate.from_template(handbook_prompt_template)
-
-        # Create base retriever
-        base_retriever = vector_store.as_retriever(
-            search_kwargs={"k": 20}
-        )
-
-        # Create filtered retrievers
-        general_retriever = vector_store.as_retriever(
-            search_kwargs={"k": 6}
-        )
-
-        location_retriever = FilteredRetriever(
-            base_retriever=base_retriever,
-            filter_dict={"tool": "location"},
-            k=4
-        )
-
-        locker_retriever = FilteredRetriever(
-            base_retriever=base_retriever,
-            filter_dict={"tool": "locker"},
-            k=4
-        )
-
-        faq_retriever = FilteredRetriever(
-            base_retriever=base_retriever,
-            filter_dict={"tool": "qa"},
-            k=4
-        )
-
-        handbook_retriever = FilteredRetriever(
-            base_retriever=base_retriever,
-            filter_dict={"tool": "handbook"},
-            k=15
-        )
-
-        # Create QA chains for different document types
-        general_qa_chain = RetrievalQA.from_chain_type(
-            llm=llm, 
-            retriever=general_retriever, 
-            return_source_documents=True,
-            chain_type_kwargs={"prompt": qa_prompt}
-        )
-
-        location_qa_chain = RetrievalQA.from_chain_type(
-            llm=llm, 
-            retriever=location_retriever, 
-            return_source_documents=True,
-            chain_type_kwargs={"prompt": qa_prompt}
-        )
-
-        locker_qa_chain = RetrievalQA.from_chain_type(
-            llm=llm, 
-            retriever=locker_retriever, 
-            return_source_documents=True,
-            chain_type_kwargs={"prompt": qa_prompt}
-        )
-
-        faq_qa_chain = RetrievalQA.from_chain_type(
-            llm=llm, 
-            retriever=faq_retriever, 
-            return_source_documents=True,
-            chain_type_kwargs={"prompt": qa_prompt}
-        )
-
-        handbook_qa_chain = RetrievalQA.from_chain_type(
-            llm=llm, 
-            retriever=handbook_retriever, 
-            return_source_documents=True,
-            chain_type_kwargs={"prompt": handbook_prompt}
-        )
-
-        return (vector_store, llm, general_qa_chain, location_qa_chain,
-                locker_qa_chain, faq_qa_chain, handbook_qa_chain)
+        return build_qa_chains(vector_store, llm)
 
     except Exception as e:
         logger.error(f"Error initializing QA chain with provider {provider}: {e}")
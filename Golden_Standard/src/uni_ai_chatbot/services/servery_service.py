@@ -4,30 +4,17 @@ from typing import Dict, Any, Optional, List, Tuple
 from telegram import Update
 from telegram.ext import ContextTypes
 
+from uni_ai_chatbot.utils.college_aliases import COLLEGE_ALIASES, AliasMatcher
+from uni_ai_chatbot.utils.utils import start_conversation
+
 logger = logging.getLogger(__name__)
 
 # Define conversation states
 WAITING_FOR_COLLEGE = 1
 
-# College aliases dictionary for reuse - same as locker service but add Coffee Bar
-COLLEGE_ALIASES = {
-    # Krupp
-    "krupp": "Krupp College",
-    "krupp college": "Krupp College",
-
-    # College III
-    "college iii": "College III",
-    "college 3": "College III",
-    "c3": "College III",
-
-    # Nordmetall
-    "nordmetall": "Nordmetall College",
-    "nordmetall college": "Nordmetall College",
-    "nord": "Nordmetall College",
-
-    # Mercator
-    "mercator": "Mercator College",
-    "mercator college": "Mercator College",
+# The colleges' aliases, plus the Coffee Bar, which has servery hours too
+SERVERY_ALIASES = {
+    **COLLEGE_ALIASES,
 
     # Coffee Bar
     "coffee bar": "Coffee Bar",
@@ -61,6 +48,32 @@ MEAL_ALIASES = {
     "fries": "burgers/loaded fries"
 }
 
+# Meal aliases ordered longest first so "pizza pasta" is tried before "pizza"
+_MEAL_ALIASES_SORTED: List[Tuple[str, str]] = sorted(MEAL_ALIASES.items(), key=lambda item: -len(item[0]))
+
+# Day names that can be extracted from a query
+SERVERY_DAYS = ("monday", "tuesday", "wednesday", "thursday", "friday", "weekend", "holiday", "weekday")
+
+# Words in a query that name a servery day, in order of precedence when several appear
+_DAY_WORDS: List[Tuple[str, str]] = [
+    ("monday", "monday"), ("tuesday", "tuesday"), ("wednesday", "wednesday"), ("thursday", "thursday"),
+    ("friday", "friday"), ("weekend", "weekend"), ("saturday", "weekend"), ("sunday", "weekend"),
+    ("holiday", "holiday"), ("weekday", "weekday")
+]
+_DAY_WORD_RANK: Dict[str, int] = {word: rank for rank, (word, _) in enumerate(_DAY_WORDS)}
+_MEAL_ALIAS_RANK: Dict[str, int] = {alias: rank for rank, (alias, _) in enumerate(_MEAL_ALIASES_SORTED)}
+
+# Meal alias (group 1) and day word (group 2) starting at each position of the query, found
+# in one pass; lookaheads keep overlapping words such as "burgersaturday" visible to both
+_DAY_AND_MEAL_PATTERN = re.compile(
+    "(?=(" + "|".join(re.escape(alias) for alias, _ in _MEAL_ALIASES_SORTED) + ")|)"
+    "(?=(" + "|".join(re.escape(word) for word, _ in _DAY_WORDS) + ")|)"
+)
+
+
+# Finds the college or Coffee Bar a message mentions
+_SERVERY_MATCHER = AliasMatcher(SERVERY_ALIASES)
+
 
 def parse_servery_hours(data):
     """Parse servery hours data from Supabase into a usable format for the bot"""
@@ -91,16 +104,11 @@ async def handle_servery_hours(update: Update, context: ContextTypes.DEFAULT_TYP
     """Handle queries about servery hours"""
     text = query or update.message.text.lower()
     servery_data = context.bot_data["servery_hours"]
-
-    # Initialize user data dictionary if it doesn't exist
-    if 'servery_conversations' not in context.bot_data:
-        context.bot_data['servery_conversations'] = {}
-
-    user_id = update.effective_user.id
+    servery_responses = context.bot_data.get("servery_responses")
 
     # Check if we're in an active servery conversation
-    if user_id in context.bot_data['servery_conversations']:
-        await _handle_servery_conversation_follow_up(update, context, text, servery_data, user_id)
+    if 'servery_conversation' in context.user_data:
+        await _handle_servery_conversation_follow_up(update, context, text, servery_data)
         return
 
     # New servery query
@@ -109,22 +117,21 @@ async def handle_servery_hours(update: Update, context: ContextTypes.DEFAULT_TYP
 
     if not matched_college:
         # Start a conversation to get the college
-        await _start_college_conversation(update, context, text, user_id)
+        await _start_college_conversation(update, context, text)
         return
 
     # Extract day and meal type from query
     day, meal = _extract_day_and_meal(text)
 
     # Create response
-    await _respond_with_servery_hours(update, matched_college, day, meal, servery_data)
+    await _respond_with_servery_hours(update, matched_college, day, meal, servery_data, servery_responses)
 
 
 async def _handle_servery_conversation_follow_up(
         update: Update,
         context: ContextTypes.DEFAULT_TYPE,
         text: str,
-        servery_data: Dict[str, Any],
-        user_id: int
+        servery_data: Dict[str, Any]
 ) -> None:
     """
     Handle follow-up response in a servery conversation
@@ -134,26 +141,23 @@ async def _handle_servery_conversation_follow_up(
         context: Bot context
         text: User message text
         servery_data: Servery hours data
-        user_id: User ID
     """
-    college_response = text.lower()
-    matched_college = _find_college_in_text(college_response)
+    matched_college = _find_college_in_text(text)
 
     # If no match in current response, check original query too
-    original_query = context.bot_data['servery_conversations'].get(f"{user_id}_query", "")
+    # Clear conversation state, keeping the original query
+    original_query = context.user_data.pop('servery_conversation', {}).get("query", "")
     if not matched_college:
         matched_college = _find_college_in_text(original_query)
 
-    # Clear conversation state
-    del context.bot_data['servery_conversations'][user_id]
-
     if matched_college:
         # Extract day and meal type using both the original and current message
         combined_text = original_query + " " + text
         day, meal = _extract_day_and_meal(combined_text)
 
         # Create response
-        await _respond_with_servery_hours(update, matched_college, day, meal, servery_data)
+        await _respond_with_servery_hours(update, matched_college, day, meal, servery_data,
+                                          context.bot_data.get("servery_responses"))
     else:
         await update.message.reply_text(
             "❓ I couldn't identify that servery. Please mention one of: Krupp, College III, Nordmetall, Mercator")
@@ -169,55 +173,22 @@ def _find_college_in_text(text: str) -> Optional[str]:
     Returns:
         College name or None
     """
-    # First try exact matches
-    for alias, real in COLLEGE_ALIASES.items():
-        if alias in text.lower():
-            return real
-
-    # Then try partial matches
-    for alias, real in COLLEGE_ALIASES.items():
-        if any(word in alias for word in text.lower().split()):
-            return real
-
-    return None
+    return _SERVERY_MATCHER.find(text)
 
 
 def _extract_day_and_meal(text: str) -> Tuple[Optional[str], Optional[str]]:
     """
     Extract day and meal type information from text
     """
-    # Extract meal type
-    meal = None
-    for alias, real_meal in MEAL_ALIASES.items():
-        if alias in text.lower():
-            meal = real_meal
-            break
-
-    # If no match found for special meals, check for partial matches
-    if not meal:
-        if "pizza" in text.lower() or "pasta" in text.lower():
-            meal = "pizza/pasta"
-        elif "burger" in text.lower() or "fries" in text.lower():
-            meal = "burgers/loaded fries"
-
-    # Extract day (unchanged)
-    day = None
-    if "monday" in text.lower():
-        day = "monday"
-    elif "tuesday" in text.lower():
-        day = "tuesday"
-    elif "wednesday" in text.lower():
-        day = "wednesday"
-    elif "thursday" in text.lower():
-        day = "thursday"
-    elif "friday" in text.lower():
-        day = "friday"
-    elif "weekend" in text.lower() or "saturday" in text.lower() or "sunday" in text.lower():
-        day = "weekend"
-    elif "holiday" in text.lower():
-        day = "holiday"
-    elif "weekday" in text.lower():
-        day = "weekday"
+    found = _DAY_AND_MEAL_PATTERN.findall(text.lower())
+
+    # Extract meal type, preferring the longest alias mentioned
+    meal_aliases = [meal_alias for meal_alias, _ in found if meal_alias]
+    meal = MEAL_ALIASES[min(meal_aliases, key=_MEAL_ALIAS_RANK.__getitem__)] if meal_aliases else None
+
+    # Extract day, preferring the earliest entry of _DAY_WORDS mentioned
+    day_words = [day_word for _, day_word in found if day_word]
+    day = _DAY_WORDS[min(_DAY_WORD_RANK[word] for word in day_words)][1] if day_words else None
 
     return day, meal
 
@@ -225,8 +196,7 @@ def _extract_day_and_meal(text: str) -> Tuple[Optional[str], Optional[str]]:
 async def _start_college_conversation(
         update: Update,
         context: ContextTypes.DEFAULT_TYPE,
-        text: str,
-        user_id: int
+        text: str
 ) -> None:
     """
     Start a conversation to get college information
@@ -235,65 +205,100 @@ async def _start_college_conversation(
         update: Telegram update
         context: Bot context
         text: Original query text
-        user_id: User ID
     """
-    # Set the conversation state and store the original query
-    context.bot_data['servery_conversations'][user_id] = WAITING_FOR_COLLEGE
-    context.bot_data['servery_conversations'][f"{user_id}_query"] = text
+    # Set the conversation state and store the original query in the user's own data
+    start_conversation(context.user_data, 'servery_conversation', state=WAITING_FOR_COLLEGE, query=text)
 
     await update.message.reply_text(
         "❓ Which servery would you like information about? (Krupp, College III, Nordmetall, Mercator, or Coffee Bar)")
 
 
-async def _respond_with_servery_hours(
-        update: Update,
+def _format_meal_type(meal_type: str) -> str:
+    """Make meal types look nicer: capitalize each word and replace slashes with a suitable emoji"""
+    if "/" in meal_type:
+        # For special meal types with slashes
+        parts = meal_type.split("/")
+        return " 🍽 ".join(part.strip().title() for part in parts)
+    # For standard meals
+    return meal_type.title()
+
+
+def _build_servery_message(
         college: str,
         day: Optional[str],
         meal: Optional[str],
         servery_data: Dict[str, Any]
-) -> None:
+) -> str:
     """
-    Create and send response with servery hours
+    Build the Markdown response with servery hours for a college, day and meal
     """
-    message = f"🍽 Servery Hours for *{college}*:\n"
-
-    # Format function to make meal types look nicer
-    def format_meal_type(meal_type: str) -> str:
-        # Capitalize each word and replace slashes with suitable emoji
-        if "/" in meal_type:
-            # For special meal types with slashes
-            parts = meal_type.split("/")
-            formatted = " 🍽 ".join(part.strip().title() for part in parts)
-            return formatted
-        else:
-            # For standard meals
-            return meal_type.title()
+    parts = [f"🍽 Servery Hours for *{college}*:\n"]
 
     if day:
         if day in servery_data[college]:
-            message += f"\n📅 {day.title()}:\n"
+            parts.append(f"\n📅 {day.title()}:\n")
             if meal:
                 time = servery_data[college][day].get(meal)
                 if time:
-                    message += f"- {format_meal_type(meal)}: {time}\n"
+                    parts.append(f"- {_format_meal_type(meal)}: {time}\n")
                 else:
-                    message += f"- No info for {format_meal_type(meal)} on {day}.\n"
+                    parts.append(f"- No info for {_format_meal_type(meal)} on {day}.\n")
             else:
                 for meal_type, hours in servery_data[college][day].items():
-                    message += f"- {format_meal_type(meal_type)}: {hours}\n"
+                    parts.append(f"- {_format_meal_type(meal_type)}: {hours}\n")
         else:
-            message += "- No info for that day.\n"
+            parts.append("- No info for that day.\n")
     else:
         for d, meals in servery_data[college].items():
-            message += f"\n📅 {d.title()}:\n"
+            parts.append(f"\n📅 {d.title()}:\n")
             if meal:
                 hours = meals.get(meal)
                 if hours:
-                    message += f"- {format_meal_type(meal)}: {hours}\n"
+                    parts.append(f"- {_format_meal_type(meal)}: {hours}\n")
                 else:
-                    message += f"- No {format_meal_type(meal)} hours available for {d}.\n"
+                    parts.append(f"- No {_format_meal_type(meal)} hours available for {d}.\n")
             else:
                 for meal_type, time in meals.items():
-                    message += f"- {format_meal_type(meal_type)}: {time}\n"
+                    parts.append(f"- {_format_meal_type(meal_type)}: {time}\n")
+
+    return "".join(parts)
+
+
+def precompute_servery_responses(servery_data: Dict[str, Any]) -> Dict[Tuple[str, Optional[str], Optional[str]], str]:
+    """
+    Materialize the response text for every (college, day, meal) combination once at load time,
+    including the day=None / meal=None aggregates, so answering a query is a single dict lookup
+
+    Args:
+        servery_data: Parsed servery hours data
+
+    Returns:
+        Dictionary mapping (college, day, meal) to the ready-to-send Markdown message
+    """
+    meals = [None] + sorted(set(MEAL_ALIASES.values()))
+    responses = {}
+
+    for college, days in servery_data.items():
+        for day in [None] + sorted(set(SERVERY_DAYS) | set(days)):
+            for meal in meals:
+                responses[(college, day, meal)] = _build_servery_message(college, day, meal, servery_data)
+
+    return responses
+
+
+async def _respond_with_servery_hours(
+        update: Update,
+        college: str,
+        day: Optional[str],
+        meal: Optional[str],
+        servery_data: Dict[str, Any],
+        servery_responses: Optional[Dict[Tuple[str, Optional[str], Optional[str]], str]] = None
+) -> None:
+    """
+    Send response with servery hours, using the precomputed message when available
+    """
+    message = (servery_responses or {}).get((college, day, meal))
+    if message is None:
+        message = _build_servery_message(college, day, meal, servery_data)
 
     await update.message.reply_text(message, parse_mode="Markdown")
@@ -1,15 +1,202 @@
+import asyncio
 import logging
-from typing import Dict, List, Optional
-from functools import lru_cache
+import re
+import sys
+from collections import Counter
+from typing import Dict, List, Optional, Set, Tuple
 from langchain_mistralai import ChatMistralAI
 from telegram import Update
 from telegram.ext import ContextTypes
 
-from uni_ai_chatbot.configurations.config import ENABLE_LLM_CLASSIFICATION
+from uni_ai_chatbot.configurations.config import ENABLE_LLM_CLASSIFICATION, \
+    CLASSIFICATION_CACHE_SIZE, CLASSIFICATION_BATCH_WINDOW, CLASSIFICATION_MAX_BATCH_SIZE, \
+    CLASSIFICATION_MAX_TOKENS
+from uni_ai_chatbot.utils.cache import LRUCache, normalize_query
+from uni_ai_chatbot.utils.concurrency import ainvoke_limited
+from uni_ai_chatbot.tools.tools_architecture import tool_registry
 
 logger = logging.getLogger(__name__)
 
 
+def _compile_terms(terms: List[str]) -> re.Pattern:
+    """
+    Compile a list of literal terms into one alternation so a single regex scan
+    tells whether any of them occurs in the text
+
+    Args:
+        terms: Literal substrings to look for
+
+    Returns:
+        Compiled pattern matching any of the terms
+    """
+    return re.compile("|".join(re.escape(term) for term in terms))
+
+
+def _compile_words(terms: List[str]) -> re.Pattern:
+    """
+    Compile a list of literal terms into one alternation that only matches them as whole
+    words, so e.g. "eat" doesn't match inside "theater"
+
+    Args:
+        terms: Literal words or phrases to look for
+
+    Returns:
+        Compiled pattern matching any of the terms between word boundaries
+    """
+    return re.compile(r"\b(?:" + "|".join(re.escape(term) for term in terms) + r")\b")
+
+
+# Terms that route a query to the handbook tool on their own
+_HANDBOOK_TERMS_RE = _compile_terms([
+    "handbook", "program", "major", "degree", "curriculum", "syllabus",
+    "course requirement", "graduation requirement", "credit", "ects",
+    "bachelor thesis", "master thesis", "phd thesis", "dissertation",
+    "module", "examination", "study plan", "schematic", "mandatory",
+    "elective", "core module", "choice module", "career module",
+    "specialization", "internship", "constructor track",
+    "curricular structure", "qualification aims", "learning outcome",
+    "prerequisite", "corequisite", "semester", "year of study",
+    "academic", "grading", "gpa", "cgpa", "assessment",
+    "what are the requirements", "how many credits", "how many modules"
+])
+
+# Handbook terms specific enough to route a query without the LLM, as whole words; broad
+# ones like "semester", "credit" or "program" also turn up in non-academic questions
+_TRUSTED_HANDBOOK_WORDS_RE = _compile_words([
+    "handbook", "curriculum", "syllabus", "ects", "dissertation",
+    "course requirement", "course requirements", "graduation requirement",
+    "graduation requirements", "bachelor thesis", "master thesis", "phd thesis",
+    "study plan", "core module", "choice module", "career module", "constructor track",
+    "curricular structure", "qualification aims", "learning outcome", "learning outcomes",
+    "prerequisite", "prerequisites", "corequisite", "corequisites", "gpa", "cgpa",
+    "how many credits", "how many modules"
+])
+
+# Course-specific questions that should go to handbook
+_COURSE_QUESTION_RE = re.compile("|".join([
+    r"prerequisite.*for.*\w+",  # prerequisites for [course]
+    r"pre.?requisite.*for.*\w+",  # pre-requisites for [course]
+    r"requirement.*for.*\w+",  # requirements for [course]
+    r"what.*need.*for.*\w+",  # what do I need for [course]
+    r"what.*required.*for.*\w+",  # what is required for [course]
+    r"professor.*for.*\w+",  # professor for [course]
+    r"instructor.*for.*\w+",  # instructor for [course]
+    r"when.*is.*\w+.*offered",  # when is [course] offered
+    r"credits.*for.*\w+",  # credits for [course]
+    r"ects.*for.*\w+"  # ECTS for [course]
+]))
+
+# Specific program names or abbreviations
+_PROGRAM_TERMS_RE = _compile_terms([
+    "computer science", "cs", "robotics", "ris", "intelligent systems",
+    "electrical engineering", "ece", "physics", "pds", "mathematics",
+    "chemistry", "biology", "biochemistry", "bccb", "earth science",
+    "industrial engineering", "iem", "global economics", "gem",
+    "business administration", "iba", "international business",
+    "social psychology", "cognitive psychology", "iscp", "irph",
+    "international relations", "politics", "history", "sdt",
+    "software", "data", "technology", "medicinal chemistry", "mccb"
+])
+
+# Keywords that suggest asking about a program or course
+_PROGRAM_QUESTION_INDICATORS_RE = _compile_terms([
+    "program", "major", "study", "studying", "graduate", "graduation",
+    "requirement", "requirements", "module", "modules", "course", "courses",
+    "credit", "credits", "ects", "semester", "year", "thesis",
+    "can i", "do i need", "how to", "what is required", "what do i need",
+    "prerequisite", "pre-requisite", "professor", "instructor", "teaching"
+])
+
+# Common course names that might be asked about
+_COMMON_COURSES_RE = _compile_terms([
+    "operating systems", "database", "algorithms", "data structures",
+    "networks", "programming", "calculus", "linear algebra",
+    "machine learning", "artificial intelligence", "compiler",
+    "software engineering", "web development", "mobile development"
+])
+
+# Questions that are clearly about academic programs
+_ACADEMIC_PATTERN_RE = re.compile("|".join([
+    r"what.*requirements.*\b(cs|computer science|robotics|engineering|business|psychology)",
+    r"how.*graduate.*from",
+    r"how many.*credits",
+    r"what.*courses.*need",
+    r"can i.*major",
+    r"requirements.*for.*\b(bachelor|master|phd)",
+    r"tell me about.*program",
+    r"information about.*\b(cs|computer science|robotics|engineering)"
+]))
+
+_LOCATION_TERMS_RE = _compile_terms([
+    "where", "find", "location", "where is", "how do i get to", "how can i get to", "how to reach", "directions"
+])
+_LOCKER_TERMS_RE = _compile_terms(["locker", "basement", "access"])
+_SERVERY_TERMS_RE = _compile_terms([
+    "servery", "food", "meal", "eat", "dining", "breakfast", "lunch", "dinner",
+    "coffee bar", "menu", "cafeteria"
+])
+_TIME_TERMS_RE = _compile_terms(["hours", "time", "open", "when", "schedule"])
+# The same terms as whole words, for routing without any further classification
+_SERVERY_WORDS_RE = _compile_words([
+    "servery", "food", "meal", "eat", "dining", "breakfast", "lunch", "dinner",
+    "coffee bar", "menu", "cafeteria"
+])
+_TIME_WORDS_RE = _compile_words(["hours", "time", "open", "when", "schedule"])
+# Openings of FAQ-style questions, checked with str.startswith
+_FAQ_PREFIXES = ("how do i", "how to", "what is the", "can i", "when is")
+
+# Direction questions, which are always about a campus location
+_DIRECTIONS_RE = re.compile(r"\b(?:how (?:do|can) i get to|how to reach|directions to)\b")
+
+# Pending follow-up questions in context.user_data and the tool that continues each,
+# checked in this order
+_CONVERSATION_TOOLS = (
+    ("locker_conversation", "locker"),
+    ("servery_conversation", "servery"),
+    ("handbook_conversation", "handbook"),
+    ("faq_conversation", "faq"),
+)
+
+# Messages answered by the general QA tool without running the rules or the LLM
+_TRIVIAL_QUERIES = frozenset({"hi", "hello", "hey", "thanks", "thank you", "ok", "okay", "yes", "no"})
+
+# Tool names the LLM may answer with, in the order they are looked for in a free-form answer
+_VALID_TOOLS = ("location", "locker", "faq", "qa", "handbook", "servery")
+_VALID_TOOL_SET = frozenset(_VALID_TOOLS)
+
+# Examples to help the model understand common patterns
+_CLASSIFICATION_EXAMPLES = """
+        Examples:
+        1. "Where is the library?" → location
+        2. "How do I get my enrollment certificate?" → faq
+        3. "When are the locker hours for Krupp College?" → locker
+        4. "What's the address of the university?" → qa
+        5. "Where can I print documents?" → location
+        6. "Tell me about the semester ticket" → faq
+        7. "How to change my address in Bremen?" → faq
+        8. "What's the student emergency number?" → faq
+        9. "Where can I get food on campus?" → location
+        10. "When is breakfast served at Krupp College?" → servery
+        11. "What are the lunch hours at Mercator?" → servery
+        12. "Is the Coffee Bar open on weekends?" → servery
+        13. "Servery hours for Nordmetall" → servery
+        """
+
+# The end of the classification prompt, following the user query
+_CLASSIFICATION_INSTRUCTIONS = """"
+
+        Analyze the query and determine which tool is most appropriate to handle it. Respond with just the tool name and nothing else. The available tools are: location, locker, faq, qa, handbook, servery.
+        """
+
+# The end of the prompt classifying several numbered queries at once
+_BATCH_CLASSIFICATION_INSTRUCTIONS = """
+        Analyze each query separately and determine which tool is most appropriate to handle it. Respond with one line per query in the form "<number>. <tool name>" and nothing else. The available tools are: location, locker, faq, qa, handbook, servery.
+        """
+
+# One "<number>. <tool name>" line of a batch classification response
+_BATCH_RESPONSE_LINE_RE = re.compile(r"^\W*(\d+)\W+(.+)$", re.MULTILINE)
+
+
 class ToolClassifier:
     """
     A class that uses LLM to classify user queries and select appropriate tools
@@ -17,8 +204,20 @@ class ToolClassifier:
 
     def __init__(self, llm: Optional[ChatMistralAI] = None) -> None:
         self.llm: Optional[ChatMistralAI] = llm
-        from uni_ai_chatbot.tools.tools_architecture import tool_registry
-        self._tools: List[Dict[str, str]] = tool_registry.get_tool_descriptions()
+        # Tool names of recent LLM classifications, keyed by normalized query
+        self._classification_cache: LRUCache = LRUCache(CLASSIFICATION_CACHE_SIZE)
+        # Pending LLM classifications, keyed by normalized query
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        # Number of queries classified by each route (trivial, confident, rules, llm, default)
+        self._route_counts: Counter = Counter()
+        # The classification prompt around the query, which is the same for every query
+        self._prompt_header: str = self._compose_prompt_header()
+        self._prompt_prefix: str = self._prompt_header + 'User query: "'
+        self._prompt_suffix: str = _CLASSIFICATION_INSTRUCTIONS
+        # Queries waiting for the next batched LLM call, and the timer that sends it
+        self._pending: List[Tuple[str, asyncio.Future]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._batch_tasks: Set[asyncio.Task] = set()
 
     async def classify_query(self, query: str, context: ContextTypes.DEFAULT_TYPE, update: Update) -> str:
         """
@@ -34,47 +233,60 @@ class ToolClassifier:
         Returns:
             The name of the tool that should handle the query
         """
-        # First check if query is university-related
-        from uni_ai_chatbot.utils.content_filter import is_university_related
-        is_relevant, _ = is_university_related(query)
-        if not is_relevant:
-            return "non_university"
-
-        # Check for active conversations
-        user_id = update.effective_user.id
-
-        # Check if we're in an active locker conversation
-        if 'locker_conversations' in context.bot_data and user_id in context.bot_data['locker_conversations']:
-            return "locker"  # Continue the locker conversation
-
-        # Add this new check for servery conversations
-        if 'servery_conversations' in context.bot_data and user_id in context.bot_data['servery_conversations']:
-            return "servery"  # Continue the servery conversation
+        # Relevance is already checked by handle_message before classification,
+        # so the content filter is not run a second time here
+
+        # Continue an active conversation, tracked per user in context.user_data;
+        # users with no user data at all, the usual case, skip the checks
+        user_data = context.user_data
+        if user_data:
+            for conversation, tool_name in _CONVERSATION_TOOLS:
+                if conversation in user_data:
+                    return tool_name
+
+        # Lowercase once for all the keyword rules below
+        query_lower = query.lower()
 
-        # Check if we're in an active handbook conversation
-        if 'handbook_conversations' in context.bot_data and user_id in context.bot_data['handbook_conversations']:
+        # Greetings, acknowledgements and near-empty messages carry no intent to classify
+        stripped_query = query_lower.strip()
+        if len(stripped_query) < 3 or stripped_query in _TRIVIAL_QUERIES:
+            self._count_route("trivial")
+            return "qa"
+
+        # Queries whose intent is unambiguous don't need an LLM call
+        confident_tool = self._confident_route(query_lower)
+        if confident_tool:
+            self._count_route("confident")
+            logger.info(f"Routed query '{query}' to '{confident_tool}' without the LLM")
+            return confident_tool
+
+        # An unmistakably academic term is trusted; the broader rules below match too loosely
+        # (e.g. "access" for lockers, "find" for locations) and are only the fallback
+        if _TRUSTED_HANDBOOK_WORDS_RE.search(query_lower):
+            self._count_route("rules")
+            logger.info(f"Routed query '{query}' to 'handbook' by rules")
             return "handbook"
 
-        # Check if we're in an active FAQ conversation
-        if 'faq_conversations' in context.bot_data and user_id in context.bot_data['faq_conversations']:
-            return "faq"
-
-
         # Use the LLM if available and enabled
         if self.llm and ENABLE_LLM_CLASSIFICATION:
             try:
                 # Use cached classification to avoid repeated LLM calls
-                clean_query = query.strip().lower()
-                tool_name = await self._cached_classify(clean_query)
+                tool_name = await self._cached_classify(normalize_query(query))
+                self._count_route("llm")
                 logger.info(f"LLM classified query '{query}' as '{tool_name}'")
                 return tool_name
             except Exception as e:
                 logger.warning(f"LLM classification failed: {e}, falling back to basic rules")
 
-        # Fall back to basic rules
-        return self._rule_based_classification(query)
+        # Fall back to the basic rules
+        self._count_route("default")
+        return self._rule_based_classification(query, query_lower)
+
+    def _count_route(self, route: str) -> None:
+        """Count how a query was classified, to see how often the LLM is still needed"""
+        self._route_counts[route] += 1
+        logger.debug(f"Classification routes so far: {dict(self._route_counts)}")
 
-    @lru_cache(maxsize=100)
     async def _cached_classify(self, query: str) -> str:
         """
         Cached classification to avoid repeated LLM calls for identical queries
@@ -85,138 +297,183 @@ class ToolClassifier:
         Returns:
             The classified tool name
         """
-        classification_prompt = self._build_classification_prompt(query)
-        response = self.llm.invoke(classification_prompt)
-        return self._parse_classification_response(response.content)
+        # The LLM runs at temperature 0, so a query's classification doesn't change
+        tool_name: Optional[str] = self._classification_cache.get(query)
+        if tool_name is not None:
+            return tool_name
+
+        # Identical queries arriving while one is being classified wait for that LLM call
+        in_flight: Optional[asyncio.Future] = self._in_flight.get(query)
+        if in_flight is not None:
+            return await asyncio.shield(in_flight)
+
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._in_flight[query] = future
+        try:
+            tool_name = await self._classify_in_batch(query)
+            self._classification_cache.put(query, tool_name)
+            future.set_result(tool_name)
+            return tool_name
+        except Exception as e:
+            # Waiting callers fall back to the rules just like this one
+            future.set_exception(e)
+            # Nobody may be waiting, so mark the exception as retrieved
+            future.exception()
+            raise
+        except asyncio.CancelledError:
+            future.set_exception(RuntimeError("Classification was cancelled"))
+            future.exception()
+            raise
+        finally:
+            del self._in_flight[query]
+
+    async def _classify_in_batch(self, query: str) -> str:
+        """
+        Classify a query with the LLM together with other queries arriving within the batch window
 
-    def _rule_based_classification(self, query: str) -> str:
+        Args:
+            query: The normalized user query
+
+        Returns:
+            The classified tool name
+        """
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future = loop.create_future()
+        self._pending.append((query, future))
+
+        if len(self._pending) >= CLASSIFICATION_MAX_BATCH_SIZE:
+            self._flush_pending()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(CLASSIFICATION_BATCH_WINDOW, self._flush_pending)
+
+        return await future
+
+    def _flush_pending(self) -> None:
+        """Send the queries collected so far to the LLM as one batch"""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        batch, self._pending = self._pending, []
+        if batch:
+            # Keep a reference so the task isn't garbage collected while it runs
+            task = asyncio.get_running_loop().create_task(self._classify_batch(batch))
+            self._batch_tasks.add(task)
+            task.add_done_callback(self._batch_tasks.discard)
+
+    async def _classify_batch(self, batch: List[Tuple[str, asyncio.Future]]) -> None:
+        """
+        Classify a batch of queries in a single LLM call and resolve their futures
+
+        Args:
+            batch: Pairs of normalized query and the future waiting for its tool name
+        """
+        try:
+            # The answer is a tool name per query, so generation is capped to what that takes
+            if len(batch) == 1:
+                # A lone query gets the regular single-query prompt, answered on one line
+                llm = self.llm.bind(max_tokens=CLASSIFICATION_MAX_TOKENS, stop=["\n"])
+                response = await ainvoke_limited(llm, self._build_classification_prompt(batch[0][0]))
+                tool_names: Dict[int, str] = {1: self._parse_classification_response(response.content)}
+            else:
+                llm = self.llm.bind(max_tokens=CLASSIFICATION_MAX_TOKENS * len(batch))
+                response = await ainvoke_limited(
+                    llm, self._build_batch_classification_prompt([query for query, _ in batch]))
+                tool_names = self._parse_batch_classification_response(response.content)
+            logger.debug(f"Classified batch of {len(batch)} queries")
+        except Exception as e:
+            tool_names = {}
+            error: Exception = e
+        else:
+            error = ValueError("No classification returned for the query")
+
+        for number, (_, future) in enumerate(batch, start=1):
+            # Callers that gave up have cancelled their future
+            if future.done():
+                continue
+            if number in tool_names:
+                future.set_result(tool_names[number])
+            else:
+                future.set_exception(error)
+
+    def _confident_route(self, query_lower: str) -> Optional[str]:
+        """
+        Route queries whose intent is clear from their keywords alone
+
+        Args:
+            query_lower: The lowercased user query
+
+        Returns:
+            The tool name, or None if the query needs full classification
+        """
+        if "locker" in query_lower:
+            return "locker"
+
+        # Meal or servery question that asks about opening times and nothing academic
+        if (_SERVERY_WORDS_RE.search(query_lower) and _TIME_WORDS_RE.search(query_lower)
+                and not _HANDBOOK_TERMS_RE.search(query_lower)):
+            return "servery"
+
+        # Directions, unless a program or course is mentioned
+        if (_DIRECTIONS_RE.search(query_lower)
+                and not _PROGRAM_TERMS_RE.search(query_lower)
+                and not _COMMON_COURSES_RE.search(query_lower)):
+            return "location"
+
+        return None
+
+    def _rule_based_classification(self, query: str, query_lower: Optional[str] = None) -> str:
         """
         Classify query using simple rule-based approach with improved handbook detection
 
         Args:
             query: The user query
+            query_lower: The query already lowercased, if the caller has it
 
         Returns:
             The classified tool name
         """
-        query_lower = query.lower()
-
-        # Enhanced handbook detection - check this FIRST before other classifications
-        handbook_terms = [
-            "handbook", "program", "major", "degree", "curriculum", "syllabus",
-            "course requirement", "graduation requirement", "credit", "ects",
-            "bachelor thesis", "master thesis", "phd thesis", "dissertation",
-            "module", "examination", "study plan", "schematic", "mandatory",
-            "elective", "core module", "choice module", "career module",
-            "specialization", "internship", "constructor track",
-            "curricular structure", "qualification aims", "learning outcome",
-            "prerequisite", "corequisite", "semester", "year of study",
-            "academic", "grading", "gpa", "cgpa", "assessment",
-            "what are the requirements", "how many credits", "how many modules"
-        ]
-
-        # Course-specific questions that should go to handbook
-        course_question_patterns = [
-            r"prerequisite.*for.*\w+",  # prerequisites for [course]
-            r"pre.?requisite.*for.*\w+",  # pre-requisites for [course]
-            r"requirement.*for.*\w+",  # requirements for [course]
-            r"what.*need.*for.*\w+",  # what do I need for [course]
-            r"what.*required.*for.*\w+",  # what is required for [course]
-            r"professor.*for.*\w+",  # professor for [course]
-            r"instructor.*for.*\w+",  # instructor for [course]
-            r"when.*is.*\w+.*offered",  # when is [course] offered
-            r"credits.*for.*\w+",  # credits for [course]
-            r"ects.*for.*\w+"  # ECTS for [course]
-        ]
+        if query_lower is None:
+            query_lower = query.lower()
 
         # Check for course question patterns first
-        import re
-        for pattern in course_question_patterns:
-            if re.search(pattern, query_lower):
-                logger.info(f"Matched course question pattern in query: {query}")
-                return "handbook"
-
-        # Check for presence of handbook terms
-        if any(term in query_lower for term in handbook_terms):
+        if _COURSE_QUESTION_RE.search(query_lower):
+            logger.info(f"Matched course question pattern in query: {query}")
+            return "handbook"
+
+        # Enhanced handbook detection - check this FIRST before other classifications
+        if _HANDBOOK_TERMS_RE.search(query_lower):
             logger.info(f"Matched handbook term in query: {query}")
             return "handbook"
 
-        # Check for specific program names or abbreviations
-        program_terms = [
-            "computer science", "cs", "robotics", "ris", "intelligent systems",
-            "electrical engineering", "ece", "physics", "pds", "mathematics",
-            "chemistry", "biology", "biochemistry", "bccb", "earth science",
-            "industrial engineering", "iem", "global economics", "gem",
-            "business administration", "iba", "international business",
-            "social psychology", "cognitive psychology", "iscp", "irph",
-            "international relations", "politics", "history", "sdt",
-            "software", "data", "technology", "medicinal chemistry", "mccb"
-        ]
-
-        # Keywords that suggest asking about a program or course
-        program_question_indicators = [
-            "program", "major", "study", "studying", "graduate", "graduation",
-            "requirement", "requirements", "module", "modules", "course", "courses",
-            "credit", "credits", "ects", "semester", "year", "thesis",
-            "can i", "do i need", "how to", "what is required", "what do i need",
-            "prerequisite", "pre-requisite", "professor", "instructor", "teaching"
-        ]
-
-        # Check if query mentions a program AND has a question indicator
-        has_program = any(term in query_lower for term in program_terms)
-        has_indicator = any(term in query_lower for term in program_question_indicators)
-
-        # Also check for common course names that might be asked about
-        common_courses = [
-            "operating systems", "database", "algorithms", "data structures",
-            "networks", "programming", "calculus", "linear algebra",
-            "machine learning", "artificial intelligence", "compiler",
-            "software engineering", "web development", "mobile development"
-        ]
-
-        has_course = any(course in query_lower for course in common_courses)
+        # Check if query mentions a program or common course AND has a question indicator
+        has_program = _PROGRAM_TERMS_RE.search(query_lower) is not None
+        has_indicator = _PROGRAM_QUESTION_INDICATORS_RE.search(query_lower) is not None
+        has_course = _COMMON_COURSES_RE.search(query_lower) is not None
 
         if (has_program or has_course) and has_indicator:
             logger.info(f"Query mentions program/course and has question indicator: {query}")
             return "handbook"
 
         # Check for questions that are clearly about academic programs
-        academic_patterns = [
-            r"what.*requirements.*\b(cs|computer science|robotics|engineering|business|psychology)",
-            r"how.*graduate.*from",
-            r"how many.*credits",
-            r"what.*courses.*need",
-            r"can i.*major",
-            r"requirements.*for.*\b(bachelor|master|phd)",
-            r"tell me about.*program",
-            r"information about.*\b(cs|computer science|robotics|engineering)"
-        ]
-
-        for pattern in academic_patterns:
-            if re.search(pattern, query_lower):
-                logger.info(f"Query matches academic pattern: {query}")
-                return "handbook"
+        if _ACADEMIC_PATTERN_RE.search(query_lower):
+            logger.info(f"Query matches academic pattern: {query}")
+            return "handbook"
 
         # Basic location detection
-        location_terms = ["where", "find", "location", "where is", "how do i get to", "directions"]
-        if any(term in query_lower for term in location_terms) and not has_program and not has_course:
+        if _LOCATION_TERMS_RE.search(query_lower) and not has_program and not has_course:
             return "location"
 
         # Basic locker detection
-        locker_terms = ["locker", "basement", "access"]
-        if any(term in query_lower for term in locker_terms):
+        if _LOCKER_TERMS_RE.search(query_lower):
             return "locker"
 
         # Servery detection
-        servery_terms = ["servery", "food", "meal", "eat", "dining", "breakfast", "lunch", "dinner",
-                         "coffee bar", "menu", "cafeteria"]
-        time_terms = ["hours", "time", "open", "when", "schedule"]
-        if any(term in query_lower for term in servery_terms) and any(term in query_lower for term in time_terms):
+        if _SERVERY_TERMS_RE.search(query_lower) and _TIME_TERMS_RE.search(query_lower):
             return "servery"
 
         # FAQ detection - but only if not already classified as handbook
-        faq_terms = ["how do i", "how to", "what is the", "can i", "when is"]
-        if any(query_lower.startswith(term) for term in faq_terms) and not has_program and not has_course:
+        if query_lower.startswith(_FAQ_PREFIXES) and not has_program and not has_course:
             return "faq"
 
         # Default to general QA
@@ -224,50 +481,50 @@ class ToolClassifier:
 
     def _build_classification_prompt(self, query: str) -> str:
         """Build a prompt for the LLM to classify the query"""
+        # Only the query changes between prompts; the rest is composed once in __init__
+        return self._prompt_prefix + query + self._prompt_suffix
+
+    def _build_batch_classification_prompt(self, queries: List[str]) -> str:
+        """Build a prompt for the LLM to classify several numbered queries at once"""
+        numbered_queries = "\n        ".join(f'{number}. "{query}"' for number, query in enumerate(queries, start=1))
+        return f"""{self._prompt_header}User queries:
+        {numbered_queries}
+{_BATCH_CLASSIFICATION_INSTRUCTIONS}"""
+
+    def _compose_prompt_header(self) -> str:
+        """Compose the part of the classification prompt that comes before the user query"""
         # Create a detailed prompt with examples for better classification
-        tool_descriptions = "\n\n".join([
+        tool_descriptions = "\n\n".join(
             f"Tool: {tool['name']}\nDescription: {tool['description']}"
-            for tool in self._tools
-        ])
-
-        # Add examples to help the model understand common patterns
-        examples = """
-        Examples:
-        1. "Where is the library?" → location
-        2. "How do I get my enrollment certificate?" → faq
-        3. "When are the locker hours for Krupp College?" → locker
-        4. "What's the address of the university?" → qa
-        5. "Where can I print documents?" → location
-        6. "Tell me about the semester ticket" → faq
-        7. "How to change my address in Bremen?" → faq
-        8. "What's the student emergency number?" → faq
-        9. "Where can I get food on campus?" → location
-        10. "When is breakfast served at Krupp College?" → servery
-        11. "What are the lunch hours at Mercator?" → servery
-        12. "Is the Coffee Bar open on weekends?" → servery
-        13. "Servery hours for Nordmetall" → servery
-        """
+            for tool in tool_registry.get_tool_descriptions()
+        )
 
         return f"""You are a query classifier for a university chatbot. Your task is to classify the user's query into one of the available tools based on its intent.
 
         Available tools:
         {tool_descriptions}
 
-        {examples}
-
-        User query: "{query}"
+        {_CLASSIFICATION_EXAMPLES}
 
-        Analyze the query and determine which tool is most appropriate to handle it. Respond with just the tool name and nothing else. The available tools are: location, locker, faq, qa, handbook, servery.
         """
 
+    def _parse_batch_classification_response(self, response: str) -> Dict[int, str]:
+        """Parse the LLM's response to a batch prompt into tool names keyed by query number"""
+        return {int(number): self._parse_classification_response(tool)
+                for number, tool in _BATCH_RESPONSE_LINE_RE.findall(response)}
+
     def _parse_classification_response(self, response: str) -> str:
         """Parse the LLM's response to extract the tool name"""
         # Clean the response text
         response = response.strip().lower()
 
+        # The LLM is asked for just the tool name, so most responses are one exactly;
+        # interning makes the later registry lookup an identity match
+        if response in _VALID_TOOL_SET:
+            return sys.intern(response)
+
         # Check if the response contains any of our tool names
-        valid_tools = ["location", "locker", "faq", "qa", "handbook", "servery"]
-        for tool_name in valid_tools:
+        for tool_name in _VALID_TOOLS:
             if tool_name in response:
                 return tool_name
 
@@ -275,6 +532,25 @@ class ToolClassifier:
         return "qa"
 
 
+# The classifier shared by all messages, set up once by init_classifier
+_classifier: Optional[ToolClassifier] = None
+
+
+def init_classifier(llm: Optional[ChatMistralAI]) -> ToolClassifier:
+    """
+    Create the shared tool classifier
+
+    Args:
+        llm: The LLM used for classification, or None to use rules only
+
+    Returns:
+        The new classifier
+    """
+    global _classifier
+    _classifier = ToolClassifier(llm)
+    return _classifier
+
+
 async def get_appropriate_tool(update: Update, context: ContextTypes.DEFAULT_TYPE, query: str):
     """
     Determine the appropriate tool to handle a user query using AI
@@ -287,19 +563,13 @@ async def get_appropriate_tool(update: Update, context: ContextTypes.DEFAULT_TYP
     Returns:
         The appropriate Tool object to handle the query
     """
-    # Initialize the classifier if it doesn't exist in bot_data
-    if "tool_classifier" not in context.bot_data:
-        llm = None
-        if "llm" in context.bot_data:
-            llm = context.bot_data["llm"]
-        context.bot_data["tool_classifier"] = ToolClassifier(llm)
+    # The classifier is set up at startup, or here on first use if that didn't happen
+    classifier = _classifier or init_classifier(context.bot_data.get("llm"))
 
     # Classify the query
-    classifier = context.bot_data["tool_classifier"]
     tool_name = await classifier.classify_query(query, context, update)
 
     # Get the appropriate tool from the registry
-    from uni_ai_chatbot.tools.tools_architecture import tool_registry
     tool = tool_registry.get_tool_by_name(tool_name)
 
     # If no tool found, default to QA
@@ -1,20 +1,99 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict, Optional
+from typing import Any, Callable, List, Dict, Optional, Tuple
 from telegram import Update
 from telegram.ext import ContextTypes
 import logging
+import sys
 
 from uni_ai_chatbot.utils.utils import handle_error
+from uni_ai_chatbot.utils.concurrency import ainvoke_limited
+from uni_ai_chatbot.utils.cache import LRUCache, normalize_query
+from uni_ai_chatbot.utils.semantic_cache import SemanticCache
+from uni_ai_chatbot.configurations.config import QA_CACHE_SIZE, QA_SEMANTIC_CACHE_SIZE, QA_SEMANTIC_CACHE_THRESHOLD
+from uni_ai_chatbot.bot.location_handlers import handle_location_with_ai
+from uni_ai_chatbot.services.faq_service import handle_faq_query
+from uni_ai_chatbot.services.handbook_service import handle_handbook_query
+from uni_ai_chatbot.services.locker_service import handle_locker_hours
+from uni_ai_chatbot.services.servery_service import handle_servery_hours
 
 logger = logging.getLogger(__name__)
 
 
+# How a source document of each type is named in the list of sources, or None if it can't be
+_SOURCE_LABELS: Dict[str, Callable[[Dict[str, Any]], Optional[str]]] = {
+    'faq': lambda metadata: metadata.get('question'),
+    'location': lambda metadata: metadata.get('name'),
+    'locker': lambda metadata: (f"{metadata['college']} ({metadata['day']})"
+                                if 'college' in metadata and 'day' in metadata else None),
+}
+
+
+async def _embed_query(context: ContextTypes.DEFAULT_TYPE, query: str) -> Optional[List[float]]:
+    """
+    Embed a query for the semantic answer cache
+
+    Args:
+        context: Telegram context holding the embeddings model
+        query: The user's text query
+
+    Returns:
+        The query embedding, or None if there is no embeddings model or embedding failed
+    """
+    embeddings = context.bot_data.get("embeddings")
+    if embeddings is None:
+        return None
+    try:
+        return await embeddings.aembed_query(query)
+    except Exception as e:
+        logger.warning(f"Could not embed query for the semantic cache: {e}")
+        return None
+
+
+def _group_sources(documents: List[Any], limit: int) -> Dict[str, List[str]]:
+    """
+    Get the first distinct source labels of each type, in their original order
+
+    Args:
+        documents: Source documents in order of relevance
+        limit: Maximum number of labels per type
+
+    Returns:
+        Up to limit distinct labels for each type in _SOURCE_LABELS
+    """
+    source_groups: Dict[str, List[str]] = {doc_type: [] for doc_type in _SOURCE_LABELS}
+    open_types: int = len(source_groups)
+
+    for doc in documents:
+        doc_type: Optional[str] = doc.metadata.get('type')
+        labels: Optional[List[str]] = source_groups.get(doc_type)
+        if labels is None or len(labels) == limit:
+            continue
+        label: Optional[str] = _SOURCE_LABELS[doc_type](doc.metadata)
+        if label is not None and label not in labels:
+            labels.append(label)
+            # Stop once every type has all the labels it can show
+            if len(labels) == limit:
+                open_types -= 1
+                if not open_types:
+                    break
+
+    return source_groups
+
+
 class Tool(ABC):
     """Base abstract class for all tools in the chatbot"""
 
+    # Tools hold no per-instance state beyond these, so subclasses declare empty slots too
+    __slots__ = ("name", "description", "_tool_description")
+
     def __init__(self, name: str, description: str) -> None:
-        self.name: str = name
+        # Interned, so looking the tool up by an interned name compares by identity
+        self.name: str = sys.intern(name)
         self.description: str = description
+        self._tool_description: Dict[str, str] = {
+            "name": name,
+            "description": description
+        }
 
     @abstractmethod
     async def handle(self, update: Update, context: ContextTypes.DEFAULT_TYPE, query: str) -> None:
@@ -30,15 +109,14 @@ class Tool(ABC):
 
     def get_tool_description(self) -> Dict[str, str]:
         """Get description of this tool for classification purposes"""
-        return {
-            "name": self.name,
-            "description": self.description
-        }
+        return self._tool_description
 
 
 class LockerTool(Tool):
     """Tool for handling locker-related queries"""
 
+    __slots__ = ()
+
     def __init__(self) -> None:
         super().__init__(
             name="locker",
@@ -49,13 +127,14 @@ class LockerTool(Tool):
 
     async def handle(self, update: Update, context: ContextTypes.DEFAULT_TYPE, query: str) -> None:
         """Process a locker-related query"""
-        from uni_ai_chatbot.services.locker_service import handle_locker_hours
         await handle_locker_hours(update, context)
 
 
 class LocationTool(Tool):
     """Tool for handling location and navigation queries"""
 
+    __slots__ = ()
+
     def __init__(self) -> None:
         super().__init__(
             name="location",
@@ -66,13 +145,14 @@ class LocationTool(Tool):
 
     async def handle(self, update: Update, context: ContextTypes.DEFAULT_TYPE, query: str) -> None:
         """Process a location-related query"""
-        from uni_ai_chatbot.bot.location_handlers import handle_location_with_ai
         await handle_location_with_ai(update, context, query)
 
 
 class QATool(Tool):
     """Tool for handling general Q&A about university information"""
 
+    __slots__ = ()
+
     def __init__(self) -> None:
         super().__init__(
             name="qa",
@@ -84,51 +164,60 @@ class QATool(Tool):
     async def handle(self, update: Update, context: ContextTypes.DEFAULT_TYPE, query: str) -> None:
         """Process a general question about the university with improved context"""
         qa_chain = context.bot_data["qa_chain"]
+        if "qa_answer_cache" not in context.bot_data:
+            context.bot_data["qa_answer_cache"] = LRUCache(QA_CACHE_SIZE)
+        answer_cache: LRUCache = context.bot_data["qa_answer_cache"]
+        if "qa_semantic_cache" not in context.bot_data:
+            context.bot_data["qa_semantic_cache"] = SemanticCache(QA_SEMANTIC_CACHE_SIZE, QA_SEMANTIC_CACHE_THRESHOLD)
+        semantic_cache: SemanticCache = context.bot_data["qa_semantic_cache"]
+        cache_key: str = normalize_query(query)
+
         try:
+            # Repeated questions are answered from the cache without another LLM round trip
+            cached_result: Optional[str] = answer_cache.get(cache_key)
+            if cached_result is not None:
+                await update.message.reply_text(cached_result, parse_mode="Markdown")
+                return
+
+            # So are rephrasings of earlier questions. The retriever embeds the same text,
+            # which the query embedding cache then answers without another request
+            query_vector: Optional[List[float]] = await _embed_query(context, query)
+            if query_vector is not None:
+                cached_result = semantic_cache.get(query_vector)
+                if cached_result is not None:
+                    answer_cache.put(cache_key, cached_result)
+                    await update.message.reply_text(cached_result, parse_mode="Markdown")
+                    return
+
             # Send typing indicator to improve UX
             await context.bot.send_chat_action(chat_id=update.effective_chat.id, action="typing")
 
-            # Invoke the QA chain
-            response = qa_chain.invoke(query)
+            # Invoke the QA chain without blocking the event loop
+            response = await ainvoke_limited(qa_chain, query)
             result: str = response['result']
 
             # Enhance response with source information when available
             if 'source_documents' in response and response['source_documents']:
-                # Group sources by type for better organization
-                source_groups: Dict[str, List[str]] = {
-                    'faq': [],
-                    'location': [],
-                    'locker': []
-                }
-
-                for doc in response['source_documents']:
-                    if 'type' in doc.metadata:
-                        doc_type: str = doc.metadata['type']
-                        if doc_type == 'faq' and 'question' in doc.metadata:
-                            source_groups['faq'].append(doc.metadata['question'])
-                        elif doc_type == 'location' and 'name' in doc.metadata:
-                            source_groups['location'].append(doc.metadata['name'])
-                        elif doc_type == 'locker' and 'college' in doc.metadata:
-                            source_groups['locker'].append(
-                                f"{doc.metadata['college']} ({doc.metadata['day']})")
+                # Group sources by type for better organization, limited to 3 unique sources each
+                source_groups: Dict[str, List[str]] = _group_sources(response['source_documents'], 3)
 
                 # Add sourced information if available
                 sources_text: List[str] = []
                 if source_groups['faq']:
-                    unique_faqs: List[str] = list(set(source_groups['faq']))[:3]  # Limit to 3 unique sources
-                    sources_text.append("*Relevant FAQs:* " + ", ".join(unique_faqs))
+                    sources_text.append("*Relevant FAQs:* " + ", ".join(source_groups['faq']))
 
                 if source_groups['location']:
-                    unique_locations: List[str] = list(set(source_groups['location']))[:3]
-                    sources_text.append("*Relevant Locations:* " + ", ".join(unique_locations))
+                    sources_text.append("*Relevant Locations:* " + ", ".join(source_groups['location']))
 
                 if source_groups['locker']:
-                    unique_lockers: List[str] = list(set(source_groups['locker']))[:3]
-                    sources_text.append("*Relevant Locker Info:* " + ", ".join(unique_lockers))
+                    sources_text.append("*Relevant Locker Info:* " + ", ".join(source_groups['locker']))
 
                 if sources_text:
                     result += "\n\n" + "\n".join(sources_text)
 
+            answer_cache.put(cache_key, result)
+            if query_vector is not None:
+                semantic_cache.put(query_vector, result)
             await update.message.reply_text(result, parse_mode="Markdown")
 
         except Exception as e:
@@ -143,6 +232,8 @@ class QATool(Tool):
 class FAQTool(Tool):
     """Tool for handling FAQ-related queries"""
 
+    __slots__ = ()
+
     def __init__(self) -> None:
         super().__init__(
             name="faq",
@@ -154,7 +245,6 @@ class FAQTool(Tool):
 
     async def handle(self, update: Update, context: ContextTypes.DEFAULT_TYPE, query: str) -> None:
         """Process a FAQ-related query"""
-        from uni_ai_chatbot.services.faq_service import handle_faq_query
         await handle_faq_query(update, context, query)
 
 
@@ -163,30 +253,37 @@ class ToolRegistry:
 
     def __init__(self) -> None:
         self.tools: List[Tool] = []
+        # Tools by name; the first tool registered under a name wins
+        self._tools_by_name: Dict[str, Tool] = {}
+        # Built on first request, since tools are all registered at import time
+        self._tool_descriptions: Optional[Tuple[Dict[str, str], ...]] = None
 
     def register_tool(self, tool: Tool) -> None:
         """Register a new tool"""
         self.tools.append(tool)
+        self._tools_by_name.setdefault(tool.name, tool)
+        self._tool_descriptions = None
 
     def get_tool_by_name(self, name: str) -> Optional[Tool]:
         """Get a tool by its name"""
-        for tool in self.tools:
-            if tool.name == name:
-                return tool
-        return None
+        return self._tools_by_name.get(name)
 
     def get_all_tools(self) -> List[Tool]:
         """Get all registered tools"""
         return self.tools
 
-    def get_tool_descriptions(self) -> List[Dict[str, str]]:
+    def get_tool_descriptions(self) -> Tuple[Dict[str, str], ...]:
         """Get descriptions of all tools for the classifier"""
-        return [tool.get_tool_description() for tool in self.tools]
+        if self._tool_descriptions is None:
+            self._tool_descriptions = tuple(tool.get_tool_description() for tool in self.tools)
+        return self._tool_descriptions
 
 
 class HandbookTool(Tool):
     """Tool for handling handbook and major-related queries"""
 
+    __slots__ = ()
+
     def __init__(self) -> None:
         super().__init__(
             name="handbook",
@@ -197,13 +294,14 @@ class HandbookTool(Tool):
 
     async def handle(self, update: Update, context: ContextTypes.DEFAULT_TYPE, query: str) -> None:
         """Process a handbook-related query"""
-        from uni_ai_chatbot.services.handbook_service import handle_handbook_query
         await handle_handbook_query(update, context, query)
 
 
 class ServeryTool(Tool):
     """Tool for handling servery hours queries"""
 
+    __slots__ = ()
+
     def __init__(self) -> None:
         super().__init__(
             name="servery",
@@ -213,13 +311,14 @@ class ServeryTool(Tool):
 
     async def handle(self, update: Update, context: ContextTypes.DEFAULT_TYPE, query: str) -> None:
         """Process a servery-related query"""
-        from uni_ai_chatbot.services.servery_service import handle_servery_hours
         await handle_servery_hours(update, context, query)
 
 
 class NonUniversityTool(Tool):
     """Tool for handling non-university related queries"""
 
+    __slots__ = ()
+
     def __init__(self) -> None:
         super().__init__(
             name="non_university",
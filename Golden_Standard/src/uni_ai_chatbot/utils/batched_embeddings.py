@@ -0,0 +1,88 @@
+import asyncio
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import List, Tuple
+from langchain_core.embeddings import Embeddings
+
+from uni_ai_chatbot.configurations.config import EMBEDDING_BATCH_WINDOW, EMBEDDING_MAX_BATCH_SIZE, \
+    QUERY_EMBEDDING_CACHE_SIZE
+from uni_ai_chatbot.utils.cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+
+class BatchedEmbeddings(Embeddings):
+    """
+    Embeddings wrapper that coalesces concurrent embed_query calls into a single embed_documents request.
+    Queries arriving within the batch window are sent together, up to the maximum batch size.
+    Recently embedded query texts are answered from an in-memory LRU cache without a request.
+    """
+
+    def __init__(self, embeddings: Embeddings,
+                 batch_window: float = EMBEDDING_BATCH_WINDOW,
+                 max_batch_size: int = EMBEDDING_MAX_BATCH_SIZE,
+                 cache_size: int = QUERY_EMBEDDING_CACHE_SIZE) -> None:
+        self.embeddings: Embeddings = embeddings
+        self.batch_window: float = batch_window
+        self.max_batch_size: int = max_batch_size
+        self._cache: LRUCache = LRUCache(cache_size)
+        # Callers and the worker thread share the cache
+        self._cache_lock: threading.Lock = threading.Lock()
+        self._pending: "queue.Queue[Tuple[str, Future]]" = queue.Queue()
+        self._worker: threading.Thread = threading.Thread(target=self._run, name="embedding-batcher", daemon=True)
+        self._worker.start()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Document embedding is already batched, so pass it straight through"""
+        return self.embeddings.embed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        """Queue the query for the next batch and wait for its embedding"""
+        return self._submit(text).result()
+
+    async def aembed_query(self, text: str) -> List[float]:
+        """Queue the query for the next batch without blocking the event loop"""
+        return await asyncio.wrap_future(self._submit(text))
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        return await self.embeddings.aembed_documents(texts)
+
+    def _submit(self, text: str) -> Future:
+        future: Future = Future()
+        with self._cache_lock:
+            vector = self._cache.get(text)
+        if vector is not None:
+            future.set_result(vector)
+            return future
+
+        self._pending.put((text, future))
+        return future
+
+    def _run(self) -> None:
+        """Worker loop: collect queries for one batch window and embed them together"""
+        while True:
+            batch = [self._pending.get()]
+            deadline = time.monotonic() + self.batch_window
+            try:
+                while len(batch) < self.max_batch_size:
+                    batch.append(self._pending.get(timeout=max(0.0, deadline - time.monotonic())))
+            except queue.Empty:
+                pass
+
+            try:
+                vectors = self.embeddings.embed_documents([text for text, _ in batch])
+                # zip would stop at the shorter list and leave the remaining callers waiting forever
+                if len(vectors) != len(batch):
+                    raise ValueError(f"Got {len(vectors)} embeddings for a batch of {len(batch)} queries")
+                logger.debug(f"Embedded batch of {len(batch)} queries")
+                with self._cache_lock:
+                    for (text, _), vector in zip(batch, vectors):
+                        self._cache.put(text, vector)
+                for (_, future), vector in zip(batch, vectors):
+                    future.set_result(vector)
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
@@ -0,0 +1,115 @@
+from typing import Any, Dict, List, Optional, Tuple
+
+from rapidfuzz.distance import Levenshtein
+
+
+class BKTree:
+    """
+    Burkhard-Keller tree over strings keyed by Levenshtein distance
+
+    A search for terms within distance e of a query only descends into children
+    whose edge distance i satisfies |d(node, query) - e| <= i <= d(node, query) + e,
+    so most of the tree is skipped for small distances.
+    """
+
+    def __init__(self) -> None:
+        # Each node is [term, value, {edge distance: child node}]
+        self._root: Optional[list] = None
+        # Indexed terms for the exact-match fast path
+        self._values: Dict[str, Any] = {}
+
+    def insert(self, term: str, value: Any = None) -> None:
+        """
+        Add a term to the tree, keeping the first value stored for a duplicate term
+
+        Args:
+            term: The string to index
+            value: Value returned with the term on search
+        """
+        if term in self._values:
+            return
+        self._values[term] = value
+
+        if self._root is None:
+            self._root = [term, value, {}]
+            return
+
+        node = self._root
+        while True:
+            distance: int = Levenshtein.distance(term, node[0])
+            child = node[2].get(distance)
+            if child is None:
+                node[2][distance] = [term, value, {}]
+                return
+            node = child
+
+    def search(self, query: str, max_distance: int) -> List[Tuple[int, str, Any]]:
+        """
+        Find all terms within max_distance edits of the query
+
+        Args:
+            query: The string to look up
+            max_distance: Largest Levenshtein distance to accept
+
+        Returns:
+            List of (distance, term, value) tuples sorted by distance
+        """
+        results: List[Tuple[int, str, Any]] = []
+        if self._root is None:
+            return results
+
+        stack: List[list] = [self._root]
+        while stack:
+            term, value, children = stack.pop()
+            distance: int = Levenshtein.distance(query, term)
+            if distance <= max_distance:
+                results.append((distance, term, value))
+
+            low: int = distance - max_distance
+            high: int = distance + max_distance
+            for edge, child in children.items():
+                if low <= edge <= high:
+                    stack.append(child)
+
+        results.sort(key=lambda result: result[0])
+        return results
+
+    def closest(self, query: str, max_distance: int) -> Optional[Tuple[str, Any]]:
+        """
+        Find the nearest term within max_distance edits of the query
+
+        Args:
+            query: The string to look up
+            max_distance: Largest Levenshtein distance to accept
+
+        Returns:
+            (term, value) of the closest match, or None if nothing is close enough
+        """
+        # Exact hits are the common case and need no distance computations
+        if query in self._values:
+            return query, self._values[query]
+
+        results = self.search(query, max_distance)
+        if not results:
+            return None
+        _, term, value = results[0]
+        return term, value
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+
+def build_bk_tree(entries: Dict[str, Any]) -> BKTree:
+    """
+    Build a BK-tree from a mapping of terms to values
+
+    Args:
+        entries: Terms to index mapped to the value returned for each
+
+    Returns:
+        The populated tree
+    """
+    tree = BKTree()
+    for term, value in entries.items():
+        tree.insert(term, value)
+    return tree
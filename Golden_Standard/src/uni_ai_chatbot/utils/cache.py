@@ -0,0 +1,54 @@
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+def normalize_query(query: str) -> str:
+    """
+    Normalize a user query for use as a cache key
+
+    Args:
+        query: The user's input text
+
+    Returns:
+        The query lowercased with whitespace collapsed
+    """
+    return " ".join(query.lower().split())
+
+
+class LRUCache:
+    """A bounded mapping that evicts the least recently used entry once full"""
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize: int = maxsize
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Get a cached value and mark it as recently used
+
+        Args:
+            key: The cache key
+
+        Returns:
+            The cached value, or None if the key is not cached
+        """
+        if key not in self._data:
+            return None
+        self._data.move_to_end(key)
+        return self._data[key]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """
+        Store a value, evicting the least recently used entry if the cache is full
+
+        Args:
+            key: The cache key
+            value: The value to cache
+        """
+        self._data[key] = value
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._data)
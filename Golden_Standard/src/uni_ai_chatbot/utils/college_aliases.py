@@ -0,0 +1,74 @@
+import re
+from typing import Dict, List, Optional, Tuple
+
+# College aliases dictionary for reuse
+COLLEGE_ALIASES = {
+    # Krupp
+    "krupp": "Krupp College",
+    "krupp college": "Krupp College",
+
+    # College III
+    "college iii": "College III",
+    "college 3": "College III",
+    "c3": "College III",
+
+    # Nordmetall
+    "nordmetall": "Nordmetall College",
+    "nordmetall college": "Nordmetall College",
+    "nord": "Nordmetall College",
+
+    # Mercator
+    "mercator": "Mercator College",
+    "mercator college": "Mercator College",
+}
+
+
+class AliasMatcher:
+    """
+    Finds which place a text mentions by its aliases: the most specific whole alias in the
+    text wins, and failing that, a single word of an alias, preferring the earliest alias
+    """
+
+    def __init__(self, aliases: Dict[str, str]) -> None:
+        self._aliases: Dict[str, str] = aliases
+
+        # Individual alias words for partial matching, mapped to (alias position, place)
+        # so earlier aliases win ties
+        self._tokens: Dict[str, Tuple[int, str]] = {}
+        for position, (alias, real) in enumerate(aliases.items()):
+            for token in alias.split():
+                self._tokens.setdefault(token, (position, real))
+
+        # Aliases ordered longest first so the most specific alias in the text wins
+        aliases_sorted: List[Tuple[str, str]] = sorted(aliases.items(), key=lambda item: -len(item[0]))
+
+        # All aliases as one alternation so the text is scanned once; the rank of each alias in
+        # the longest-first order decides between several aliases found in the same text. The
+        # lookahead reports the longest alias starting at every position, so an alias overlapping
+        # an earlier match is still seen, as with one substring check per alias
+        self._pattern = re.compile("(?=(" + "|".join(re.escape(alias) for alias, _ in aliases_sorted) + "))")
+        self._rank: Dict[str, int] = {alias: rank for rank, (alias, _) in enumerate(aliases_sorted)}
+
+    def find(self, text: str) -> Optional[str]:
+        """
+        Find the place mentioned in text
+
+        Args:
+            text: Text to search in
+
+        Returns:
+            The place's name, or None if no alias is mentioned
+        """
+        text_lower = text.lower()
+
+        # First try exact matches
+        found = self._pattern.findall(text_lower)
+        if found:
+            return self._aliases[min(found, key=self._rank.__getitem__)]
+
+        # Then try partial matches on single alias words, preferring the earliest alias
+        matches = [self._tokens[word] for word in set(text_lower.split()) if word in self._tokens]
+        if matches:
+            return min(matches)[1]
+
+        return None
@@ -0,0 +1,24 @@
+import asyncio
+from typing import Any
+from langchain_core.runnables import Runnable
+
+from uni_ai_chatbot.configurations.config import LLM_MAX_CONCURRENCY
+
+# Bounds concurrent LLM requests so bursts queue here instead of hitting provider rate limits
+# and retry backoff. Query embeddings are already serialized by BatchedEmbeddings.
+_LLM_SEMAPHORE = asyncio.Semaphore(LLM_MAX_CONCURRENCY)
+
+
+async def ainvoke_limited(runnable: Runnable, input: Any) -> Any:
+    """
+    Invoke an LLM or chain asynchronously, waiting for a free slot in the shared LLM limiter
+
+    Args:
+        runnable: The LLM or chain to invoke
+        input: The input passed to ainvoke
+
+    Returns:
+        The runnable's output
+    """
+    async with _LLM_SEMAPHORE:
+        return await runnable.ainvoke(input)
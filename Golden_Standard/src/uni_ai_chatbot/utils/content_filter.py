@@ -1,6 +1,10 @@
 import re
+from functools import lru_cache
 from typing import Tuple, List
-from uni_ai_chatbot.services.handbook_service import MAJOR_ABBREVIATIONS
+
+from uni_ai_chatbot.configurations.config import CONTENT_FILTER_CACHE_SIZE, CONTENT_FILTER_MAX_QUERY_LENGTH
+from uni_ai_chatbot.services.handbook_service import MAJOR_ABBREVIATIONS, SINGLE_WORD_MAJOR_ABBREVIATIONS, \
+    MULTI_WORD_MAJOR_ABBREVIATIONS
 
 # List of university-related keywords
 UNIVERSITY_KEYWORDS = [
@@ -119,10 +123,167 @@ UNIVERSITY_LOCATIONS = [
     "entrance", "door", "window", "roof", "floor", "wall", "ceiling", "foundation", "basement"
 ]
 
+# The lists above repeat entries across their categories; keep each once, in first-seen order
+UNIVERSITY_KEYWORDS = list(dict.fromkeys(UNIVERSITY_KEYWORDS))
+UNIVERSITY_LOCATIONS = list(dict.fromkeys(UNIVERSITY_LOCATIONS))
+
+# Keywords and locations in one alternation, with a named group per list, so a query is
+# scanned once for both rather than once per entry
+UNIVERSITY_TERMS_PATTERN = re.compile(
+    "(?P<keyword>" + "|".join(re.escape(keyword.lower()) for keyword in UNIVERSITY_KEYWORDS) + ")"
+    "|(?P<location>" + "|".join(re.escape(location.lower()) for location in UNIVERSITY_LOCATIONS) + ")"
+)
+
+# Teaching/professor query patterns, always university-related
+TEACHING_PATTERNS: List[str] = [
+    r"who (teaches|is teaching|taught)",
+    r"who (is|are) the (professor|instructor|teacher)",
+    r"professor for",
+    r"instructor for",
+    r"teacher for",
+    r"taught by",
+    r"teaching assistant",
+    r"when is .* taught",
+    r"who gives",
+    r"who offers"
+]
+
+# All teaching patterns in one alternation, so a query is scanned once
+TEACHING_PATTERN = re.compile("|".join(f"(?:{pattern})" for pattern in TEACHING_PATTERNS))
+
+# Educational question indicators
+EDUCATION_QUESTION_PATTERNS: List[str] = [
+    r"how (do|can|to) (i|we|you) (get|find|access|use|register|sign up|apply)",
+    r"where (is|are|can i find) .{3,}",
+    r"what (is|are) .{3,} (hour|time|schedule|deadline|requirement|policy|procedure)",
+    r"when (is|are|does|do) .{3,} (open|close|start|end|begin|finish|due|happen|taught|offered)",
+    r"who (is|are|do i) .{3,} (contact|talk to|ask|professor|teacher|instructor|teaches|teaching)",
+    r"do (i|we|you) need .{3,} (to|for)",
+    r"can (i|we|you) .{3,} (get|find|access|use|register|sign up|apply|take|enroll)",
+    # Specific patterns for prerequisites and requirements
+    r"what.*(prerequisite|pre-requisite|requirement).*for",
+    r"prerequisite.*for",
+    r"requirement.*for",
+    r"do i need.*before",
+    r"what.*need.*before",
+    r"required.*for",
+    # Teaching-related patterns
+    r"who.*teach",
+    r"taught by",
+    r"professor.*for",
+    r"instructor.*for"
+]
+
+# All educational question patterns in one alternation, so a query is scanned once
+EDUCATION_QUESTION_PATTERN = re.compile("|".join(f"(?:{pattern})" for pattern in EDUCATION_QUESTION_PATTERNS))
+
+# Words that indicate the query is about academic matters
+ACADEMIC_CONTEXT_WORDS: List[str] = [
+    "prerequisite", "pre-requisite", "requirement", "required",
+    "course", "class", "module", "program", "credit", "ects",
+    "professor", "instructor", "exam", "assignment", "syllabus",
+    "teaches", "teaching", "taught", "lecture", "tutorial",
+    "enrollment", "enroll", "register", "registration",
+    "grade", "grading", "assessment", "evaluation",
+    "homework", "project", "thesis", "dissertation"
+]
+
+# Common course/subject names that might appear in queries
+# Extended list to be more inclusive
+POTENTIAL_COURSE_NAMES: List[str] = [
+    # Computer Science courses
+    "operating systems", "database", "databases", "algorithms", "data structures",
+    "networks", "networking", "programming", "software", "hardware",
+    "compiler", "compilers", "architecture", "security", "cryptography",
+    "machine learning", "artificial intelligence", "ai", "ml", "robotics",
+    "web development", "mobile development", "cloud computing",
+    "distributed systems", "parallel computing", "computer graphics",
+    "human computer interaction", "hci", "software engineering",
+
+    # Math courses
+    "mathematics", "calculus", "algebra", "statistics", "probability",
+    "discrete math", "linear algebra", "differential equations",
+    "numerical methods", "optimization", "geometry",
+
+    # Science courses
+    "physics", "chemistry", "biology", "biochemistry", "biophysics",
+    "mechanics", "thermodynamics", "electromagnetics", "quantum",
+    "organic chemistry", "inorganic chemistry", "analytical chemistry",
+
+    # Engineering courses
+    "engineering", "circuits", "electronics", "signals", "systems",
+    "control systems", "power systems", "communications",
+    "materials", "statics", "dynamics", "fluids",
+
+    # Business/Social Science courses
+    "economics", "microeconomics", "macroeconomics", "finance",
+    "accounting", "marketing", "management", "psychology",
+    "sociology", "anthropology", "political science",
+
+    # Other academic subjects
+    "english", "writing", "literature", "history", "philosophy",
+    "ethics", "languages", "german", "spanish", "french"
+]
+
+# The academic context words and course names as one alternation each
+ACADEMIC_CONTEXT_PATTERN = re.compile("|".join(re.escape(word) for word in ACADEMIC_CONTEXT_WORDS))
+POTENTIAL_COURSE_NAMES_PATTERN = re.compile("|".join(re.escape(course) for course in POTENTIAL_COURSE_NAMES))
+
+# Words a question may start with
+QUESTION_WORDS: Tuple[str, ...] = ("who", "what", "when", "where", "how", "why", "which", "can", "do", "does", "is", "are")
+
+# Position of each program abbreviation, so the first listed one is reported
+MAJOR_ABBREVIATION_RANK = {abbr: rank for rank, abbr in enumerate(MAJOR_ABBREVIATIONS)}
+
+# Multi-word abbreviations padded with spaces, so they match only as whole words of a padded query
+PADDED_MULTI_WORD_ABBREVIATIONS: Tuple[Tuple[str, str], ...] = tuple(
+    (f" {abbr} ", abbr) for abbr in MULTI_WORD_MAJOR_ABBREVIATIONS)
+
+# Full program names by their lowercase form, and all of them as one alternation
+MAJOR_NAMES = {name.lower(): name for name in MAJOR_ABBREVIATIONS.values()}
+MAJOR_NAMES_PATTERN = re.compile("|".join(re.escape(name) for name in MAJOR_NAMES))
+
+# Academic terms, matched as whole space-separated words
+ACADEMIC_TERMS: List[str] = [
+    "grade", "course", "class", "exam", "test", "quiz", "homework", "assignment",
+    "project", "paper", "thesis", "dissertation", "research", "study", "graduation",
+    "degree", "major", "minor", "concentration", "specialization", "program",
+    "curriculum", "syllabus", "credit", "unit", "hour", "semester", "term", "quarter",
+    "year", "session", "lecture", "tutorial", "lab", "seminar", "workshop", "studio",
+    "practicum", "internship", "coop", "placement", "fieldwork", "clinical", "residency",
+    "prerequisite", "prerequisites", "pre-requisite", "pre-requisites",
+    "corequisite", "co-requisite", "requirement", "requirements",
+    "professor", "instructor", "teacher", "lecturer", "teaching"
+]
+# Only terms the earlier substring checks can't already match; if one of those terms is a
+# word of the query, the academic context or university term check has accepted it before
+ACADEMIC_TERM_SET = frozenset(term for term in ACADEMIC_TERMS
+                              if not ACADEMIC_CONTEXT_PATTERN.search(term)
+                              and not UNIVERSITY_TERMS_PATTERN.search(term))
+
+# Final catch-all for anything being taught/offered/given
+TEACHING_TERMS_PATTERN = re.compile(r"(taught|offered|given|teaches|teaching|professor|instructor)")
+
+# Length of the shortest text any check above can match: the keyword, location and
+# abbreviation lists hold the shortest entries, every pattern and other list needs more
+SHORTEST_UNIVERSITY_TERM = min(len(term) for terms in (UNIVERSITY_KEYWORDS, UNIVERSITY_LOCATIONS,
+                                                       MAJOR_ABBREVIATIONS) for term in terms)
+
+
+# Results with a fixed reason, shared by every call that returns them
+_EMPTY_QUERY: Tuple[bool, str] = (False, "Empty query")
+_QUERY_TOO_SHORT: Tuple[bool, str] = (False, "Query too short to classify")
+_TEACHING_QUERY: Tuple[bool, str] = (True, "Contains teaching/professor query pattern")
+_ACADEMIC_QUERY: Tuple[bool, str] = (True, "Contains academic context or course-related question")
+_EDUCATIONAL_QUESTION: Tuple[bool, str] = (True, "Contains educational question pattern")
+_TEACHING_TERMS: Tuple[bool, str] = (True, "Contains teaching-related terms")
+_NO_MATCH: Tuple[bool, str] = (False, "No university-related keywords or patterns detected")
+
 
 def is_university_related(query: str) -> Tuple[bool, str]:
     """
     Check if a query is related to university topics.
+    Results for recently checked texts are cached, since the check only depends on the lowercase text.
 
     Args:
         query: User query string
@@ -131,159 +292,69 @@ def is_university_related(query: str) -> Tuple[bool, str]:
         Tuple of (is_relevant, reason)
     """
     if not query:
-        return False, "Empty query"
+        return _EMPTY_QUERY
+
+    # Convert to lowercase for case-insensitive matching, so texts differing only in case share a
+    # cache entry
+    return _is_university_related_lower(query.lower())
+
 
-    # Convert to lowercase for case-insensitive matching
-    query_lower = query.lower()
+@lru_cache(maxsize=CONTENT_FILTER_CACHE_SIZE)
+def _is_university_related_lower(query_lower: str) -> Tuple[bool, str]:
+    """Result of is_university_related for a non-empty lowercase query"""
+    if len(query_lower) < SHORTEST_UNIVERSITY_TERM:
+        return _QUERY_TOO_SHORT
+
+    # The patterns with open-ended gaps (".*") take time growing faster than linearly with the
+    # text, so they only search the start of a very long message; the other checks see all of it
+    query_start = query_lower[:CONTENT_FILTER_MAX_QUERY_LENGTH]
 
     # PRIORITY CHECK: Teaching/Professor queries are ALWAYS university-related
-    teaching_patterns = [
-        r"who (teaches|is teaching|taught)",
-        r"who (is|are) the (professor|instructor|teacher)",
-        r"professor for",
-        r"instructor for",
-        r"teacher for",
-        r"taught by",
-        r"teaching assistant",
-        r"when is .* taught",
-        r"who gives",
-        r"who offers"
-    ]
-
-    for pattern in teaching_patterns:
-        if re.search(pattern, query_lower):
-            return True, "Contains teaching/professor query pattern"
+    if TEACHING_PATTERN.search(query_start):
+        return _TEACHING_QUERY
 
     # SPECIAL CASE: Academic queries about potential courses
-    # These words indicate the query is about academic matters
-    academic_context_words = [
-        "prerequisite", "pre-requisite", "requirement", "required",
-        "course", "class", "module", "program", "credit", "ects",
-        "professor", "instructor", "exam", "assignment", "syllabus",
-        "teaches", "teaching", "taught", "lecture", "tutorial",
-        "enrollment", "enroll", "register", "registration",
-        "grade", "grading", "assessment", "evaluation",
-        "homework", "project", "thesis", "dissertation"
-    ]
-
-    # Common course/subject names that might appear in queries
-    # Extended list to be more inclusive
-    potential_course_names = [
-        # Computer Science courses
-        "operating systems", "database", "databases", "algorithms", "data structures",
-        "networks", "networking", "programming", "software", "hardware",
-        "compiler", "compilers", "architecture", "security", "cryptography",
-        "machine learning", "artificial intelligence", "ai", "ml", "robotics",
-        "web development", "mobile development", "cloud computing",
-        "distributed systems", "parallel computing", "computer graphics",
-        "human computer interaction", "hci", "software engineering",
-
-        # Math courses
-        "mathematics", "calculus", "algebra", "statistics", "probability",
-        "discrete math", "linear algebra", "differential equations",
-        "numerical methods", "optimization", "geometry",
-
-        # Science courses
-        "physics", "chemistry", "biology", "biochemistry", "biophysics",
-        "mechanics", "thermodynamics", "electromagnetics", "quantum",
-        "organic chemistry", "inorganic chemistry", "analytical chemistry",
-
-        # Engineering courses
-        "engineering", "circuits", "electronics", "signals", "systems",
-        "control systems", "power systems", "communications",
-        "materials", "statics", "dynamics", "fluids",
-
-        # Business/Social Science courses
-        "economics", "microeconomics", "macroeconomics", "finance",
-        "accounting", "marketing", "management", "psychology",
-        "sociology", "anthropology", "political science",
-
-        # Other academic subjects
-        "english", "writing", "literature", "history", "philosophy",
-        "ethics", "languages", "german", "spanish", "french"
-    ]
-
     # If query contains academic context word, it's likely university-related
-    has_academic_context = any(word in query_lower for word in academic_context_words)
-
-    # Check if query mentions something that could be a course
-    mentions_potential_course = any(course in query_lower for course in potential_course_names)
+    has_academic_context = ACADEMIC_CONTEXT_PATTERN.search(query_lower) is not None
 
     # If it has academic context OR mentions a potential course with a question word, accept it
-    question_words = ["who", "what", "when", "where", "how", "why", "which", "can", "do", "does", "is", "are"]
-    starts_with_question = any(query_lower.startswith(word) for word in question_words)
-
-    if has_academic_context or (mentions_potential_course and starts_with_question):
-        return True, "Contains academic context or course-related question"
-
-    # Check for programs and abbreviations
-    for abbr, full_name in MAJOR_ABBREVIATIONS.items():
-        if (f" {abbr} " in f" {query_lower} " or
-                query_lower.startswith(f"{abbr} ") or
-                query_lower.endswith(f" {abbr}") or
-                abbr == query_lower.strip()):
-            return True, f"Contains program abbreviation: {abbr}"
-
-        if full_name.lower() in query_lower:
-            return True, f"Contains program name: {full_name}"
-
-    # Check for university keywords
-    for keyword in UNIVERSITY_KEYWORDS:
-        if keyword.lower() in query_lower:
-            return True, f"Contains university keyword: {keyword}"
-
-    # Check for university locations
-    for location in UNIVERSITY_LOCATIONS:
-        if location.lower() in query_lower:
-            return True, f"Contains university location: {location}"
+    if has_academic_context or (query_lower.startswith(QUESTION_WORDS)
+                                and POTENTIAL_COURSE_NAMES_PATTERN.search(query_lower)):
+        return _ACADEMIC_QUERY
+
+    # Check for programs and abbreviations, as whole space-separated words or the whole query
+    abbreviations_found = {word for word in query_lower.split(" ") if word in SINGLE_WORD_MAJOR_ABBREVIATIONS}
+    if " " in query_lower:
+        padded_query = f" {query_lower} "
+        abbreviations_found.update(abbr for padded, abbr in PADDED_MULTI_WORD_ABBREVIATIONS if padded in padded_query)
+    if query_lower.strip() in MAJOR_ABBREVIATIONS:
+        abbreviations_found.add(query_lower.strip())
+    if abbreviations_found:
+        abbr = min(abbreviations_found, key=MAJOR_ABBREVIATION_RANK.__getitem__)
+        return True, f"Contains program abbreviation: {abbr}"
+
+    program_name_match = MAJOR_NAMES_PATTERN.search(query_lower)
+    if program_name_match:
+        return True, f"Contains program name: {MAJOR_NAMES[program_name_match.group()]}"
+
+    # Check for university keywords and locations
+    term_match = UNIVERSITY_TERMS_PATTERN.search(query_lower)
+    if term_match:
+        return True, f"Contains university {term_match.lastgroup}: {term_match.group()}"
 
     # Educational question indicators - MORE PATTERNS
-    education_question_patterns = [
-        r"how (do|can|to) (i|we|you) (get|find|access|use|register|sign up|apply)",
-        r"where (is|are|can i find) .{3,}",
-        r"what (is|are) .{3,} (hour|time|schedule|deadline|requirement|policy|procedure)",
-        r"when (is|are|does|do) .{3,} (open|close|start|end|begin|finish|due|happen|taught|offered)",
-        r"who (is|are|do i) .{3,} (contact|talk to|ask|professor|teacher|instructor|teaches|teaching)",
-        r"do (i|we|you) need .{3,} (to|for)",
-        r"can (i|we|you) .{3,} (get|find|access|use|register|sign up|apply|take|enroll)",
-        # Specific patterns for prerequisites and requirements
-        r"what.*(prerequisite|pre-requisite|requirement).*for",
-        r"prerequisite.*for",
-        r"requirement.*for",
-        r"do i need.*before",
-        r"what.*need.*before",
-        r"required.*for",
-        # Teaching-related patterns
-        r"who.*teach",
-        r"taught by",
-        r"professor.*for",
-        r"instructor.*for"
-    ]
-
-    for pattern in education_question_patterns:
-        if re.search(pattern, query_lower):
-            return True, f"Contains educational question pattern"
-
-    # Check for academic terms
-    academic_terms = [
-        "grade", "course", "class", "exam", "test", "quiz", "homework", "assignment",
-        "project", "paper", "thesis", "dissertation", "research", "study", "graduation",
-        "degree", "major", "minor", "concentration", "specialization", "program",
-        "curriculum", "syllabus", "credit", "unit", "hour", "semester", "term", "quarter",
-        "year", "session", "lecture", "tutorial", "lab", "seminar", "workshop", "studio",
-        "practicum", "internship", "coop", "placement", "fieldwork", "clinical", "residency",
-        "prerequisite", "prerequisites", "pre-requisite", "pre-requisites",
-        "corequisite", "co-requisite", "requirement", "requirements",
-        "professor", "instructor", "teacher", "lecturer", "teaching"
-    ]
-
-    for term in academic_terms:
-        if f" {term} " in f" {query_lower} " or query_lower.startswith(f"{term} ") or query_lower.endswith(f" {term}"):
-            return True, f"Contains academic term: {term}"
+    if EDUCATION_QUESTION_PATTERN.search(query_start):
+        return _EDUCATIONAL_QUESTION
+
+    # Check for academic terms as space-separated words of the query
+    academic_terms_found = ACADEMIC_TERM_SET.intersection(query_lower.split(" "))
+    if academic_terms_found:
+        term = min(academic_terms_found, key=ACADEMIC_TERMS.index)
+        return True, f"Contains academic term: {term}"
 
     # Final catch-all: If query is asking about ANYTHING being taught/offered/given
-    if re.search(r"(taught|offered|given|teaches|teaching|professor|instructor)", query_lower):
-        return True, "Contains teaching-related terms"
+    if TEACHING_TERMS_PATTERN.search(query_lower):
+        return _TEACHING_TERMS
 
     # Default to not related
-    return False, "No university-related keywords or patterns detected"
\ No newline at end of file
+    return _NO_MATCH
\ No newline at end of file
@@ -2,6 +2,8 @@ from typing import Dict, List, Any, Optional
 from langchain_community.vectorstores.supabase import SupabaseVectorStore
 import logging
 
+from uni_ai_chatbot.configurations.config import HNSW_EF_SEARCH
+
 logger = logging.getLogger(__name__)
 
 
@@ -58,9 +60,18 @@ class FixedSupabaseVectorStore(SupabaseVectorStore):
             # Fall back to base implementation without filter
             if filter:
                 logger.warning("Falling back to search without filter due to error")
-                return super().similarity_search_with_relevance_scores(query, k, **kwargs)
+                # Reuse the query embedding rather than embedding the query again
+                return super().similarity_search_by_vector_with_relevance_scores(embedding, k=k, **kwargs)
             raise
 
+    def match_args(self, query: List[float], filter: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Add the HNSW search breadth to the RPC arguments of match_documents"""
+        match_query = super().match_args(query, filter)
+        # Only the HNSW function takes a search breadth
+        if self.query_name == "match_documents" and HNSW_EF_SEARCH:
+            match_query["ef_search"] = HNSW_EF_SEARCH
+        return match_query
+
     def _get_match_documents_query(
             self, query_embedding: List[float], filter: Optional[Dict[str, Any]] = None, limit: int = 5
     ) -> Dict[str, Any]:
@@ -1,9 +1,14 @@
+import threading
+from typing import Optional
 from supabase import create_client, Client
-from functools import lru_cache
 from uni_ai_chatbot.configurations.config import SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY
 
+# The shared client, created on first use; startup loads tables from several threads at
+# once, so creation is guarded to make sure only one client is ever created
+_client: Optional[Client] = None
+_client_lock = threading.Lock()
+
 
-@lru_cache(maxsize=1)
 def get_supabase_client() -> Client:
     """
     Initialize and return a Supabase client (singleton pattern)
@@ -14,7 +19,12 @@ def get_supabase_client() -> Client:
     Raises:
         ValueError: If credentials are not found
     """
-    if not SUPABASE_URL or not SUPABASE_SERVICE_ROLE_KEY:
-        raise ValueError("Supabase credentials not found in environment variables")
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                if not SUPABASE_URL or not SUPABASE_SERVICE_ROLE_KEY:
+                    raise ValueError("Supabase credentials not found in environment variables")
 
-    return create_client(SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY)
+                _client = create_client(SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY)
+    return _client
@@ -0,0 +1,54 @@
+import atexit
+import httpx
+from functools import lru_cache
+from typing import Dict
+from uni_ai_chatbot.configurations.config import (
+    MISTRAL_API_KEY, MISTRAL_ENDPOINT, HTTP_TIMEOUT, HTTP_MAX_CONNECTIONS, HTTP_MAX_KEEPALIVE_CONNECTIONS
+)
+
+_LIMITS = httpx.Limits(
+    max_connections=HTTP_MAX_CONNECTIONS,
+    max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS
+)
+
+
+def _mistral_headers() -> Dict[str, str]:
+    return {
+        "Content-Type": "application/json",
+        "Accept": "application/json",
+        "Authorization": f"Bearer {MISTRAL_API_KEY}",
+    }
+
+
+@lru_cache(maxsize=1)
+def get_mistral_http_client() -> httpx.Client:
+    """
+    Return the keep-alive HTTP client shared by all Mistral chat and embedding calls (singleton pattern)
+
+    Returns:
+        A pooled httpx client authenticated with the system Mistral API key
+    """
+    client = httpx.Client(
+        base_url=MISTRAL_ENDPOINT,
+        headers=_mistral_headers(),
+        timeout=HTTP_TIMEOUT,
+        limits=_LIMITS
+    )
+    atexit.register(client.close)
+    return client
+
+
+@lru_cache(maxsize=1)
+def get_mistral_async_http_client() -> httpx.AsyncClient:
+    """
+    Return the async counterpart of get_mistral_http_client (singleton pattern)
+
+    Returns:
+        A pooled httpx async client authenticated with the system Mistral API key
+    """
+    return httpx.AsyncClient(
+        base_url=MISTRAL_ENDPOINT,
+        headers=_mistral_headers(),
+        timeout=HTTP_TIMEOUT,
+        limits=_LIMITS
+    )
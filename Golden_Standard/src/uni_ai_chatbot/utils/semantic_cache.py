@@ -0,0 +1,78 @@
+import logging
+from typing import List, Optional
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class SemanticCache:
+    """
+    Answers stored by the embedding of their question, so a question phrased differently but
+    close enough in embedding space is answered without running the QA chain again.
+    Lookups are one matrix-vector product over all entries; once full, the oldest entry is replaced.
+    """
+
+    def __init__(self, maxsize: int, threshold: float) -> None:
+        self.maxsize: int = maxsize
+        self.threshold: float = threshold
+        # Unit-length question embeddings, one row per entry, allocated on the first put
+        self._vectors: Optional[np.ndarray] = None
+        self._answers: List[Optional[str]] = [None] * maxsize
+        self._size: int = 0
+        self._next: int = 0
+
+    def get(self, vector: List[float]) -> Optional[str]:
+        """
+        Get the answer to the most similar cached question
+
+        Args:
+            vector: Embedding of the question
+
+        Returns:
+            The cached answer, or None if no cached question reaches the similarity threshold
+        """
+        normalized: Optional[np.ndarray] = self._normalize(vector)
+        if not self._size or normalized is None:
+            return None
+
+        similarities: np.ndarray = self._vectors[:self._size] @ normalized
+        best: int = int(np.argmax(similarities))
+        if similarities[best] < self.threshold:
+            return None
+
+        logger.debug(f"Semantic cache hit with similarity {similarities[best]:.3f}")
+        return self._answers[best]
+
+    def put(self, vector: List[float], answer: str) -> None:
+        """
+        Store an answer under the embedding of its question
+
+        Args:
+            vector: Embedding of the question
+            answer: The answer to cache
+        """
+        normalized: Optional[np.ndarray] = self._normalize(vector)
+        if normalized is None:
+            # Stored, it would make every later lookup's similarities NaN and argmax pick it
+            logger.debug("Not caching an answer under an all-zero or non-finite embedding")
+            return
+
+        if self._vectors is None:
+            self._vectors = np.zeros((self.maxsize, normalized.shape[0]), dtype=np.float32)
+
+        self._vectors[self._next] = normalized
+        self._answers[self._next] = answer
+        self._next = (self._next + 1) % self.maxsize
+        self._size = min(self._size + 1, self.maxsize)
+
+    @staticmethod
+    def _normalize(vector: List[float]) -> Optional[np.ndarray]:
+        """Scale the vector to unit length, or return None if it has no direction to compare"""
+        array: np.ndarray = np.asarray(vector, dtype=np.float32)
+        norm: float = float(np.linalg.norm(array))
+        if not np.isfinite(norm) or norm == 0:
+            return None
+        return array / norm
+
+    def __len__(self) -> int:
+        return self._size
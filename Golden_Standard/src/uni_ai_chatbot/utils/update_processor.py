@@ -0,0 +1,57 @@
+import asyncio
+import sys
+from typing import Any, Awaitable, Dict
+from telegram import Update
+from telegram.ext import BaseUpdateProcessor
+
+
+class PerChatUpdateProcessor(BaseUpdateProcessor):
+    """
+    Processes updates from different chats concurrently, but updates from the same chat
+    one at a time and in the order they arrived, so a follow-up message never overtakes
+    the question it answers
+    """
+
+    def __init__(self, max_concurrent_updates: int) -> None:
+        # The base class takes its concurrency slot before do_process_update runs, which would
+        # let a chat's queued updates hold slots while they wait on each other; its limit is
+        # lifted, and the slots are taken here once an update is next in line for its chat
+        super().__init__(sys.maxsize)
+        self._update_slots = asyncio.Semaphore(max_concurrent_updates)
+        # One lock per chat with updates in progress, and how many updates hold or wait on it
+        self._chat_locks: Dict[int, asyncio.Lock] = {}
+        self._chat_pending: Dict[int, int] = {}
+
+    async def do_process_update(self, update: object, coroutine: Awaitable[Any]) -> None:
+        """
+        Process an update once the previous updates from its chat are done and a slot is free
+
+        Args:
+            update: The update to process
+            coroutine: The coroutine that handles the update
+        """
+        chat = update.effective_chat if isinstance(update, Update) else None
+        if chat is None:
+            async with self._update_slots:
+                await coroutine
+            return
+
+        chat_id: int = chat.id
+        lock: asyncio.Lock = self._chat_locks.setdefault(chat_id, asyncio.Lock())
+        self._chat_pending[chat_id] = self._chat_pending.get(chat_id, 0) + 1
+        try:
+            # asyncio.Lock wakes waiters first in, first out, which keeps the chat's updates in
+            # order; only the chat's current update holds one of the shared slots
+            async with lock, self._update_slots:
+                await coroutine
+        finally:
+            self._chat_pending[chat_id] -= 1
+            if not self._chat_pending[chat_id]:
+                del self._chat_pending[chat_id]
+                del self._chat_locks[chat_id]
+
+    async def initialize(self) -> None:
+        """Nothing to set up"""
+
+    async def shutdown(self) -> None:
+        """Nothing to clean up"""
@@ -1,13 +1,20 @@
 import logging
-from typing import Optional, TypedDict
+import re
+import time
+from typing import Any, Dict, NamedTuple, Optional
 from telegram import Update, Message, User
 from telegram.error import TelegramError
 
+from uni_ai_chatbot.configurations.config import CONVERSATION_TIMEOUT_SECONDS
+
 logger = logging.getLogger(__name__)
 
+# Error texts that indicate a timeout, in any case
+_TIMEOUT_PATTERN = re.compile(r"timeout|timed out", re.IGNORECASE)
+
 
-class UserInfo(TypedDict):
-    """Type definition for user information"""
+class UserInfo(NamedTuple):
+    """User information, as an immutable tuple with named fields"""
     id: int
     username: Optional[str]
     first_name: Optional[str]
@@ -33,7 +40,7 @@ async def handle_error(update: Update, error: Optional[Exception] = None,
     # Determine appropriate error message
     if isinstance(error, TelegramError):
         error_message = "I'm having trouble with Telegram right now. Please try again in a moment."
-    elif "timeout" in str(error).lower() or "timed out" in str(error).lower():
+    elif _TIMEOUT_PATTERN.search(str(error)):
         error_message = "That's taking longer than expected. Could you try a shorter question?"
     else:
         error_message = message or "Sorry, I couldn't process your question. Please try again."
@@ -52,13 +59,33 @@ def get_user_info(update: Update) -> UserInfo:
         update: Telegram Update object
 
     Returns:
-        Dictionary with user information
+        UserInfo with the user's information; use _asdict() for a dictionary
     """
     user: User = update.effective_user
-    return {
-        "id": user.id,
-        "username": user.username,
-        "first_name": user.first_name,
-        "last_name": user.last_name,
-        "language_code": user.language_code
-    }
\ No newline at end of file
+    return UserInfo(user.id, user.username, user.first_name, user.last_name, user.language_code)
+
+
+def start_conversation(user_data: Dict[str, Any], name: str, **state: Any) -> None:
+    """
+    Record a pending follow-up question in the user's data
+
+    Args:
+        user_data: The user's context.user_data
+        name: Conversation key, e.g. 'locker_conversation'
+        **state: Conversation state stored alongside the start time
+    """
+    user_data[name] = {**state, "started_at": time.monotonic()}
+
+
+def expire_stale_conversations(user_data: Dict[str, Any]) -> None:
+    """
+    Drop pending follow-up questions the user never answered, so an old question
+    doesn't capture an unrelated message and abandoned state doesn't accumulate
+
+    Args:
+        user_data: The user's context.user_data
+    """
+    cutoff: float = time.monotonic() - CONVERSATION_TIMEOUT_SECONDS
+    for key in [key for key in user_data if key.endswith("_conversation")]:
+        if user_data[key].get("started_at", cutoff) <= cutoff:
+            del user_data[key]
@@ -0,0 +1,36 @@
+import pytest
+
+from uni_ai_chatbot.data.campus_map_data import build_location_index, fuzzy_match_location
+
+
+@pytest.fixture
+def location_index():
+    locations = [
+        {"id": 1, "name": "Nordmetall College", "aliases": "Nordmetall, NM"},
+        {"id": 2, "name": "Research 1", "aliases": ""},
+        {"id": 3, "name": "Campus Center", "aliases": "CC"},
+        {"id": 4, "name": "IRC", "aliases": "Information Resource Center, Library"},
+    ]
+    return build_location_index(locations)
+
+
+@pytest.mark.parametrize("name", [
+    "None",
+    "none",
+    "no specific location",
+    "Sorry, I could not find that",
+    "printer",
+    "feature query",
+])
+def test_fuzzy_match_location_rejects_non_names(location_index, name):
+    assert fuzzy_match_location(location_index, name) is None
+
+
+@pytest.mark.parametrize("name, expected", [
+    ("Nordmetall College", "Nordmetall College"),
+    ("Nordmetal Colege", "Nordmetall College"),
+    ("campus centre", "Campus Center"),
+    ("Information Resource Centre", "IRC"),
+])
+def test_fuzzy_match_location_matches_near_names(location_index, name, expected):
+    assert fuzzy_match_location(location_index, name)["name"] == expected
@@ -0,0 +1,46 @@
+import math
+
+import pytest
+
+from uni_ai_chatbot.utils.semantic_cache import SemanticCache
+
+
+@pytest.fixture
+def cache():
+    return SemanticCache(maxsize=4, threshold=0.9)
+
+
+def test_get_returns_answer_of_similar_question(cache):
+    cache.put([1.0, 0.0, 0.0], "first")
+    cache.put([0.0, 1.0, 0.0], "second")
+    assert cache.get([0.1, 1.0, 0.0]) == "second"
+
+
+def test_get_misses_below_threshold(cache):
+    cache.put([1.0, 0.0, 0.0], "first")
+    assert cache.get([1.0, 1.0, 0.0]) is None
+
+
+@pytest.mark.parametrize("vector", [[0.0, 0.0, 0.0], [math.nan, 1.0, 0.0], [math.inf, 1.0, 0.0]])
+def test_put_skips_vectors_without_direction(cache, vector):
+    cache.put([1.0, 0.0, 0.0], "first")
+    cache.put(vector, "broken")
+    assert len(cache) == 1
+    # A stored NaN row would win argmax and hide the real hit
+    assert cache.get([1.0, 0.0, 0.0]) == "first"
+
+
+@pytest.mark.parametrize("vector", [[0.0, 0.0, 0.0], [math.nan, 1.0, 0.0]])
+def test_get_misses_for_vectors_without_direction(cache, vector):
+    cache.put([1.0, 0.0, 0.0], "first")
+    assert cache.get(vector) is None
+
+
+def test_put_replaces_oldest_entry_when_full():
+    cache = SemanticCache(maxsize=2, threshold=0.9)
+    cache.put([1.0, 0.0, 0.0], "first")
+    cache.put([0.0, 1.0, 0.0], "second")
+    cache.put([0.0, 0.0, 1.0], "third")
+    assert len(cache) == 2
+    assert cache.get([1.0, 0.0, 0.0]) is None
+    assert cache.get([0.0, 0.0, 1.0]) == "third"